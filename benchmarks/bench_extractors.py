@@ -0,0 +1,113 @@
+"""
+正文提取基准测试 - 比较各提取器在网页语料上的速度和结果一致性
+
+除语料目录外，还会在随仓库提交的真实网页（benchmarks/pages）上运行；这些网页上
+任一提取器的输出与 soup 不一致时以非 0 状态退出。
+
+用法:
+    python benchmarks/bench_extractors.py                  # 使用 benchmarks/corpus（为空时生成合成语料）
+    python benchmarks/bench_extractors.py --corpus DIR     # 使用自己保存的网页
+    python benchmarks/bench_extractors.py --save 30        # 从配置的数据源下载 30 篇文章网页到语料目录
+"""
+from pathlib import Path
+import argparse
+import difflib
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fixtures import CORPUS_DIR, PAGES_DIR, ensure_corpus
+from src.article_summarizer import EXTRACTORS, lxml_html
+
+
+def save_pages(corpus_dir: Path, count: int):
+    """从 config/config.yaml 配置的数据源抓取文章网页并保存"""
+    import yaml
+    from src.article_fetcher import ArticleFetcher
+    from src.data_fetcher import DataFetcher
+
+    with open('config/config.yaml', 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    config.setdefault('article_fetch', {})['max_bytes'] = 8 * 1024 * 1024
+
+    data = DataFetcher(config).fetch_all()
+    fetcher = ArticleFetcher(config)
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+
+    saved = 0
+    for items in data.values():
+        for item in items:
+            if saved >= count:
+                return
+            try:
+                html = fetcher.fetch(item['link'])
+            except Exception as e:
+                print(f"  ✗ {item['link']}: {e}")
+                continue
+            if html:
+                (corpus_dir / f'saved_{saved:03d}.html').write_bytes(html)
+                saved += 1
+    print(f"✓ 已保存 {saved} 篇网页到 {corpus_dir}")
+
+
+def run(label: str, files: list, repeat: int) -> int:
+    """
+    在一组网页上比较各提取器
+
+    Returns:
+        与 soup 输出不一致的（提取器, 网页）数量
+    """
+    pages = [path.read_bytes() for path in files]
+    total_mb = sum(len(page) for page in pages) / 1024 / 1024
+    print(f"{label}: {len(pages)} 篇网页, 共 {total_mb:.1f} MB, 重复 {repeat} 次\n")
+
+    names = [name for name in EXTRACTORS if name != 'lxml' or lxml_html is not None]
+    outputs = {}
+    timings = {}
+    for name in names:
+        extractor = EXTRACTORS[name]()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            outputs[name] = [extractor.extract(page) for page in pages]
+        timings[name] = (time.perf_counter() - start) / repeat
+
+    baseline = timings['soup']
+    reference = outputs['soup']
+    mismatches = []
+    print(f"{'提取器':<12}{'总耗时(s)':>12}{'每篇(ms)':>12}{'加速比':>10}{'完全一致':>12}{'平均相似度':>12}")
+    for name in names:
+        exact = sum(1 for a, b in zip(outputs[name], reference) if a == b)
+        similarity = sum(
+            1.0 if a == b else difflib.SequenceMatcher(None, a, b).ratio()
+            for a, b in zip(outputs[name], reference)
+        ) / len(pages)
+        print(
+            f"{name:<12}{timings[name]:>12.3f}{timings[name] / len(pages) * 1000:>12.2f}"
+            f"{baseline / timings[name]:>9.1f}x{exact:>8}/{len(pages):<4}{similarity:>11.4f}"
+        )
+        mismatches += [(name, path.name) for path, a, b in zip(files, outputs[name], reference) if a != b]
+
+    for name, page in mismatches:
+        print(f"  ✗ {name} 与 soup 不一致: {page}")
+    print()
+    return len(mismatches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='正文提取基准测试')
+    parser.add_argument('--corpus', type=Path, default=CORPUS_DIR, help='网页语料目录')
+    parser.add_argument('--repeat', type=int, default=3, help='重复次数')
+    parser.add_argument('--save', type=int, default=0, help='先从配置的数据源下载指定数量的网页')
+    args = parser.parse_args()
+
+    if args.save:
+        save_pages(args.corpus, args.save)
+    run("语料", ensure_corpus(args.corpus), args.repeat)
+    if run("真实网页", sorted(PAGES_DIR.glob('*.html')), args.repeat):
+        sys.exit(1)
+    print("✓ 真实网页上各提取器的输出与 soup 一致")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+HTML 报告渲染基准测试 - 比较首次渲染、全部命中章节缓存、只有一个类别变化时的耗时，
+以及内嵌全部条目的页面与 html_lazy 页面、数据文件的大小
+
+用法:
+    python benchmarks/bench_html_report.py                     # 默认 1000,5000,10000 行
+    python benchmarks/bench_html_report.py --rows 2000 --repeat 5
+"""
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.html_report_generator import ROW_TEMPLATE, HTMLReportGenerator
+from src.lazy_html_report_generator import LazyHTMLReportGenerator
+from src.report_document import SECTION_INFO, build_document
+
+
+def make_data(rows: int, seed: int = 0) -> dict:
+    """生成平均分布在各类别中的合成条目"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    data = {category: [] for category, _, _ in SECTION_INFO}
+    categories = list(data)
+    for index in range(rows):
+        category = categories[index % len(categories)]
+        data[category].append({
+            'title': f'Item {index}: ' + ' '.join(rng.choice(('model', 'agent', 'GPU', '推理', '开源')) for _ in range(8)),
+            'link': f'https://example.com/{category}/{index}',
+            'source': f'Source {index % 7}',
+            'sources': [f'Source {index % 7}'] + ([f'Mirror {index % 3}'] if index % 5 == 0 else []),
+            'published': now - timedelta(hours=index % 160),
+            'ai_summary': '提出了一种新的方法，在多个基准上取得了更好的效果。' * rng.randint(1, 3),
+        })
+    return data
+
+
+def legacy_rows(items: list) -> str:
+    """按改动前的方式（循环中 += 拼接）构建表格行，作为对照"""
+    table_rows = ""
+    for item in items:
+        date_str = item['published'].strftime('%m月%d日')
+        ai_summary = item.get('ai_summary', '暂无摘要')
+        sources = ' / '.join(item.get('sources') or [item['source']])
+        table_rows += ROW_TEMPLATE.format(
+            link=item['link'], title=item['title'], ai_summary=ai_summary, sources=sources, date=date_str
+        )
+    return table_rows
+
+
+def timed(func, repeat: int) -> float:
+    """返回 repeat 次中的最短耗时（秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows: int, repeat: int) -> dict:
+    data = make_data(rows)
+    summaries = {category: f'**{category}** 本周要点。' for category, _, _ in SECTION_INFO}
+    changed = dict(summaries, industry=summaries['industry'] + ' 更新。')
+    document = build_document(data, summaries)
+    changed_document = build_document(data, changed)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        config = {'cache': {'enabled': True, 'dir': cache_dir}}
+
+        # 首次渲染：每次使用新的生成器和空缓存
+        def cold():
+            with tempfile.TemporaryDirectory() as empty_dir:
+                HTMLReportGenerator({'cache': {'enabled': True, 'dir': empty_dir}}).render(document)
+
+        # 同一进程内再次渲染：所有章节命中内存缓存
+        generator = HTMLReportGenerator(config)
+        generator.render(document)
+
+        def warm():
+            generator.render(document)
+
+        # 新进程重新运行：章节从磁盘缓存读取，只有 industry 的摘要变化
+        def rerun_one_changed():
+            HTMLReportGenerator(config).render(changed_document)
+
+        results = {
+            'rows': rows,
+            'cold': timed(cold, repeat),
+            'warm': timed(warm, repeat),
+            'rerun_one_changed': timed(rerun_one_changed, repeat),
+            'rows_concat': timed(lambda: [legacy_rows(items) for items in data.values()], repeat),
+            'rows_join': timed(lambda: [
+                ''.join(ROW_TEMPLATE.format(
+                    link=item['link'], title=item['title'], ai_summary=item.get('ai_summary', '暂无摘要'),
+                    sources=' / '.join(item.get('sources') or [item['source']]),
+                    date=item['published'].strftime('%m月%d日')
+                ) for item in items)
+                for items in data.values()
+            ], repeat),
+            'inline_bytes': len(generator.render(document).encode('utf-8')),
+        }
+
+        lazy = LazyHTMLReportGenerator(config)
+        results['lazy_page_bytes'] = len(lazy.render(document).encode('utf-8'))
+        results['lazy_data_bytes'] = len(lazy.build_data(document))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTML 报告渲染基准测试')
+    parser.add_argument('--rows', default='1000,5000,10000', help='条目总数，逗号分隔')
+    parser.add_argument('--repeat', type=int, default=3, help='重复次数（取最短耗时）')
+    args = parser.parse_args()
+
+    print(f"{'行数':>8}{'首次渲染(ms)':>14}{'全部命中(ms)':>14}{'一类变化(ms)':>14}"
+          f"{'行拼接 += (ms)':>16}{'行拼接 join (ms)':>18}"
+          f"{'内嵌页面(KB)':>14}{'lazy 页面(KB)':>15}{'lazy 数据(KB)':>15}")
+    for rows in (int(value) for value in args.rows.split(',') if value.strip()):
+        result = run(rows, args.repeat)
+        print(
+            f"{result['rows']:>8}{result['cold'] * 1000:>14.1f}{result['warm'] * 1000:>14.1f}"
+            f"{result['rerun_one_changed'] * 1000:>14.1f}{result['rows_concat'] * 1000:>16.1f}"
+            f"{result['rows_join'] * 1000:>18.1f}{result['inline_bytes'] / 1024:>14.1f}"
+            f"{result['lazy_page_bytes'] / 1024:>15.1f}{result['lazy_data_bytes'] / 1024:>15.1f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
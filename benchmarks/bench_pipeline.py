@@ -0,0 +1,213 @@
+"""
+端到端基准测试 - 用本地数据源、文章网页和模拟 LLM 服务运行完整流程，报告吞吐量和各阶段耗时
+
+不访问外部网络，结果可复现。每个规模下依次运行指定的流水线模式，
+规模指每个类别进入报告的条目数（report.max_items_per_category）。
+
+用法:
+    python benchmarks/bench_pipeline.py                                  # 默认规模 10,50,200
+    python benchmarks/bench_pipeline.py --scales 20,100 --pipeline streaming
+    python benchmarks/bench_pipeline.py --llm-latency 0.5 --error-rate 0.05 --summarizer-mode packed
+    python benchmarks/bench_pipeline.py --scales 20 --summarizer-mode batch    # Message Batches 接口
+    python benchmarks/bench_pipeline.py --output results.json            # 同时保存 JSON 结果
+"""
+from contextlib import redirect_stdout
+from pathlib import Path
+import argparse
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main as llmpulse
+from benchmarks.servers import ArticleServer, FakeLLMServer, FeedServer
+from src.data_fetcher import DataFetcher
+from src.hedging import hedge_stats
+from src.llm_analyzer import LLMAnalyzer
+from src.metrics import metrics
+from src.prompt_cache import usage_tracker
+from src.report_document import build_document
+from src.reports import RENDERERS, create_renderers, write_reports
+from src.resilience import retry_stats
+
+
+# 报告中展示的阶段（按流水线模式）
+STAGES = {
+    'staged': ['fetch', 'dedupe', 'article_summary', 'analysis', 'render'],
+    'streaming': ['pipeline', 'article_summary', 'category_summary', 'insights', 'render'],
+}
+
+
+def build_config(args, feed_url: str, llm_url: str, output_dir: str, scale: int, pipeline: str) -> dict:
+    """生成指向本地服务的配置"""
+    return {
+        'llm': {
+            'provider': 'anthropic',
+            'api_key': 'bench',
+            'model': 'bench-model',
+            'base_url': llm_url,
+            'max_tokens': 1024,
+            'retry': {'max_retries': 4, 'base_delay': 0.05, 'max_delay': 1},
+            'circuit_breaker': {'failure_threshold': 20, 'reset_timeout': 1},
+        },
+        'data_sources': {
+            category: [
+                {'name': f'{category}-{index}', 'url': f'{feed_url}/{category}/{index}', 'category': category}
+                for index in range(args.feeds)
+            ]
+            for category in DataFetcher.CATEGORIES
+        },
+        'fetch': {'concurrent': True, 'max_workers': 8, 'per_host_limit': 8, 'per_host_interval': 0},
+        'store': {'enabled': False},
+        'cache': {'enabled': False},
+        'dedup': {'enabled': True},
+        'summarizer': {
+            'max_workers': args.summarizer_workers,
+            'requests_per_minute': 100000,
+            'tokens_per_minute': 100000000,
+            'mode': args.summarizer_mode,
+            # 模拟服务的批次在 1 秒内结束，无需按默认的 30 秒间隔轮询
+            'batch_poll_interval': 0.2,
+        },
+        'article_fetch': {'per_host_limit': 16, 'pool_size': 32},
+        'pipeline': {'mode': pipeline},
+        'report': {
+            'output_dir': output_dir,
+            'output_format': args.output_format,
+            'days_back': 7,
+            'max_items_per_category': scale,
+            'generate_insights': True,
+        },
+        'metrics': {'enabled': False},
+    }
+
+
+def run_once(args, feed_url: str, llm_url: str, scale: int, pipeline: str) -> dict:
+    """在全新的输出目录中运行一次完整流程，返回统计结果"""
+    output_dir = tempfile.mkdtemp(prefix='llmpulse-bench-')
+    config = build_config(args, feed_url, llm_url, output_dir, scale, pipeline)
+
+    for tracker in (metrics, usage_tracker, retry_stats, hedge_stats):
+        tracker.reset()
+
+    log = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(sys.stdout if args.verbose else log):
+            fetcher = DataFetcher(config)
+            analyzer = LLMAnalyzer(config)
+            if pipeline == 'streaming':
+                data, summaries, insights = llmpulse.run_streaming(config, fetcher, analyzer)
+            else:
+                data, summaries, insights = llmpulse.run_staged(config, fetcher, analyzer)
+            write_reports(create_renderers(config), build_document(data, summaries, insights))
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    wall = time.perf_counter() - start
+
+    record = metrics.to_dict()
+    stages = {}
+    for span in record['spans']:
+        stage = stages.setdefault(span['name'], {'count': 0, 'total': 0.0, 'max': 0.0})
+        stage['count'] += 1
+        stage['total'] += span['duration']
+        stage['max'] = max(stage['max'], span['duration'])
+
+    llm = [series['value'] for series in record['histograms'].get('llm_call_seconds', [])]
+    llm_calls = sum(h['count'] for h in llm)
+    items = sum(len(category_items) for category_items in data.values())
+
+    return {
+        'scale': scale,
+        'pipeline': pipeline,
+        'items': items,
+        'wall_seconds': round(wall, 3),
+        'items_per_second': round(items / wall, 2) if wall else 0,
+        'stages': {name: {key: round(value, 3) for key, value in stats.items()} for name, stats in stages.items()},
+        'llm_calls': llm_calls,
+        'llm_mean_ms': round(sum(h['sum'] for h in llm) / llm_calls * 1000, 1) if llm_calls else 0,
+        'retries': retry_stats.snapshot()['retries'],
+        'usage': usage_tracker.snapshot(),
+    }
+
+
+def print_results(results: list):
+    """
+    打印结果表
+
+    staged 模式下各阶段依次执行，阶段耗时为该阶段所有 span 之和；streaming 模式下
+    各类别的阶段并行重叠，取最慢的一次。
+    """
+    for pipeline in STAGES:
+        rows = [result for result in results if result['pipeline'] == pipeline]
+        if not rows:
+            continue
+        stage_names = STAGES[pipeline]
+        print(f"\n流水线模式: {pipeline}")
+        header = f"{'规模':>6}{'条目':>7}{'总耗时(s)':>11}{'条目/秒':>10}"
+        header += ''.join(f"{name:>18}" for name in stage_names)
+        header += f"{'LLM调用':>9}{'LLM均值(ms)':>13}{'重试':>6}"
+        print(header)
+        for result in rows:
+            line = (f"{result['scale']:>6}{result['items']:>7}{result['wall_seconds']:>11.2f}"
+                    f"{result['items_per_second']:>10.1f}")
+            for name in stage_names:
+                stage = result['stages'].get(name)
+                if stage:
+                    line += f"{stage['total'] if pipeline == 'staged' else stage['max']:>18.3f}"
+                else:
+                    line += f"{'-':>18}"
+            line += f"{result['llm_calls']:>9}{result['llm_mean_ms']:>13.1f}{result['retries']:>6}"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='端到端流水线基准测试（离线）')
+    parser.add_argument('--scales', default='10,50,200', help='每个类别的条目数，逗号分隔')
+    parser.add_argument('--pipeline', choices=['staged', 'streaming', 'both'], default='both',
+                        help='流水线模式')
+    parser.add_argument('--feeds', type=int, default=3, help='每个类别的数据源数量')
+    parser.add_argument('--feed-latency', type=float, default=0.05, help='数据源响应延迟（秒）')
+    parser.add_argument('--article-latency', type=float, default=0.02, help='文章网页响应延迟（秒）')
+    parser.add_argument('--llm-latency', type=float, default=0.2, help='模拟 LLM 的平均延迟（秒）')
+    parser.add_argument('--llm-jitter', type=float, default=0.5, help='LLM 延迟的随机抖动比例')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='LLM 请求返回 429/529 的比例')
+    parser.add_argument('--summarizer-mode', choices=['concurrent', 'packed', 'batch'], default='concurrent',
+                        help='文章摘要模式')
+    parser.add_argument('--summarizer-workers', type=int, default=8, help='文章摘要并发数')
+    parser.add_argument('--output-format', default='html',
+                        type=lambda value: [name.strip() for name in value.split(',') if name.strip()],
+                        help=f"报告格式，逗号分隔（可选: {', '.join(RENDERERS)}）")
+    parser.add_argument('--output', type=Path, help='保存 JSON 结果的路径')
+    parser.add_argument('--verbose', action='store_true', help='显示流程输出')
+    args = parser.parse_args()
+
+    scales = [int(value) for value in args.scales.split(',') if value.strip()]
+    pipelines = ['staged', 'streaming'] if args.pipeline == 'both' else [args.pipeline]
+
+    results = []
+    with ArticleServer(latency=args.article_latency) as articles, \
+            FakeLLMServer(latency=args.llm_latency, jitter=args.llm_jitter, error_rate=args.error_rate) as llm:
+        print(f"文章服务: {articles.url}  模拟 LLM: {llm.url}")
+        for scale in scales:
+            # 每个 feed 提供与规模相同数量的窗口内条目，另有少量过期条目
+            with FeedServer(articles.url, items_per_feed=scale, latency=args.feed_latency) as feeds:
+                for pipeline in pipelines:
+                    result = run_once(args, feeds.url, llm.url, scale, pipeline)
+                    results.append(result)
+                    print(f"  ✓ 规模 {scale} / {pipeline}: {result['items']} 条, "
+                          f"{result['wall_seconds']:.2f}s, {result['llm_calls']} 次 LLM 调用")
+
+    print_results(results)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n✓ 结果已保存: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+容错检查 - 用注入错误的本地模拟 LLM 服务驱动 ResilientCaller，检查重试、Retry-After 与熔断行为
+
+覆盖：429 连续限流后成功、按 Retry-After 等待、连续服务端错误使熔断打开并快速失败、
+半开状态的试探调用（被限流、失败、成功）后能正确恢复。任一检查失败时以非 0 状态退出。
+
+用法:
+    python benchmarks/check_resilience.py
+"""
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import anthropic
+
+from benchmarks.servers import FakeLLMServer
+from src.resilience import CircuitBreaker, CircuitOpenError, ResilientCaller, RetryStats
+
+# 服务返回的 Retry-After（秒）
+RETRY_AFTER = 0.2
+# 熔断打开后进入半开状态前的等待（秒）
+RESET_TIMEOUT = 0.3
+
+
+class Check:
+    """收集检查结果"""
+
+    def __init__(self):
+        self.failures = 0
+
+    def __call__(self, name: str, condition: bool, detail: str = ''):
+        mark = '✓' if condition else '✗'
+        print(f"  {mark} {name}" + (f"（{detail}）" if detail else ''))
+        if not condition:
+            self.failures += 1
+
+
+def make_caller(failure_threshold: int = 5, max_retries: int = 4) -> ResilientCaller:
+    return ResilientCaller(
+        max_retries=max_retries, base_delay=0.01, max_delay=2,
+        breaker=CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=RESET_TIMEOUT),
+        stats=RetryStats(),
+    )
+
+
+def main():
+    check = Check()
+    with FakeLLMServer(latency=0, jitter=0, retry_after=str(RETRY_AFTER)) as server:
+        client = anthropic.Anthropic(api_key='check', base_url=server.url, max_retries=0)
+
+        def complete():
+            return client.messages.create(
+                model='fake', max_tokens=16, messages=[{'role': 'user', 'content': 'ping'}]
+            )
+
+        def attempt(caller: ResilientCaller):
+            """通过 caller 调用一次，返回结果或抛出的异常"""
+            try:
+                return caller.call(complete)
+            except Exception as e:
+                return e
+
+        def succeeded(result) -> bool:
+            return isinstance(result, anthropic.types.Message)
+
+        print("429 连续限流")
+        caller = make_caller(failure_threshold=1)
+        server.enqueue(429, 429, 429)
+        start = time.monotonic()
+        complete_ok = succeeded(attempt(caller))
+        elapsed = time.monotonic() - start
+        stats = caller.stats.snapshot()
+        check("重试后成功", complete_ok)
+        check("重试 3 次，原因均为 429", stats['retries'] == 3 and stats['reasons'] == {'429': 3},
+              str(stats['reasons']))
+        check("按 Retry-After 等待", elapsed >= 3 * RETRY_AFTER, f"{elapsed:.2f}s")
+        check("限流不计入熔断", caller.breaker.state == CircuitBreaker.CLOSED and stats['circuit_opens'] == 0)
+
+        print("连续服务端错误")
+        caller = make_caller(failure_threshold=2)
+        server.enqueue(503, 503)
+        raised = attempt(caller)
+        check("熔断打开后停止重试并抛出 503", getattr(raised, 'status_code', None) == 503)
+        check("熔断器打开", caller.breaker.state == CircuitBreaker.OPEN)
+        requests_before = server.requests
+        fast_failed = isinstance(attempt(caller), CircuitOpenError)
+        check("打开期间快速失败，不发出请求", fast_failed and server.requests == requests_before)
+
+        print("半开试探被限流")
+        time.sleep(RESET_TIMEOUT + 0.05)
+        server.enqueue(429)
+        recovered = succeeded(attempt(caller))
+        check("试探被限流后重试成功", recovered)
+        check("熔断器关闭", caller.breaker.state == CircuitBreaker.CLOSED)
+        check("之后的调用正常", succeeded(attempt(caller)))
+
+        print("半开试探只被限流、不重试")
+        caller = make_caller(failure_threshold=1, max_retries=0)
+        server.enqueue(503)
+        attempt(caller)
+        time.sleep(RESET_TIMEOUT + 0.05)
+        server.enqueue(429)
+        attempt(caller)
+        check("试探被限流后保持半开", caller.breaker.state == CircuitBreaker.HALF_OPEN)
+        check("允许下一次试探并恢复", succeeded(attempt(caller))
+              and caller.breaker.state == CircuitBreaker.CLOSED)
+
+        print("半开试探失败")
+        caller = make_caller(failure_threshold=1, max_retries=0)
+        server.enqueue(503)
+        attempt(caller)
+        time.sleep(RESET_TIMEOUT + 0.05)
+        server.enqueue(503)
+        attempt(caller)
+        check("试探失败后重新打开", caller.breaker.state == CircuitBreaker.OPEN)
+        time.sleep(RESET_TIMEOUT + 0.05)
+        check("再次试探成功后关闭", succeeded(attempt(caller))
+              and caller.breaker.state == CircuitBreaker.CLOSED)
+
+    if check.failures:
+        print(f"\n✗ {check.failures} 项检查失败")
+        sys.exit(1)
+    print("\n✓ 全部检查通过")
+
+
+if __name__ == '__main__':
+    main()
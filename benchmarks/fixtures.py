@@ -0,0 +1,105 @@
+"""
+基准测试用的离线数据 - 生成可复现的文章网页语料
+"""
+from pathlib import Path
+import random
+
+
+CORPUS_DIR = Path(__file__).parent / 'corpus'
+# 随仓库提交的真实网页（来源见 pages/SOURCES.md），用于检查各提取器的输出是否一致
+PAGES_DIR = Path(__file__).parent / 'pages'
+
+WORDS = (
+    "model training inference agent benchmark dataset token context reasoning "
+    "alignment safety latency throughput retrieval embedding fine-tuning open-source "
+    "release evaluation multimodal vision language code assistant deployment GPU"
+).split()
+CJK_WORDS = ['模型', '推理', '训练', '智能体', '数据集', '上下文', '对齐', '安全', '多模态', '开源', '发布', '评测']
+
+# 页面结构：正文容器 (标签, class)
+LAYOUTS = [
+    ('article', None),
+    ('main', None),
+    ('div', 'post-content'),
+    ('div', 'article-content'),
+    ('section', 'entry-content'),
+    (None, None),  # 没有正文容器，回退到 body
+]
+
+
+def _sentence(rng: random.Random) -> str:
+    if rng.random() < 0.3:
+        return ''.join(rng.choice(CJK_WORDS) for _ in range(rng.randint(6, 20))) + '。'
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 24))]
+    return ' '.join(words).capitalize() + '.'
+
+
+def _paragraphs(rng: random.Random, count: int) -> str:
+    parts = []
+    for _ in range(count):
+        text = ' '.join(_sentence(rng) for _ in range(rng.randint(2, 6)))
+        if rng.random() < 0.2:
+            text += f' <a href="https://example.com/{rng.randint(1, 9999)}">link &amp; more</a> tail'
+        parts.append(f'<p>{text}</p>')
+    return '\n'.join(parts)
+
+
+def make_page(index: int, paragraphs: int) -> str:
+    """生成一篇结构接近真实博客的网页"""
+    rng = random.Random(index)
+    tag, css_class = LAYOUTS[index % len(LAYOUTS)]
+
+    head_script = '\n'.join(f'var config_{i} = {{"key": "{"x" * 200}"}};' for i in range(rng.randint(20, 200)))
+    head_style = '\n'.join(f'.c{i} {{ margin: {i}px; padding: {i}px; }}' for i in range(rng.randint(50, 400)))
+    nav = ''.join(f'<li><a href="/nav/{i}">Nav {i}</a></li>' for i in range(rng.randint(10, 60)))
+    sidebar = _paragraphs(rng, rng.randint(5, 30))
+    body = f'<h1>{_sentence(rng)}</h1>\n' + _paragraphs(rng, paragraphs)
+    comments = _paragraphs(rng, rng.randint(0, paragraphs))
+
+    if tag:
+        class_attr = f' class="{css_class} wide"' if css_class else ''
+        content = f'<{tag}{class_attr}>\n<header><span>Posted by author</span></header>\n{body}\n</{tag}>'
+    else:
+        content = body
+
+    # 一部分页面把侧边栏放在正文之前
+    before, after = (sidebar, '') if index % 2 else ('', sidebar)
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Article {index}</title>
+<style>{head_style}</style>
+<script>{head_script}</script>
+</head>
+<body>
+<header><div class="logo">LLM Blog</div><nav><ul>{nav}</ul></nav></header>
+<aside class="sidebar">{before}</aside>
+{content}
+<div class="comments">{comments}</div>
+<aside class="related">{after}</aside>
+<footer><p>Copyright footer text</p><script>track();</script></footer>
+</body>
+</html>"""
+
+
+def ensure_corpus(corpus_dir: Path = CORPUS_DIR, pages: int = 60) -> list:
+    """
+    确保语料目录中有网页文件，目录为空时生成合成语料
+
+    Returns:
+        语料文件路径列表
+    """
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    files = sorted(corpus_dir.glob('*.html'))
+    if files:
+        return files
+
+    print(f"语料目录为空，生成 {pages} 篇合成网页: {corpus_dir}")
+    for index in range(pages):
+        # 小、中、大三种篇幅
+        paragraphs = (10, 80, 600)[index % 3]
+        path = corpus_dir / f'synthetic_{index:03d}.html'
+        path.write_text(make_page(index, paragraphs), encoding='utf-8')
+    return sorted(corpus_dir.glob('*.html'))
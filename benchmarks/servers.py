@@ -0,0 +1,339 @@
+"""
+基准测试用的本地服务 - RSS/Atom 数据源、文章网页和模拟的 LLM messages 接口
+
+所有服务都监听 127.0.0.1 的随机端口，在后台线程中运行，不访问外部网络。
+"""
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from xml.sax.saxutils import escape
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+from benchmarks.fixtures import CORPUS_DIR, ensure_corpus
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 客户端读够字节后提前断开连接属于正常情况，不打印异常
+        pass
+
+
+class LocalServer:
+    """在后台线程中运行的 HTTP 服务"""
+
+    def __init__(self):
+        handler = self._make_handler()
+        self.httpd = _QuietHTTPServer(('127.0.0.1', 0), handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self) -> 'LocalServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def count(self):
+        with self._lock:
+            self.requests += 1
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server.count()
+                server.handle_get(self)
+
+            def do_POST(self):
+                server.count()
+                length = int(self.headers.get('Content-Length') or 0)
+                server.handle_post(self, self.rfile.read(length))
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    @staticmethod
+    def send(handler, status: int, body: bytes, content_type: str, headers: dict = None):
+        handler.send_response(status)
+        handler.send_header('Content-Type', content_type)
+        handler.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def handle_get(self, handler):
+        self.send(handler, 404, b'', 'text/plain')
+
+    def handle_post(self, handler, body: bytes):
+        self.send(handler, 404, b'', 'text/plain')
+
+
+class FeedServer(LocalServer):
+    """
+    RSS / Atom 数据源
+
+    路径 /<类别>/<序号> 返回一个 feed：奇数序号为 Atom，偶数为 RSS。每个 feed 含
+    items_per_feed 条时间窗口内的条目和 stale_items 条过期条目；相邻 feed 之间有少量
+    重复条目，便于触发跨数据源去重。支持 ETag 条件请求。
+    """
+
+    def __init__(self, article_url: str, items_per_feed: int = 20, stale_items: int = 5,
+                 latency: float = 0.0, days_back: int = 7):
+        self.article_url = article_url
+        self.items_per_feed = items_per_feed
+        self.stale_items = stale_items
+        self.latency = latency
+        self.days_back = days_back
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        super().__init__()
+
+    def _entries(self, category: str, index: int):
+        window = timedelta(days=self.days_back)
+        total = self.items_per_feed + self.stale_items
+        for n in range(total):
+            # 每个 feed 的前两条与上一个 feed 相同（模拟多个数据源转载同一篇文章）
+            source_index = index - 1 if n < 2 and index > 0 else index
+            key = f'{category}-{source_index}-{n}'
+            if n < self.items_per_feed:
+                published = self.now - window * (n + 0.5) / (self.items_per_feed + 1)
+            else:
+                published = self.now - window - timedelta(days=n)
+            if category == 'academic':
+                link = f'{self.article_url}/arxiv.org/abs/{key}'
+            else:
+                link = f'{self.article_url}/posts/{key}.html'
+            rng = random.Random(key)
+            summary = ' '.join(rng.choice(('model', 'agent', 'benchmark', 'reasoning', 'inference',
+                                           'dataset', 'alignment', 'latency', 'open-source'))
+                               for _ in range(40))
+            yield key, f'{category.title()} update {key}: {summary[:40]}', link, summary, published
+
+    def _render(self, category: str, index: int) -> bytes:
+        if index % 2:
+            entries = ''.join(
+                f'<entry><title>{escape(title)}</title><link href="{escape(link)}"/><id>{key}</id>'
+                f'<updated>{published.isoformat()}</updated><summary>{escape(summary)}</summary></entry>'
+                for key, title, link, summary, published in self._entries(category, index)
+            )
+            return (
+                '<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+                f'<title>{category} {index}</title><id>{category}-{index}</id>'
+                f'<updated>{self.now.isoformat()}</updated>{entries}</feed>'
+            ).encode('utf-8')
+
+        items = ''.join(
+            f'<item><title>{escape(title)}</title><link>{escape(link)}</link><guid>{key}</guid>'
+            f'<pubDate>{format_datetime(published)}</pubDate><description>{escape(summary)}</description></item>'
+            for key, title, link, summary, published in self._entries(category, index)
+        )
+        return (
+            '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+            f'<title>{category} {index}</title><link>{self.url}</link><description>fixture</description>'
+            f'{items}</channel></rss>'
+        ).encode('utf-8')
+
+    def handle_get(self, handler):
+        match = re.fullmatch(r'/(\w+)/(\d+)', handler.path)
+        if not match:
+            return self.send(handler, 404, b'', 'text/plain')
+        time.sleep(self.latency)
+
+        body = self._render(match.group(1), int(match.group(2)))
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        if handler.headers.get('If-None-Match') == etag:
+            return self.send(handler, 304, b'', 'application/xml', {'ETag': etag})
+        content_type = 'application/atom+xml' if int(match.group(2)) % 2 else 'application/rss+xml'
+        self.send(handler, 200, body, content_type, {'ETag': etag})
+
+
+class ArticleServer(LocalServer):
+    """文章网页：按路径哈希从语料目录（benchmarks/corpus，为空时生成合成网页）中选取一篇返回"""
+
+    def __init__(self, corpus_dir: Path = CORPUS_DIR, latency: float = 0.0):
+        self.pages = [path.read_bytes() for path in ensure_corpus(corpus_dir)]
+        self.latency = latency
+        super().__init__()
+
+    def handle_get(self, handler):
+        time.sleep(self.latency)
+        digest = int(hashlib.sha1(handler.path.encode('utf-8')).hexdigest(), 16)
+        page = self.pages[digest % len(self.pages)]
+        self.send(handler, 200, page, 'text/html; charset=utf-8')
+
+
+class FakeLLMServer(LocalServer):
+    """
+    模拟的 Anthropic messages 接口
+
+    每次请求等待 latency 秒（±jitter 比例的随机抖动），按 error_rate 随机返回 529 过载
+    或 429 限流（带 Retry-After）。回复为内容部分的截取；打包摘要的请求返回按 ID 索引的 JSON。
+    用 enqueue 预先排入的状态码按顺序用于之后的请求，优先于随机错误。
+
+    同时模拟 Message Batches 接口（创建、查询、取消、下载结果）：批次提交 batch_delay 秒后
+    结束，每条请求按上述规则决定成功或失败（失败的条目结果为 errored）。
+    """
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.5, error_rate: float = 0.0,
+                 seed: int = 0, retry_after: str = '0', batch_delay: float = 1.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.batch_delay = batch_delay
+        self.rng = random.Random(seed)
+        self.errors = 0
+        self._script = []
+        self._batches = {}
+        super().__init__()
+
+    def enqueue(self, *statuses: int):
+        """排入之后的请求依次返回的状态码（200 表示正常回复）"""
+        with self._lock:
+            self._script.extend(statuses)
+
+    def _roll(self):
+        with self._lock:
+            delay = self.latency * (1 + self.rng.uniform(-self.jitter, self.jitter))
+            if self._script:
+                status = self._script.pop(0)
+            else:
+                status = self.rng.choice((429, 529)) if self.rng.random() < self.error_rate else 200
+            if status != 200:
+                self.errors += 1
+        return max(0.0, delay), status
+
+    def handle_post(self, handler, body: bytes):
+        if handler.path == '/v1/messages/batches':
+            return self._create_batch(handler, body)
+        match = re.fullmatch(r'/v1/messages/batches/([\w-]+)/cancel', handler.path)
+        if match:
+            return self._cancel_batch(handler, match.group(1))
+        if not handler.path.startswith('/v1/messages') or handler.path.startswith('/v1/messages/batches'):
+            return self.send(handler, 404, b'{}', 'application/json')
+
+        delay, status = self._roll()
+        time.sleep(delay)
+        if status != 200:
+            return self._send_error(handler, status)
+        self.send(handler, 200, json.dumps(self._reply(json.loads(body))).encode(), 'application/json')
+
+    def handle_get(self, handler):
+        match = re.fullmatch(r'/v1/messages/batches/([\w-]+)(/results)?', handler.path.split('?')[0])
+        with self._lock:
+            batch = self._batches.get(match.group(1)) if match else None
+        if batch is None:
+            return self.send(handler, 404, b'{}', 'application/json')
+        if match.group(2) is None:
+            return self.send(handler, 200, json.dumps(self._batch_status(batch)).encode(), 'application/json')
+        if not self._batch_ended(batch):
+            return self.send(handler, 404, b'{}', 'application/json')
+        lines = (json.dumps(entry, ensure_ascii=False) for entry in batch['results'])
+        self.send(handler, 200, '\n'.join(lines).encode('utf-8'), 'application/binary')
+
+    def _send_error(self, handler, status: int):
+        error = {'type': 'error', 'error': {'type': 'overloaded_error', 'message': 'injected'}}
+        headers = {'Retry-After': self.retry_after} if status == 429 else {}
+        self.send(handler, status, json.dumps(error).encode(), 'application/json', headers)
+
+    @staticmethod
+    def _reply(request: dict) -> dict:
+        """根据 messages 请求生成回复"""
+        content = request['messages'][0]['content']
+        if isinstance(content, list):
+            content = ''.join(block.get('text', '') for block in content)
+
+        ids = re.findall(r'\[ID: ([\w-]+)\]', content)
+        if ids:
+            text = json.dumps({custom_id: f'模拟摘要 {custom_id}' for custom_id in ids}, ensure_ascii=False)
+        else:
+            text = ' '.join(content[-200:].split())[:80]
+
+        return {
+            'id': 'msg_bench', 'type': 'message', 'role': 'assistant', 'model': request.get('model', 'fake'),
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': 'end_turn', 'stop_sequence': None,
+            'usage': {'input_tokens': len(content) // 4, 'output_tokens': len(text) // 4},
+        }
+
+    def _create_batch(self, handler, body: bytes):
+        delay, status = self._roll()
+        time.sleep(delay)
+        if status != 200:
+            return self._send_error(handler, status)
+
+        results = []
+        for request in json.loads(body)['requests']:
+            _, status = self._roll()
+            if status == 200:
+                result = {'type': 'succeeded', 'message': self._reply(request['params'])}
+            else:
+                result = {'type': 'errored', 'error': {
+                    'type': 'error', 'error': {'type': 'overloaded_error', 'message': 'injected'}}}
+            results.append({'custom_id': request['custom_id'], 'result': result})
+
+        with self._lock:
+            batch_id = f'msgbatch_{len(self._batches) + 1}'
+            batch = self._batches[batch_id] = {
+                'id': batch_id, 'created': datetime.now(timezone.utc), 'canceled': False, 'results': results,
+            }
+        self.send(handler, 200, json.dumps(self._batch_status(batch)).encode(), 'application/json')
+
+    def _cancel_batch(self, handler, batch_id: str):
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return self.send(handler, 404, b'{}', 'application/json')
+            if not self._batch_ended(batch):
+                batch['canceled'] = True
+                batch['results'] = [
+                    {'custom_id': entry['custom_id'], 'result': {'type': 'canceled'}} for entry in batch['results']
+                ]
+        self.send(handler, 200, json.dumps(self._batch_status(batch)).encode(), 'application/json')
+
+    def _batch_ended(self, batch: dict) -> bool:
+        elapsed = (datetime.now(timezone.utc) - batch['created']).total_seconds()
+        return batch['canceled'] or elapsed >= self.batch_delay
+
+    def _batch_status(self, batch: dict) -> dict:
+        """批次对象（与 Message Batches 接口的返回格式相同）"""
+        ended = self._batch_ended(batch)
+        counts = {'processing': 0, 'succeeded': 0, 'errored': 0, 'canceled': 0, 'expired': 0}
+        for entry in batch['results']:
+            counts[entry['result']['type'] if ended else 'processing'] += 1
+        created = batch['created']
+        return {
+            'id': batch['id'], 'type': 'message_batch',
+            'processing_status': 'ended' if ended else 'in_progress',
+            'request_counts': counts,
+            'created_at': created.isoformat(),
+            'expires_at': (created + timedelta(days=1)).isoformat(),
+            'ended_at': (created + timedelta(seconds=self.batch_delay)).isoformat() if ended else None,
+            'cancel_initiated_at': created.isoformat() if batch['canceled'] else None,
+            'archived_at': None,
+            'results_url': f"{self.url}/v1/messages/batches/{batch['id']}/results" if ended else None,
+        }
@@ -0,0 +1,45 @@
+"""
+LLMPulse - 常驻模式入口
+进程常驻，按间隔轮询数据源并为新条目生成摘要，到配置的时间生成报告
+
+用法:
+    python daemon.py               # 按 daemon.report_weekday / report_time 生成报告
+    python daemon.py --report-now  # 启动后立即生成一次报告，之后按计划运行
+"""
+import argparse
+import signal
+import sys
+
+from main import load_config
+from src.daemon import ReportDaemon
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LLMPulse 常驻模式')
+    parser.add_argument('--report-now', action='store_true', help='启动后立即生成一次报告')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🚀 LLMPulse - 常驻模式")
+    print("=" * 60)
+    print()
+
+    print("📖 正在加载配置...")
+    config = load_config()
+    print("✓ 配置加载成功\n")
+
+    print("🔧 正在初始化模块...")
+    daemon = ReportDaemon(config)
+    print("✓ 模块初始化成功\n")
+
+    # 收到终止信号时完成当前的轮询或报告后退出
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    try:
+        daemon.run(report_now=args.report_now)
+    except KeyboardInterrupt:
+        print("\n\n⚠️  程序已中止")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
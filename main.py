@@ -18,9 +18,15 @@ sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from src.data_fetcher import DataFetcher
 from src.llm_analyzer import LLMAnalyzer
-from src.report_generator import ReportGenerator
-from src.html_report_generator import HTMLReportGenerator
+from src.report_document import build_document
+from src.reports import create_renderers, write_reports
 from src.article_summarizer import ArticleSummarizer
+from src.pipeline import StreamingPipeline
+from src.deduplicator import Deduplicator
+from src.prompt_cache import usage_tracker
+from src.resilience import retry_stats
+from src.hedging import hedge_stats
+from src.metrics import metrics
 
 
 def load_config():
@@ -38,41 +44,8 @@ def load_config():
     return config
 
 
-def main():
-    """主程序"""
-    print("=" * 60)
-    print("🚀 LLMPulse - AI 大语言模型周报生成器")
-    print("=" * 60)
-    print()
-
-    # 加载配置
-    print("📖 正在加载配置...")
-    config = load_config()
-    print("✓ 配置加载成功\n")
-
-    # 初始化模块
-    print("🔧 正在初始化模块...")
-    fetcher = DataFetcher(config)
-    analyzer = LLMAnalyzer(config)
-
-    # 根据配置选择报告生成器
-    output_format = config.get('report', {}).get('output_format', 'markdown')
-    if output_format == 'html':
-        generator = HTMLReportGenerator(config)
-        print("✓ 使用 HTML 格式生成报告")
-    else:
-        generator = ReportGenerator(config)
-        print("✓ 使用 Markdown 格式生成报告")
-    print("✓ 模块初始化成功\n")
-
-    # 获取数据
-    print("📡 正在获取数据源...")
-    print("-" * 60)
-    data = fetcher.fetch_all()
-    print("-" * 60)
-    print(f"✓ 数据获取完成\n")
-
-    # 统计信息
+def print_stats(data):
+    """打印各类别统计信息，没有任何内容时退出"""
     total_items = sum(len(items) for items in data.values())
     print(f"📊 本周共获取 {total_items} 条内容:")
     print(f"   - 行业动态: {len(data.get('industry', []))} 条")
@@ -85,43 +58,140 @@ def main():
         print("⚠️  没有获取到任何内容，可能是数据源配置有误或时间范围内无更新")
         sys.exit(0)
 
+
+def run_staged(config, fetcher, analyzer):
+    """按阶段依次执行：抓取 → 文章摘要 → 类别摘要与洞察（并行）"""
+    # 获取数据
+    print("📡 正在获取数据源...")
+    print("-" * 60)
+    with metrics.span('fetch'):
+        data = fetcher.fetch_all()
+    print("-" * 60)
+    print(f"✓ 数据获取完成\n")
+
+    # 跨数据源去重
+    deduplicator = Deduplicator.from_config(config)
+    if deduplicator:
+        with metrics.span('dedupe'):
+            data = deduplicator.dedupe(data)
+
+    # 统计信息
+    print_stats(data)
+
     # 生成每篇文章的摘要
     print("📝 正在为每篇文章生成核心观点摘要...")
     article_summarizer = ArticleSummarizer(config)
 
-    for category in ['industry', 'academic', 'applications', 'startups']:
-        if data.get(category):
-            print(f"\n{category} 类别:")
-            data[category] = article_summarizer.summarize_batch(data[category])
+    article_summarizer.summarize_categories(
+        {category: data[category] for category in DataFetcher.CATEGORIES if data.get(category)}
+    )
 
     print()
 
-    # 生成类别摘要
-    print("🤖 正在使用 LLM 生成类别摘要...")
-    summaries = {}
-
-    for category in ['industry', 'academic', 'applications', 'startups']:
-        if data.get(category):
-            print(f"   正在分析 {category}...")
-            summaries[category] = analyzer.summarize_category(data[category], category)
+    # 并行生成类别摘要和洞察
+    generate_insights = config.get('report', {}).get('generate_insights', True)
+    if generate_insights:
+        print("🤖 正在使用 LLM 并行生成类别摘要和洞察分析...")
+    else:
+        print("🤖 正在使用 LLM 并行生成类别摘要...")
+    with metrics.span('analysis'):
+        summaries = analyzer.summarize_all(data, with_insights=generate_insights)
+    insights = summaries.pop('insights', '')
 
     print("✓ 摘要生成完成\n")
+    return data, summaries, insights
+
+
+def run_streaming(config, fetcher, analyzer):
+    """流水线执行：各类别抓取完成后立即开始文章摘要和类别摘要"""
+    if config.get('summarizer', {}).get('mode') == 'batch':
+        # 逐类别提交会产生多个批次并依次等待，批处理模式改为按阶段执行，所有文章合并为一个批次
+        print("⚠️  批处理摘要模式不支持流水线执行，改为按阶段执行\n")
+        return run_staged(config, fetcher, analyzer)
+
+    print("📡 正在以流水线模式获取数据并生成摘要...")
+    print("-" * 60)
+    article_summarizer = ArticleSummarizer(config)
+    pipeline = StreamingPipeline(
+        fetcher, article_summarizer, analyzer,
+        deduplicator=Deduplicator.from_config(config),
+        max_parallel_categories=config.get('pipeline', {}).get('max_parallel_categories', 4)
+    )
+    with metrics.span('pipeline'):
+        data, summaries = pipeline.run()
+    print("-" * 60)
+    print("✓ 数据获取与摘要生成完成\n")
 
-    # 生成洞察
+    print_stats(data)
+
+    # 生成洞察（依赖所有类别的数据）
     insights = ""
     if config.get('report', {}).get('generate_insights', True):
         print("💡 正在生成洞察分析...")
         insights = analyzer.generate_insights(data)
         print("✓ 洞察生成完成\n")
 
+    return data, summaries, insights
+
+
+def main():
+    """主程序"""
+    print("=" * 60)
+    print("🚀 LLMPulse - AI 大语言模型周报生成器")
+    print("=" * 60)
+    print()
+
+    # 加载配置
+    print("📖 正在加载配置...")
+    metrics.reset()
+    config = load_config()
+    print("✓ 配置加载成功\n")
+
+    # 初始化模块
+    print("🔧 正在初始化模块...")
+    fetcher = DataFetcher(config)
+    analyzer = LLMAnalyzer(config)
+
+    # 根据配置创建报告渲染器（可同时输出多种格式）
+    renderers = create_renderers(config)
+    print(f"✓ 报告格式: {', '.join(renderer.format_name for renderer in renderers)}")
+    print("✓ 模块初始化成功\n")
+
+    pipeline_mode = config.get('pipeline', {}).get('mode', 'staged')
+    if pipeline_mode == 'streaming':
+        data, summaries, insights = run_streaming(config, fetcher, analyzer)
+    else:
+        data, summaries, insights = run_staged(config, fetcher, analyzer)
+
     # 生成报告
     print("📝 正在生成报告...")
-    report_path = generator.generate_report(data, summaries, insights)
-    print(f"✓ 报告已生成: {report_path}\n")
+    document = build_document(data, summaries, insights)
+    report_paths = write_reports(renderers, document)
+    for report_path in report_paths.values():
+        print(f"✓ 报告已生成: {report_path}")
+    print()
+
+    print(f"📈 {usage_tracker.report()}")
+    print(f"🔁 {retry_stats.report()}")
+    if hedge_stats.snapshot()['calls']:
+        print(f"⏱️  {hedge_stats.report()}")
+
+    # 写出运行指标（JSON 运行记录与 Prometheus 文本）
+    metrics_path = metrics.write(config, extra={
+        'report_paths': report_paths,
+        'items': {category: len(items) for category, items in data.items()},
+        'usage': usage_tracker.snapshot(),
+        'retries': retry_stats.snapshot(),
+        'hedging': hedge_stats.snapshot(),
+    })
+    if metrics_path:
+        print(f"📊 运行指标已保存: {metrics_path}")
+    print()
 
     print("=" * 60)
     print("✅ 任务完成!")
-    print(f"📄 报告文件: {report_path}")
+    for report_path in report_paths.values():
+        print(f"📄 报告文件: {report_path}")
     print("=" * 60)
 
 
@@ -0,0 +1,112 @@
+"""
+文章下载模块 - 共享连接池、按主机限流、流式读取并限制下载大小
+"""
+from typing import Optional
+from urllib.parse import urlparse
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+from .rate_limiter import HostLimiter
+
+
+# 明显不是网页的链接后缀，直接跳过
+SKIPPED_EXTENSIONS = (
+    '.pdf', '.zip', '.gz', '.tar', '.png', '.jpg', '.jpeg', '.gif', '.webp',
+    '.mp3', '.mp4', '.mov', '.avi', '.ppt', '.pptx', '.doc', '.docx', '.xls', '.xlsx',
+)
+
+# 允许解析的内容类型
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+
+
+class ArticleFetcher:
+    """下载文章网页，只读取前 max_bytes 字节，跳过 PDF 和二进制内容"""
+
+    def __init__(self, config: dict, headers: dict = None):
+        fetch_config = config.get('article_fetch', {})
+        self.timeout = fetch_config.get('timeout', 10)
+        self.max_bytes = fetch_config.get('max_bytes', 512 * 1024)
+        self.chunk_size = 16 * 1024
+
+        pool_size = fetch_config.get('pool_size', 16)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+        self.host_limiter = HostLimiter(
+            max_concurrent=fetch_config.get('per_host_limit', 2),
+            min_interval=fetch_config.get('per_host_interval', 0)
+        )
+
+    def fetch(self, url: str) -> Optional[bytes]:
+        """
+        下载网页内容
+
+        Args:
+            url: 文章链接
+
+        Returns:
+            网页的前 max_bytes 字节；链接或响应不是网页时返回 None
+
+        Raises:
+            requests.Timeout: 连接或读取超时，或整篇下载超过 timeout 秒
+            requests.RequestException: 请求失败或返回错误状态码
+        """
+        if urlparse(url).path.lower().endswith(SKIPPED_EXTENSIONS):
+            return None
+        return self.host_limiter.run(url, self._download, url)
+
+    def _download(self, url: str) -> Optional[bytes]:
+        # requests 的 timeout 只限制单次读取，持续缓慢发送数据的服务器需要按总时长截止
+        deadline = time.monotonic() + self.timeout
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            if content_type and content_type not in HTML_CONTENT_TYPES:
+                return None
+
+            # 流式读取，达到上限后立即停止，不下载剩余部分
+            chunks = []
+            received = 0
+            for chunk in self._iter_body(response):
+                if time.monotonic() >= deadline:
+                    raise requests.Timeout(f"下载超过 {self.timeout} 秒: {url}")
+                chunks.append(chunk)
+                received += len(chunk)
+                if received >= self.max_bytes:
+                    break
+
+            return b''.join(chunks)[:self.max_bytes]
+
+    def _iter_body(self, response):
+        """
+        逐块读取响应体
+
+        iter_content 每块要读满 chunk_size 字节才返回，服务器缓慢发送时总时长截止无法及时生效；
+        urllib3 支持 read1 时每次只做一次底层读取，有数据就返回。
+        """
+        raw = response.raw
+        if not hasattr(raw, 'read1'):
+            yield from response.iter_content(chunk_size=self.chunk_size)
+            return
+        while True:
+            try:
+                chunk = raw.read1(self.chunk_size, decode_content=True)
+            except ReadTimeoutError as e:
+                raise requests.Timeout(e) from e
+            except ProtocolError as e:
+                raise requests.ConnectionError(e) from e
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        """关闭连接池"""
+        self.session.close()
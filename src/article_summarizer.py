@@ -1,12 +1,296 @@
 """
 文章内容获取和摘要生成模块
 """
-import requests
 from bs4 import BeautifulSoup
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Dict, Tuple
+import json
+import re
+import threading
 import time
-from anthropic import Anthropic
-import os
+
+import requests
+
+try:
+    import lxml.html as lxml_html
+except ImportError:  # lxml 为可选依赖
+    lxml_html = None
+
+from .article_fetcher import ArticleFetcher
+from .item_store import ItemStore
+from .llm_backend import AnthropicBackend, create_backend
+from .metrics import metrics
+from .rate_limiter import RateLimiter, estimate_tokens
+from .summary_cache import SummaryCache
+
+
+# 正文提取时移除的标签（template 的内容不会显示在页面上）
+REMOVED_TAGS = ('script', 'style', 'nav', 'footer', 'header', 'template')
+
+# 主要内容区域的选择器（按优先级排列）
+CONTENT_SELECTORS = ('article', 'main', '.post-content', '.article-content', '.entry-content')
+
+# 正文最多保留的字符数
+MAX_CONTENT_CHARS = 3000
+
+# 无法生成摘要时填入 ai_summary 的占位文本（不是文章内容，不应放进分析提示词）
+INSUFFICIENT_CONTENT_SUMMARY = "内容不足，无法生成摘要"
+NO_SUMMARY = "暂无摘要"
+PLACEHOLDER_SUMMARIES = (INSUFFICIENT_CONTENT_SUMMARY, NO_SUMMARY)
+
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+_BODY_TAG = re.compile(rb'<body[\s>/]', re.IGNORECASE)
+
+
+def decode_html(html: bytes) -> str:
+    """将网页字节解码为文本（优先 UTF-8，其次 meta 中声明的编码）"""
+    try:
+        return html.decode('utf-8')
+    except UnicodeDecodeError:
+        pass
+    match = _META_CHARSET.search(html[:4096])
+    if match:
+        try:
+            return html.decode(match.group(1).decode('ascii'), errors='replace')
+        except LookupError:
+            pass
+    return html.decode('utf-8', errors='replace')
+
+
+class ContentExtractor:
+    """
+    正文提取器基类
+
+    所有实现遵循相同规则：移除 REMOVED_TAGS，按 CONTENT_SELECTORS 的优先级取第一个
+    匹配的区域（都不匹配时使用 body），按行拼接去除首尾空白的文本，截取前
+    max_chars 个字符。
+    """
+
+    name = 'base'
+
+    def __init__(self, max_chars: int = MAX_CONTENT_CHARS):
+        self.max_chars = max_chars
+
+    def extract(self, html: bytes) -> str:
+        raise NotImplementedError
+
+
+class SoupExtractor(ContentExtractor):
+    """基于 BeautifulSoup (html.parser) 的提取器，构建完整 DOM"""
+
+    name = 'soup'
+
+    def extract(self, html: bytes) -> str:
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # 移除脚本和样式
+        for script in soup(list(REMOVED_TAGS)):
+            script.decompose()
+
+        # 尝试找到主要内容区域（常见的类名）
+        main_content = None
+        for selector in CONTENT_SELECTORS:
+            main_content = soup.select_one(selector)
+            if main_content:
+                break
+
+        # 如果找不到主要内容，使用整个 body
+        if not main_content:
+            main_content = soup.body
+
+        if main_content:
+            # 获取文本，限制长度
+            text = main_content.get_text(separator='\n', strip=True)
+            return text[:self.max_chars]
+
+        return ""
+
+
+class LxmlExtractor(ContentExtractor):
+    """基于 lxml（C 实现的解析器）的提取器，需要安装 lxml"""
+
+    name = 'lxml'
+
+    XPATHS = tuple(
+        f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {selector[1:]} ')]"
+        if selector.startswith('.') else f"//{selector}"
+        for selector in CONTENT_SELECTORS
+    )
+
+    def extract(self, html: bytes) -> str:
+        if not html.strip():
+            return ""
+        try:
+            root = lxml_html.document_fromstring(decode_html(html))
+        except ValueError:
+            # 带编码声明的 XHTML 只能以字节形式解析
+            root = lxml_html.document_fromstring(html)
+
+        for element in list(root.iter(*REMOVED_TAGS)):
+            if element.getparent() is not None:
+                element.drop_tree()
+
+        main_content = None
+        for xpath in self.XPATHS:
+            matches = root.xpath(xpath)
+            if matches:
+                main_content = matches[0]
+                break
+
+        # lxml 会为没有 body 的片段补上 body；与其他提取器一致，只有网页中确实有 body 时才回退
+        if main_content is None and _BODY_TAG.search(html):
+            main_content = root.find('body')
+
+        if main_content is None:
+            return ""
+
+        parts = []
+        size = 0
+        for text in main_content.itertext():
+            text = text.strip()
+            if text:
+                parts.append(text)
+                size += len(text) + 1
+                if size > self.max_chars:
+                    break
+        return '\n'.join(parts)[:self.max_chars]
+
+
+class _StreamingContentParser(HTMLParser):
+    """边解析边收集各候选区域文本的解析器"""
+
+    def __init__(self, max_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.removed_depth = {tag: 0 for tag in REMOVED_TAGS}
+        self.removed = 0
+        # 每个候选区域：[是否已开始, 当前嵌套深度(按同名标签计), 起始标签名, 文本片段, 已收集字符数]
+        self.regions = {selector: [False, 0, None, [], 0] for selector in CONTENT_SELECTORS + ('body',)}
+        self.done = False
+        # 分块输入时同一段文本可能被拆成多次回调，遇到标签时再合并处理
+        self._pending = []
+
+    @staticmethod
+    def _matches(selector: str, tag: str, attrs) -> bool:
+        if selector.startswith('.'):
+            classes = dict(attrs).get('class') or ''
+            return selector[1:] in classes.split()
+        return tag == selector
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in self.removed_depth:
+            self.removed_depth[tag] += 1
+            self.removed += 1
+            return
+        if self.removed:
+            return
+        for selector, region in self.regions.items():
+            started, depth, region_tag = region[0], region[1], region[2]
+            if depth:
+                if tag == region_tag:
+                    region[1] += 1
+            elif not started and self._matches(selector, tag, attrs):
+                region[0], region[1], region[2] = True, 1, tag
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag in self.removed_depth:
+            if self.removed_depth[tag]:
+                self.removed_depth[tag] -= 1
+                self.removed -= 1
+            return
+        if self.removed:
+            return
+        for region in self.regions.values():
+            if region[1] and tag == region[2]:
+                region[1] -= 1
+
+    def handle_startendtag(self, tag, attrs):
+        # 自闭合标签不包含文本，不影响区域嵌套深度
+        self._flush()
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_data(self, data):
+        if not self.removed:
+            self._pending.append(data)
+
+    def _flush(self):
+        if not self._pending:
+            return
+        text = ''.join(self._pending).strip()
+        self._pending = []
+        if not text:
+            return
+        for region in self.regions.values():
+            if region[1] and region[4] <= self.max_chars:
+                region[3].append(text)
+                region[4] += len(text) + 1
+        # 最高优先级区域已收集足够文本，后续内容不会影响结果
+        top = self.regions[CONTENT_SELECTORS[0]]
+        if top[4] > self.max_chars:
+            self.done = True
+
+    def result(self) -> str:
+        self._flush()
+        for selector in CONTENT_SELECTORS + ('body',):
+            region = self.regions[selector]
+            if region[0]:
+                return '\n'.join(region[3])[:self.max_chars]
+        return ""
+
+
+class StreamingExtractor(ContentExtractor):
+    """
+    流式提取器
+
+    基于标准库 HTMLParser 分块解析，不构建 DOM，同时收集各候选区域的文本；
+    最高优先级区域收集到足够文本后立即停止解析。
+    """
+
+    name = 'streaming'
+    chunk_size = 8192
+
+    def extract(self, html: bytes) -> str:
+        text = decode_html(html)
+        parser = _StreamingContentParser(self.max_chars)
+        for start in range(0, len(text), self.chunk_size):
+            parser.feed(text[start:start + self.chunk_size])
+            if parser.done:
+                break
+        else:
+            parser.close()
+        return parser.result()
+
+
+EXTRACTORS = {
+    SoupExtractor.name: SoupExtractor,
+    LxmlExtractor.name: LxmlExtractor,
+    StreamingExtractor.name: StreamingExtractor,
+}
+
+
+def create_extractor(name: str = 'auto', max_chars: int = MAX_CONTENT_CHARS) -> ContentExtractor:
+    """
+    根据名称创建正文提取器
+
+    Args:
+        name: auto, lxml, streaming 或 soup；auto 在安装了 lxml 时使用 lxml，否则使用 streaming
+
+    Returns:
+        正文提取器实例
+    """
+    if name == 'auto':
+        name = 'lxml' if lxml_html is not None else 'streaming'
+    if name == 'lxml' and lxml_html is None:
+        print("  ⚠️  未安装 lxml，正文提取改用 streaming")
+        name = 'streaming'
+    if name not in EXTRACTORS:
+        raise ValueError(f"未知的正文提取器: {name}")
+    return EXTRACTORS[name](max_chars=max_chars)
 
 
 class ArticleSummarizer:
@@ -14,16 +298,41 @@ class ArticleSummarizer:
 
     def __init__(self, config: dict):
         self.config = config
-        llm_config = config.get('llm', {})
 
-        self.api_key = llm_config.get('api_key', os.getenv('ANTHROPIC_API_KEY'))
-        self.model = llm_config.get('model', 'claude-3-5-sonnet-20241022')
-        self.client = Anthropic(api_key=self.api_key)
+        # 逐篇摘要调用量最大，可通过 llm.routing.article_summary 路由到更快、更便宜的模型
+        self.backend = create_backend(config, 'article_summary')
+        self.model = self.backend.model
+        self.summary_cache = SummaryCache.from_config(config)
+        self.item_store = ItemStore.from_config(config)
+        # 本次运行中摘要生成失败（使用了备选摘要）的链接，不写入条目库
+        self.failed_links = set()
+
+        # 并发与限流配置
+        summarizer_config = config.get('summarizer', {})
+        self.max_workers = summarizer_config.get('max_workers', 3)
+        self.summary_max_tokens = 200  # 摘要不需要太长
+        self.mode = summarizer_config.get('mode', 'concurrent')
+        if self.mode == 'batch' and not isinstance(self.backend, AnthropicBackend):
+            print(f"  ⚠️  {self.backend.provider} 后端不支持批处理模式，改用 concurrent")
+            self.mode = 'concurrent'
+        elif self.mode == 'batch' and not hasattr(self.backend.client.messages, 'batches'):
+            print("  ⚠️  已安装的 anthropic SDK 不支持 Message Batches（需要 0.41.0 及以上版本），改用 concurrent")
+            self.mode = 'concurrent'
+        self.batch_poll_interval = summarizer_config.get('batch_poll_interval', 30)
+        self.batch_timeout = summarizer_config.get('batch_timeout', 3600)
+        self.pack_size = max(1, summarizer_config.get('pack_size', 10))
+        self.max_summary_chars = 300  # 打包模式下单条摘要的长度上限，超出视为格式错误
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=summarizer_config.get('requests_per_minute', 50),
+            tokens_per_minute=summarizer_config.get('tokens_per_minute', 40000)
+        )
 
         # 请求头，模拟浏览器
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        self.article_fetcher = ArticleFetcher(config, headers=self.headers)
+        self.extractor = create_extractor(config.get('article_fetch', {}).get('extractor', 'auto'))
 
     def fetch_and_summarize(self, item: Dict) -> str:
         """
@@ -36,90 +345,137 @@ class ArticleSummarizer:
             文章摘要（核心观点）
         """
         try:
-            # 首先尝试从 RSS 的 summary 获取内容
-            rss_summary = item.get('summary', '')
-
-            # 如果是 arXiv 论文，直接使用 abstract
-            if 'arxiv.org' in item.get('link', ''):
-                return self._summarize_text(rss_summary, is_paper=True)
-
-            # 对于博客文章，尝试获取完整内容
-            content = self._fetch_article_content(item['link'])
-
-            if content:
-                # 如果成功获取到内容，用完整内容生成摘要
-                return self._summarize_text(content, is_paper=False)
-            else:
-                # 如果获取失败，使用 RSS summary
-                return self._summarize_text(rss_summary, is_paper=False)
+            text, is_paper = self._prepare_source(item)
+            return self._summarize_text(text, is_paper=is_paper, link=item['link'])
 
         except Exception as e:
             print(f"  ⚠️  摘要生成失败 ({item.get('title', '')[:50]}...): {str(e)}")
+            self.failed_links.add(item.get('link', ''))
             # 返回简短的备选摘要
-            return item.get('summary', '')[:100] + '...' if item.get('summary') else '暂无摘要'
+            return self._fallback_summary(item)
 
-    def _fetch_article_content(self, url: str) -> str:
+    def _prepare_source(self, item: Dict) -> Tuple[str, bool]:
         """
-        获取文章正文内容
+        确定用于生成摘要的源文本
 
         Args:
-            url: 文章链接
+            item: 包含 title, link, summary 的字典
 
         Returns:
-            文章正文文本
+            (源文本, 是否为学术论文)
         """
-        try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
+        # 首先尝试从 RSS 的 summary 获取内容
+        rss_summary = item.get('summary', '')
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+        # 如果是 arXiv 论文，直接使用 abstract
+        if 'arxiv.org' in item.get('link', ''):
+            return rss_summary, True
 
-            # 移除脚本和样式
-            for script in soup(['script', 'style', 'nav', 'footer', 'header']):
-                script.decompose()
+        # 对于博客文章，尝试获取完整内容
+        content = self._fetch_article_content(item['link'])
 
-            # 尝试找到主要内容区域（常见的类名）
-            main_content = None
-            for selector in ['article', 'main', '.post-content', '.article-content', '.entry-content']:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    break
+        # 如果成功获取到内容，用完整内容生成摘要；否则使用 RSS summary
+        return (content or rss_summary), False
 
-            # 如果找不到主要内容，使用整个 body
-            if not main_content:
-                main_content = soup.body
+    def _fallback_summary(self, item: Dict) -> str:
+        """摘要生成失败时的备选摘要"""
+        return item.get('summary', '')[:100] + '...' if item.get('summary') else NO_SUMMARY
 
-            if main_content:
-                # 获取文本，限制长度
-                text = main_content.get_text(separator='\n', strip=True)
-                # 限制为前 3000 字符（避免过长）
-                return text[:3000]
+    def _fetch_article_content(self, url: str) -> str:
+        """
+        获取文章正文内容
 
+        Args:
+            url: 文章链接
+
+        Returns:
+            文章正文文本
+        """
+        start = time.monotonic()
+        try:
+            html = self.article_fetcher.fetch(url)
+            metrics.observe('article_fetch_seconds', time.monotonic() - start)
+            if not html:
+                # PDF、二进制等非网页内容，改用 RSS summary
+                metrics.inc('article_fetch_total', result='skipped')
+                return ""
+
+            # 提取正文（限制为前 3000 字符，避免过长）
+            start = time.monotonic()
+            content = self.extractor.extract(html)
+            metrics.observe('article_extract_seconds', time.monotonic() - start)
+            metrics.inc('article_fetch_total', result='ok')
+            return content
+
+        except requests.Timeout as e:
+            print(f"    ⚠️  获取文章内容超时: {str(e)}")
+            metrics.error('article_fetch', e)
+            metrics.inc('article_fetch_total', result='timeout')
             return ""
 
         except Exception as e:
             print(f"    ⚠️  无法获取文章内容: {str(e)}")
+            metrics.error('article_fetch', e)
+            metrics.inc('article_fetch_total', result='error')
             return ""
 
-    def _summarize_text(self, text: str, is_paper: bool = False) -> str:
+    def _summarize_text(self, text: str, is_paper: bool = False, link: str = '') -> str:
         """
         使用 LLM 生成文章摘要
 
         Args:
             text: 文章文本
             is_paper: 是否为学术论文
+            link: 文章链接（用于摘要缓存）
 
         Returns:
             摘要文本
         """
         if not text or len(text.strip()) < 50:
-            return "内容不足，无法生成摘要"
+            return INSUFFICIENT_CONTENT_SUMMARY
 
-        # 构建提示词
-        if is_paper:
-            prompt = f"""请用一句话（30-50字）总结这篇学术论文的核心观点：
+        # 命中缓存则直接返回（键包含实际送入提示词的文本）
+        cache_key = self._cache_key(text, is_paper, link)
+        if cache_key:
+            cached = self.summary_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        prefix, suffix = self._build_prompt(text, is_paper)
+
+        try:
+            self.rate_limiter.acquire(estimate_tokens(prefix + suffix) + self.summary_max_tokens)
+            summary = self._clean_summary(
+                self.backend.complete(prefix, suffix, max_tokens=self.summary_max_tokens)
+            )
+
+            if cache_key:
+                self.summary_cache.put(cache_key, link, summary)
+
+            return summary
+
+        except Exception as e:
+            print(f"    ⚠️  LLM 摘要失败: {str(e)}")
+            self.failed_links.add(link)
+            # 返回文本的前 100 个字符作为备选
+            return text[:100] + '...'
+
+    def _cache_key(self, text: str, is_paper: bool, link: str):
+        """摘要缓存键，未启用缓存时返回 None"""
+        if not self.summary_cache:
+            return None
+        variant = 'paper' if is_paper else 'blog'
+        return SummaryCache.make_key(link, text[:1500], self.model, variant)
 
-{text[:1500]}
+    def _build_prompt(self, text: str, is_paper: bool) -> Tuple[str, str]:
+        """
+        构建单篇文章的摘要提示词
+
+        Returns:
+            (固定的指令前缀, 文章内容)；前缀对同类文章完全相同，可被提示词缓存复用
+        """
+        if is_paper:
+            prefix = """请用一句话（30-50字）总结下面这篇学术论文的核心观点。
 
 要求：
 - 只用一句话说明研究的核心创新点或主要发现
@@ -128,11 +484,11 @@ class ArticleSummarizer:
 - 直接陈述核心内容
 
 示例：提出了一种基于多模态的XXX方法，在YYY任务上提升了ZZZ性能。
+
+论文内容：
 """
         else:
-            prompt = f"""请用一句话（30-50字）总结这篇文章的核心观点：
-
-{text[:1500]}
+            prefix = """请用一句话（30-50字）总结下面这篇文章的核心观点。
 
 要求：
 - 只用一句话说明文章的主要内容或观点
@@ -141,52 +497,339 @@ class ArticleSummarizer:
 - 直接陈述核心内容
 
 示例：OpenAI发布了新的XXX功能，可以帮助用户YYY。
+
+文章内容：
 """
 
-        try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=200,  # 摘要不需要太长
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+        return prefix, text[:1500]
 
-            summary = message.content[0].text.strip()
+    def _clean_summary(self, text: str) -> str:
+        """清理 LLM 输出的摘要"""
+        # 去除可能的引号
+        return text.strip().strip('"').strip("'")
 
-            # 去除可能的引号
-            summary = summary.strip('"').strip("'")
+    def summarize_batch(self, items: list, max_workers: int = None) -> list:
+        """
+        批量生成摘要（带进度显示）
 
-            return summary
+        Args:
+            items: 文章列表
+            max_workers: 并发数量（默认使用配置 summarizer.max_workers；
+                         API 限流由令牌桶控制）
 
-        except Exception as e:
-            print(f"    ⚠️  LLM 摘要失败: {str(e)}")
-            # 返回文本的前 100 个字符作为备选
-            return text[:100] + '...'
+        Returns:
+            带摘要的文章列表（顺序与输入一致）
+        """
+        # 已有摘要的条目（来自条目库）不再重复生成
+        pending = [item for item in items if 'ai_summary' not in item]
+        if len(pending) < len(items):
+            print(f"  跳过 {len(items) - len(pending)} 篇已生成摘要的文章")
+
+        metrics.inc('article_summaries_total', len(items) - len(pending), result='stored')
+        if not pending:
+            return items
+
+        with metrics.span('article_summary', mode=self.mode, items=len(pending)):
+            if self.mode == 'batch':
+                self.summarize_offline(pending, max_workers=max_workers)
+            elif self.mode == 'packed':
+                self.summarize_packed(pending, max_workers=max_workers)
+            else:
+                self._summarize_concurrently(pending, max_workers=max_workers)
 
-    def summarize_batch(self, items: list, max_workers: int = 3) -> list:
+        failed = sum(1 for item in pending if item.get('link', '') in self.failed_links)
+        metrics.inc('article_summaries_total', len(pending) - failed, result='ok')
+        metrics.inc('article_summaries_total', failed, result='failed')
+
+        if self.item_store:
+            self.item_store.save_summaries(
+                item for item in pending if item.get('link', '') not in self.failed_links
+            )
+        return items
+
+    def summarize_categories(self, data: Dict[str, list], max_workers: int = None) -> Dict[str, list]:
         """
-        批量生成摘要（带进度显示）
+        为各类别的文章生成摘要
+
+        批处理模式下所有类别的文章合并为一个批次提交，只等待一次批次结束；
+        摘要直接写回各条目，结果仍按原类别分组。
 
         Args:
-            items: 文章列表
-            max_workers: 并发数量（为避免 API 限流，设置较小值）
+            data: 按类别分组的文章
+            max_workers: 并发数量
 
         Returns:
-            带摘要的文章列表
+            带摘要的按类别分组的文章（与输入为同一字典）
         """
+        if self.mode == 'batch':
+            items = [item for category_items in data.values() for item in category_items or []]
+            if items:
+                print(f"\n全部类别（{len(items)} 篇，合并为一个批次）:")
+                self.summarize_batch(items, max_workers=max_workers)
+            return data
+
+        for category, items in data.items():
+            if items:
+                print(f"\n{category} 类别:")
+                self.summarize_batch(items, max_workers=max_workers)
+        return data
+
+    def _summarize_concurrently(self, items: list, max_workers: int = None) -> list:
+        """逐篇实时调用 LLM，多线程并发生成摘要"""
         total = len(items)
-        print(f"  开始生成 {total} 篇文章的摘要...")
+        workers = max(1, max_workers or self.max_workers)
+        print(f"  开始生成 {total} 篇文章的摘要（并发 {workers}）...")
 
-        for idx, item in enumerate(items, 1):
-            print(f"  [{idx}/{total}] {item.get('title', '')[:50]}...")
+        done = 0
+        progress_lock = threading.Lock()
 
+        def summarize_one(item: Dict):
+            nonlocal done
             # 生成摘要
             item['ai_summary'] = self.fetch_and_summarize(item)
+            with progress_lock:
+                done += 1
+                print(f"  [{done}/{total}] {item.get('title', '')[:50]}...")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # 逐个取结果以便抛出工作线程中的异常
+            for _ in executor.map(summarize_one, items):
+                pass
 
-            # 避免请求过快
-            if idx < total:
-                time.sleep(1)  # 每篇文章间隔1秒
+        print(f"  ✓ 摘要生成完成")
+        return items
+
+    def summarize_offline(self, items: list, max_workers: int = None) -> list:
+        """
+        通过 Message Batches API 一次性提交所有摘要请求
+
+        适合不需要即时结果的定时任务：先并发准备源文本，再把所有提示词作为一个
+        批次提交，轮询直到批次结束并按 custom_id 回填结果。批次中失败、超时或缺失的
+        条目回退到同步调用。
+
+        Args:
+            items: 文章列表
+            max_workers: 准备源文本及同步回退时的并发数量
+
+        Returns:
+            带摘要的文章列表（顺序与输入一致）
+        """
+        total = len(items)
+        workers = max(1, max_workers or self.max_workers)
+        print(f"  开始以批处理模式生成 {total} 篇文章的摘要...")
+
+        pending = self._collect_pending(items, workers)
+        if pending:
+            results = self._run_message_batch({
+                custom_id: self._build_prompt(text, is_paper)
+                for custom_id, (_, text, is_paper, _) in pending.items()
+            })
+            self._apply_results(pending, results, workers, "批处理")
 
         print(f"  ✓ 摘要生成完成")
         return items
+
+    def summarize_packed(self, items: list, max_workers: int = None) -> list:
+        """
+        把多篇文章打包进一次 LLM 调用，要求以 JSON 返回按 ID 索引的摘要
+
+        每次调用最多包含 pack_size 篇文章，各次调用并发进行。响应经过校验，
+        缺失或格式不正确的条目单独重试。
+
+        Args:
+            items: 文章列表
+            max_workers: 准备源文本、并发调用及单独重试时的并发数量
+
+        Returns:
+            带摘要的文章列表（顺序与输入一致）
+        """
+        total = len(items)
+        workers = max(1, max_workers or self.max_workers)
+        print(f"  开始以打包模式生成 {total} 篇文章的摘要（每次 {self.pack_size} 篇）...")
+
+        pending = self._collect_pending(items, workers)
+        if pending:
+            ids = list(pending)
+            groups = [ids[i:i + self.pack_size] for i in range(0, len(ids), self.pack_size)]
+
+            results = {}
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for group_results in executor.map(
+                    lambda group: self._summarize_pack({cid: pending[cid] for cid in group}),
+                    groups
+                ):
+                    results.update(group_results)
+
+            self._apply_results(pending, results, workers, "打包")
+
+        print(f"  ✓ 摘要生成完成")
+        return items
+
+    def _collect_pending(self, items: list, workers: int) -> Dict[str, Tuple]:
+        """
+        并发准备源文本，直接回填不需要调用 LLM 的条目
+
+        Returns:
+            待生成摘要的条目：ID 到 (条目, 源文本, 是否为论文, 缓存键) 的映射
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            sources = list(executor.map(self._safe_prepare_source, items))
+
+        # 不足以生成摘要或命中缓存的条目直接回填
+        pending = {}
+        for idx, (item, source) in enumerate(zip(items, sources)):
+            if source is None:
+                item['ai_summary'] = self._fallback_summary(item)
+                continue
+            text, is_paper = source
+            if not text or len(text.strip()) < 50:
+                item['ai_summary'] = INSUFFICIENT_CONTENT_SUMMARY
+                continue
+            cache_key = self._cache_key(text, is_paper, item['link'])
+            cached = self.summary_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                item['ai_summary'] = cached
+                continue
+            pending[f"item-{idx}"] = (item, text, is_paper, cache_key)
+        return pending
+
+    def _apply_results(self, pending: Dict[str, Tuple], results: Dict[str, str], workers: int, label: str):
+        """回填结果并写入缓存；缺失的条目回退到逐篇同步调用"""
+        failed = []
+        for custom_id, (item, text, is_paper, cache_key) in pending.items():
+            summary = results.get(custom_id)
+            if summary is None:
+                failed.append(custom_id)
+                continue
+            item['ai_summary'] = summary
+            if cache_key:
+                self.summary_cache.put(cache_key, item['link'], summary)
+
+        if not failed:
+            return
+
+        print(f"  ⚠️  {len(failed)} 条{label}结果缺失，回退到同步调用...")
+
+        def summarize_one(custom_id: str):
+            item, text, is_paper, _ = pending[custom_id]
+            item['ai_summary'] = self._summarize_text(text, is_paper=is_paper, link=item['link'])
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(summarize_one, failed):
+                pass
+
+    def _summarize_pack(self, group: Dict[str, Tuple]) -> Dict[str, str]:
+        """
+        一次调用为一组文章生成摘要
+
+        Returns:
+            通过校验的 ID 到摘要的映射（缺失或格式错误的条目不包含在内）
+        """
+        prefix = """请为下面每篇内容分别用一句话（30-50字）总结核心观点。
+
+要求：
+- 学术论文：说明研究的核心创新点或主要发现，语言简洁专业
+- 文章：说明主要内容或观点，语言简洁易懂
+- 不要包含"本文"、"这篇论文"、"这篇文章"等开头，直接陈述核心内容
+- 只输出一个 JSON 对象，键为内容的 ID，值为该内容的一句话摘要，不要输出其他任何文字
+
+示例：{"item-0": "提出了一种基于多模态的XXX方法，在YYY任务上提升了ZZZ性能。", "item-1": "OpenAI发布了新的XXX功能，可以帮助用户YYY。"}
+
+内容列表：
+"""
+        suffix = "\n\n".join(
+            f"[ID: {custom_id}]（{'学术论文' if is_paper else '文章'}）\n{text[:1500]}"
+            for custom_id, (_, text, is_paper, _) in group.items()
+        )
+        max_tokens = self.summary_max_tokens * len(group)
+
+        try:
+            self.rate_limiter.acquire(estimate_tokens(prefix + suffix) + max_tokens)
+            response = self.backend.complete(prefix, suffix, max_tokens=max_tokens)
+            return self._parse_packed_response(response, set(group))
+
+        except Exception as e:
+            print(f"    ⚠️  打包摘要失败: {str(e)}")
+            return {}
+
+    def _parse_packed_response(self, text: str, expected_ids: set) -> Dict[str, str]:
+        """
+        解析并校验打包调用返回的 JSON
+
+        只保留预期 ID 中值为非空字符串且长度合理的条目。
+        """
+        start, end = text.find('{'), text.rfind('}')
+        if start < 0 or end <= start:
+            return {}
+        try:
+            data = json.loads(text[start:end + 1])
+        except ValueError:
+            return {}
+        if not isinstance(data, dict):
+            return {}
+
+        results = {}
+        for custom_id, summary in data.items():
+            if custom_id not in expected_ids or not isinstance(summary, str):
+                continue
+            summary = self._clean_summary(summary)
+            if 0 < len(summary) <= self.max_summary_chars:
+                results[custom_id] = summary
+        return results
+
+    def _safe_prepare_source(self, item: Dict):
+        """准备源文本，失败时返回 None"""
+        try:
+            return self._prepare_source(item)
+        except Exception as e:
+            print(f"  ⚠️  摘要生成失败 ({item.get('title', '')[:50]}...): {str(e)}")
+            self.failed_links.add(item.get('link', ''))
+            return None
+
+    def _run_message_batch(self, prompts: Dict[str, Tuple[str, str]]) -> Dict[str, str]:
+        """
+        提交一个消息批次并等待结果
+
+        Args:
+            prompts: custom_id 到 (指令前缀, 文章内容) 的映射
+
+        Returns:
+            成功条目的 custom_id 到摘要的映射（失败条目不包含在内）
+        """
+        summaries = {}
+        try:
+            client = self.backend.client
+            batch = self.backend.caller.call(
+                client.messages.batches.create,
+                requests=[
+                    {
+                        "custom_id": custom_id,
+                        "params": {
+                            "model": self.model,
+                            "max_tokens": self.summary_max_tokens,
+                            "messages": self.backend.messages(prefix, suffix)
+                        }
+                    }
+                    for custom_id, (prefix, suffix) in prompts.items()
+                ]
+            )
+            print(f"  已提交批次 {batch.id}（{len(prompts)} 条请求），等待处理...")
+
+            deadline = time.monotonic() + self.batch_timeout
+            while batch.processing_status != 'ended':
+                if time.monotonic() >= deadline:
+                    print(f"  ⚠️  批次 {batch.id} 等待超时，已取消")
+                    client.messages.batches.cancel(batch.id)
+                    return summaries
+                time.sleep(self.batch_poll_interval)
+                batch = self.backend.caller.call(client.messages.batches.retrieve, batch.id)
+
+            for entry in self.backend.caller.call(client.messages.batches.results, batch.id):
+                if entry.result.type == 'succeeded':
+                    self.backend.record_usage(entry.result.message.usage)
+                    summaries[entry.custom_id] = self._clean_summary(entry.result.message.content[0].text)
+
+        except Exception as e:
+            print(f"  ⚠️  批处理请求失败: {str(e)}")
+
+        return summaries
@@ -0,0 +1,245 @@
+"""
+常驻模式模块 - 进程常驻，按间隔轮询数据源并为新条目生成摘要，到报告时间时用已处理的数据生成报告
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import threading
+import time
+
+from .article_summarizer import ArticleSummarizer
+from .data_fetcher import DataFetcher
+from .deduplicator import Deduplicator
+from .hedging import hedge_stats
+from .item_store import ItemStore
+from .llm_analyzer import LLMAnalyzer
+from .metrics import metrics
+from .prompt_cache import usage_tracker
+from .report_document import build_document
+from .reports import create_renderers, write_reports
+from .resilience import retry_stats
+
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+def parse_weekday(value) -> Optional[int]:
+    """
+    解析星期（0-6，周一为 0；或英文名称、前三个字母）
+
+    Returns:
+        星期序号；留空时返回 None（表示每天）
+
+    Raises:
+        ValueError: 无法识别的星期
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, int) and 0 <= value <= 6:
+        return value
+    name = str(value).strip().lower()
+    for index, weekday in enumerate(WEEKDAYS):
+        if name in (weekday, weekday[:3]):
+            return index
+    raise ValueError(f"无法识别的星期: {value}")
+
+
+def parse_time(value: str) -> tuple:
+    """
+    解析 "HH:MM" 格式的时间
+
+    Raises:
+        ValueError: 格式错误
+    """
+    hour, minute = (int(part) for part in str(value).split(':'))
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"无效的时间: {value}")
+    return hour, minute
+
+
+class ReportDaemon:
+    """
+    常驻运行的周报生成器
+
+    数据获取、文章摘要和分析模块只创建一次，HTTP 连接、限流状态、缓存和抓取调度
+    在多次轮询之间保持。每次轮询只为新进入报告的条目生成文章摘要；到报告时间时
+    只需生成类别摘要、洞察并渲染报告。
+    """
+
+    def __init__(self, config: dict):
+        self.config = config
+        daemon_config = config.get('daemon', {})
+        self.poll_interval = max(1.0, daemon_config.get('poll_interval_minutes', 30)) * 60
+        self.report_hour, self.report_minute = parse_time(daemon_config.get('report_time', '09:00'))
+        self.report_weekday = parse_weekday(daemon_config.get('report_weekday', 'monday'))
+        self.generate_insights = config.get('report', {}).get('generate_insights', True)
+
+        self.fetcher = DataFetcher(config)
+        self.summarizer = ArticleSummarizer(config)
+        self.analyzer = LLMAnalyzer(config)
+        self.renderers = create_renderers(config)
+
+        # 最近一次轮询处理完的数据，以及已生成的文章摘要（条目键 → 摘要）
+        self.data: Optional[Dict[str, List[Dict]]] = None
+        self.article_summaries: Dict[str, str] = {}
+        self._stop = threading.Event()
+
+        if self.fetcher.feed_cache and not self.fetcher.scheduler:
+            print("⚠️  未启用 schedule：feed 缓存有效期（cache.ttl_hours）内的轮询不会发现新条目")
+
+    def stop(self):
+        """请求停止（当前的轮询或报告完成后退出）"""
+        self._stop.set()
+
+    def next_report_time(self, now: datetime = None) -> datetime:
+        """下一次生成报告的时间"""
+        now = now or datetime.now()
+        candidate = now.replace(hour=self.report_hour, minute=self.report_minute, second=0, microsecond=0)
+        if self.report_weekday is None:
+            return candidate if candidate > now else candidate + timedelta(days=1)
+        candidate += timedelta(days=(self.report_weekday - now.weekday()) % 7)
+        return candidate if candidate > now else candidate + timedelta(days=7)
+
+    def run(self, report_now: bool = False):
+        """
+        主循环，直到 stop() 被调用
+
+        Args:
+            report_now: 启动后立即生成一次报告
+        """
+        next_report = datetime.now() if report_now else self.next_report_time()
+        next_poll = time.monotonic()
+        print(f"🕒 常驻模式已启动：每 {self.poll_interval / 60:g} 分钟轮询一次，"
+              f"下次报告时间 {next_report.strftime('%Y-%m-%d %H:%M')}\n")
+
+        while not self._stop.is_set():
+            if datetime.now() >= next_report:
+                self._guard('report', self.generate_report)
+                next_report = self.next_report_time()
+                print(f"🕒 下次报告时间 {next_report.strftime('%Y-%m-%d %H:%M')}\n")
+                continue
+
+            if time.monotonic() >= next_poll:
+                self._guard('poll', self.poll)
+                next_poll = time.monotonic() + self.poll_interval
+                continue
+
+            wait = min(next_poll - time.monotonic(), (next_report - datetime.now()).total_seconds())
+            self._stop.wait(max(0.0, wait))
+
+        print("👋 常驻模式已停止")
+
+    def poll(self):
+        """抓取数据源，去重，为还没有摘要的条目生成文章摘要"""
+        started = time.monotonic()
+        print(f"📡 [{datetime.now().strftime('%H:%M')}] 正在轮询数据源...")
+        with metrics.span('poll'):
+            with metrics.span('fetch'):
+                data = self.fetcher.fetch_all()
+
+            deduplicator = Deduplicator.from_config(self.config)
+            if deduplicator:
+                with metrics.span('dedupe'):
+                    data = deduplicator.dedupe(data)
+
+            # 上一轮失败的条目在本轮重试
+            self.summarizer.failed_links.clear()
+            keys = {}
+            for items in data.values():
+                for item in items:
+                    key = ItemStore.item_key(item)
+                    keys[key] = item
+                    if 'ai_summary' not in item and key in self.article_summaries:
+                        item['ai_summary'] = self.article_summaries[key]
+
+            new_items = sum(1 for item in keys.values() if 'ai_summary' not in item)
+            # 批处理模式下所有类别的新条目合并为一个批次
+            self.summarizer.summarize_categories({
+                category: items for category, items in data.items()
+                if any('ai_summary' not in item for item in items)
+            })
+
+            # 只保留仍在报告范围内的条目的摘要
+            self.article_summaries = {
+                key: item['ai_summary']
+                for key, item in keys.items()
+                if item.get('ai_summary') and item.get('link', '') not in self.summarizer.failed_links
+            }
+            self.data = data
+
+        total = sum(len(items) for items in data.values())
+        metrics.set('daemon_items', total)
+        print(f"✓ 轮询完成：{total} 条内容，新生成 {new_items} 篇摘要，"
+              f"耗时 {time.monotonic() - started:.1f}s\n")
+
+    def generate_report(self) -> Dict[str, str]:
+        """
+        用已处理的数据生成报告（尚未轮询过时先轮询一次）
+
+        Returns:
+            格式名到报告文件路径的映射
+        """
+        if self.data is None:
+            self.poll()
+
+        data = {category: list(items) for category, items in self.data.items()}
+        total = sum(len(items) for items in data.values())
+        if total == 0:
+            print("⚠️  没有任何内容，跳过本次报告\n")
+            return {}
+
+        started = time.monotonic()
+        print(f"🤖 [{datetime.now().strftime('%H:%M')}] 正在生成报告（{total} 条内容）...")
+        with metrics.span('analysis'):
+            summaries = self.analyzer.summarize_all(data, with_insights=self.generate_insights)
+        insights = summaries.pop('insights', '')
+
+        report_paths = write_reports(self.renderers, build_document(data, summaries, insights))
+        for report_path in report_paths.values():
+            print(f"✓ 报告已生成: {report_path}")
+        print(f"✓ 报告生成耗时 {time.monotonic() - started:.1f}s")
+
+        print(f"📈 {usage_tracker.report()}")
+        print(f"🔁 {retry_stats.report()}")
+        if hedge_stats.snapshot()['calls']:
+            print(f"⏱️  {hedge_stats.report()}")
+
+        # 指标覆盖上次报告以来的所有轮询，写出后重新开始统计
+        metrics_path = metrics.write(self.config, extra={
+            'report_paths': report_paths,
+            'items': {category: len(items) for category, items in data.items()},
+            'usage': usage_tracker.snapshot(),
+            'retries': retry_stats.snapshot(),
+            'hedging': hedge_stats.snapshot(),
+        })
+        if metrics_path:
+            print(f"📊 运行指标已保存: {metrics_path}")
+        print()
+        for tracker in (metrics, usage_tracker, retry_stats, hedge_stats):
+            tracker.reset()
+
+        self.maintain()
+        return report_paths
+
+    def maintain(self):
+        """
+        清理摘要缓存与条目库
+
+        单次运行只在启动时清理；常驻进程不会重新创建它们，每次报告后按有效期和
+        容量上限清理一次，避免数据库无限增长。
+        """
+        if self.summarizer.summary_cache:
+            self.summarizer.summary_cache.evict()
+        # 数据获取与文章摘要模块各自打开同一个条目库，清理一次即可
+        pruned = set()
+        for store in (self.fetcher.item_store, self.summarizer.item_store):
+            if store and store.db_path not in pruned:
+                store.prune()
+                pruned.add(store.db_path)
+
+    def _guard(self, stage: str, func):
+        """执行一次轮询或报告，异常只记录不退出"""
+        try:
+            func()
+        except Exception as e:
+            print(f"❌ {stage} 失败: {str(e)}\n")
+            metrics.error(stage, e)
@@ -3,10 +3,19 @@
 """
 import feedparser
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Dict
-import time
+from typing import Dict, Iterator, List, Optional, Tuple
+import heapq
 import ssl
+import time
+
+from .feed_cache import FeedCache
+from .feed_scheduler import FeedScheduler
+from .item_store import ItemStore
+from .metrics import metrics
+from .opml import load_opml, merge_sources
+from .rate_limiter import HostLimiter
 
 # 禁用 SSL 证书验证（仅用于解决某些 RSS 源的证书问题）
 try:
@@ -20,10 +29,45 @@ else:
 class DataFetcher:
     """从配置的数据源获取内容"""
 
+    CATEGORIES = ['industry', 'academic', 'applications', 'startups']
+
     def __init__(self, config: dict):
         self.config = config
-        self.data_sources = config.get('data_sources', {})
+        self.data_sources = self._load_sources(config)
         self.days_back = config.get('report', {}).get('days_back', 7)
+        self.max_items = config.get('report', {}).get('max_items_per_category', 10)
+
+        fetch_config = config.get('fetch', {})
+        self.concurrent = fetch_config.get('concurrent', True)
+        self.max_workers = fetch_config.get('max_workers', 8)
+        self.host_limiter = HostLimiter(
+            max_concurrent=fetch_config.get('per_host_limit', 2),
+            min_interval=fetch_config.get('per_host_interval', 0.5)
+        )
+        self.feed_cache = FeedCache.from_config(config)
+        self.item_store = ItemStore.from_config(config)
+        self.scheduler = FeedScheduler.from_config(config)
+
+    def _load_sources(self, config: dict) -> Dict[str, List[Dict]]:
+        """读取配置中的数据源，并合并 opml.files 中导入的 feed"""
+        data_sources = config.get('data_sources', {}) or {}
+        opml_config = config.get('opml', {})
+
+        imported = []
+        for path in opml_config.get('files', []) or []:
+            try:
+                sources = load_opml(
+                    path, self.CATEGORIES,
+                    default_category=opml_config.get('default_category', 'industry'),
+                    category_map=opml_config.get('category_map')
+                )
+            except Exception as e:
+                print(f"⚠️  OPML 导入失败 ({path}): {str(e)}")
+                continue
+            print(f"✓ 从 {path} 导入 {len(sources)} 个数据源")
+            imported.extend(sources)
+
+        return merge_sources(data_sources, imported) if imported else data_sources
 
     def fetch_all(self) -> Dict[str, List[Dict]]:
         """
@@ -32,77 +76,249 @@ class DataFetcher:
         Returns:
             按类别分组的内容字典
         """
-        results = {
-            'industry': [],
-            'academic': [],
-            'applications': [],
-            'startups': []
-        }
+        results = {category: [] for category in self.CATEGORIES}
 
-        # 获取行业动态
-        for source in self.data_sources.get('industry', []):
-            items = self._fetch_rss(source)
-            results['industry'].extend(items)
+        for category, items in self.iter_categories():
+            results[category] = items
 
-        # 获取学术前沿
-        for source in self.data_sources.get('academic', []):
-            items = self._fetch_rss(source)
-            results['academic'].extend(items)
+        return results
 
-        # 获取应用生态
-        for source in self.data_sources.get('applications', []):
-            items = self._fetch_rss(source)
-            results['applications'].extend(items)
+    def iter_categories(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """
+        按类别流式产出内容：某个类别的所有数据源完成后立即产出该类别
 
-        # 获取创业生态
-        for source in self.data_sources.get('startups', []):
-            items = self._fetch_rss(source)
-            results['startups'].extend(items)
+        每个类别的结果与 fetch_all 相同（已按时间过滤、排序并截断），
+        便于下游在其他类别仍在抓取时就开始处理。
 
-        # 按时间排序并过滤
+        Yields:
+            (类别, 过滤排序后的内容列表)
+        """
         cutoff_date = datetime.now() - timedelta(days=self.days_back)
-        for category in results:
-            results[category] = self._filter_and_sort(results[category], cutoff_date)
+        sources = {
+            category: self.data_sources.get(category, []) or []
+            for category in self.CATEGORIES
+        }
 
-        return results
+        # 没有数据源的类别直接产出
+        for category in self.CATEGORIES:
+            if not sources[category]:
+                yield category, []
+
+        # 按数据源顺序保存结果，保证合并顺序与串行抓取一致
+        fetched = {category: [None] * len(sources[category]) for category in self.CATEGORIES}
+        remaining = {category: len(sources[category]) for category in self.CATEGORIES}
+        tasks = [
+            (category, index, source)
+            for category in self.CATEGORIES
+            for index, source in enumerate(sources[category])
+        ]
+
+        def complete(category: str, index: int, items: List[Dict]):
+            fetched[category][index] = items
+            remaining[category] -= 1
+            if remaining[category] == 0:
+                # 启用条目库时，报告内容从库中读取（包含之前运行中抓到的条目和摘要）
+                if self.item_store:
+                    return self.item_store.load_category(category, cutoff_date, self.max_items)
+                merged = [item for items in fetched[category] for item in items]
+                return self._filter_and_sort(merged, cutoff_date)
+            return None
+
+        # 启用调度时，未到期的 feed 直接使用已有的条目，不发送请求
+        if self.scheduler:
+            due = self.scheduler.select(source['url'] for _, _, source in tasks)
+            skipped, to_fetch = [], []
+            for task in tasks:
+                entries = None if task[2]['url'] in due else self._scheduled_entries(task[2], cutoff_date)
+                if entries is None:
+                    to_fetch.append(task)
+                else:
+                    skipped.append((task, entries))
+            tasks = to_fetch
+            print(f"🗓️  调度: 抓取 {len(tasks)} 个数据源，{len(skipped)} 个未到抓取时间")
+            metrics.set('feeds_due', len(tasks))
+
+            for (category, index, source), entries in skipped:
+                metrics.inc('feed_fetch_total', category=category, result='skipped')
+                result = complete(category, index, entries)
+                if result is not None:
+                    yield category, result
+
+        try:
+            if self.concurrent and len(tasks) > 1:
+                with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+                    futures = {
+                        executor.submit(self._fetch_rss, source, cutoff_date): (category, index)
+                        for category, index, source in tasks
+                    }
+                    for future in as_completed(futures):
+                        category, index = futures[future]
+                        result = complete(category, index, future.result())
+                        if result is not None:
+                            yield category, result
+            else:
+                for category, index, source in tasks:
+                    result = complete(category, index, self._fetch_rss(source, cutoff_date))
+                    if result is not None:
+                        yield category, result
+        finally:
+            if self.scheduler:
+                self.scheduler.save()
+
+    def _scheduled_entries(self, source: Dict, cutoff_date: datetime) -> Optional[List[Dict]]:
+        """
+        未到抓取时间的 feed 使用的条目
 
-    def _fetch_rss(self, source: Dict) -> List[Dict]:
+        启用条目库时报告内容从库中读取，不需要条目；否则使用覆盖本次范围的 feed 缓存。
+        成功的抓取总会写入缓存，没有缓存说明上次抓取失败（等到重试时间再抓取）
+        或因 max_fetches_per_run 尚未轮到，本次都不包含其条目。
+
+        Returns:
+            条目列表；没有可用的条目时返回 None（需要照常抓取）
+        """
+        if self.item_store:
+            return []
+        if not self.feed_cache:
+            return None
+        cached = self.feed_cache.get(source['url'])
+        if not cached:
+            return []
+        if not self.feed_cache.covers(cached, cutoff_date, self.max_items):
+            return None
+        return [
+            dict(entry, source=source['name'], category=source.get('category', 'unknown'))
+            for entry in cached['entries']
+        ]
+
+    def _fetch_rss(self, source: Dict, cutoff_date: datetime = None) -> List[Dict]:
         """
         获取单个 RSS 源的内容
 
         Args:
             source: 数据源配置
+            cutoff_date: 截止日期（默认为 days_back 天前）
 
         Returns:
-            内容列表
+            内容列表（截止日期之后最新的 max_items_per_category 条）
         """
+        if cutoff_date is None:
+            cutoff_date = datetime.now() - timedelta(days=self.days_back)
+
         items = []
+        category = source.get('category', 'unknown')
+        start = time.monotonic()
         try:
-            print(f"正在获取: {source['name']}...")
-            feed = feedparser.parse(source['url'])
-
-            for entry in feed.entries:
-                # 解析发布时间
-                published = self._parse_date(entry)
-
-                item = {
-                    'title': entry.get('title', ''),
-                    'link': entry.get('link', ''),
-                    'summary': entry.get('summary', entry.get('description', '')),
-                    'published': published,
-                    'source': source['name'],
-                    'category': source.get('category', 'unknown')
-                }
-                items.append(item)
-
-            print(f"  ✓ 获取到 {len(items)} 条内容")
-            time.sleep(0.5)  # 避免请求过快
+            entries = self._fetch_entries(source, cutoff_date)
+            items = [
+                dict(entry, source=source['name'], category=category)
+                for entry in entries
+            ]
+            if self.item_store:
+                self.item_store.upsert(items)
 
         except Exception as e:
-            print(f"  ✗ 获取失败: {str(e)}")
+            print(f"  ✗ {source['name']}: 获取失败: {str(e)}")
+            if self.scheduler:
+                self.scheduler.record_failure(source['url'])
+            metrics.error('fetch', e)
+            metrics.inc('feed_fetch_total', category=category, result='error')
 
+        elapsed = time.monotonic() - start
+        metrics.observe('feed_fetch_seconds', elapsed, category=category)
+        metrics.set('feed_fetch_last_seconds', elapsed, feed=source['name'])
+        metrics.set('feed_items', len(items), feed=source['name'])
         return items
 
+    def _fetch_entries(self, source: Dict, cutoff_date: datetime) -> List[Dict]:
+        """
+        获取单个 feed 的条目（优先使用缓存，过期后发送条件请求）
+
+        解析时即应用截止日期，并只保留最新的 max_items_per_category 条：
+        类别最终的 Top-N 一定落在各 feed 自身的 Top-N 之中。
+
+        Args:
+            source: 数据源配置
+            cutoff_date: 截止日期
+
+        Returns:
+            条目列表（title, link, summary, published），按发布时间倒序
+        """
+        url = source['url']
+        cached = self.feed_cache.get(url) if self.feed_cache else None
+
+        # 缓存是按更小的截取范围保存的（例如调大了 days_back 或条目上限），不能复用
+        if cached and not self.feed_cache.covers(cached, cutoff_date, self.max_items):
+            cached = None
+
+        category = source.get('category', 'unknown')
+        # 启用调度时由调度器决定何时抓取，不再按 TTL 复用缓存
+        if cached and not self.scheduler and self.feed_cache.is_fresh(cached):
+            print(f"  ✓ {source['name']}: 使用缓存 {len(cached['entries'])} 条内容")
+            metrics.inc('feed_fetch_total', category=category, result='cached')
+            return cached['entries']
+
+        print(f"正在获取: {source['name']}...")
+        feed = self.host_limiter.run(
+            url, feedparser.parse, url,
+            etag=cached.get('etag') if cached else None,
+            modified=cached.get('modified') if cached else None
+        )
+
+        if cached and feed.get('status') == 304:
+            if self.scheduler:
+                self.scheduler.record(url, None)
+            self.feed_cache.touch(url, cached)
+            print(f"  ✓ {source['name']}: 未更新 (304)，复用 {len(cached['entries'])} 条缓存内容")
+            metrics.inc('feed_fetch_total', category=category, result='not_modified')
+            return cached['entries']
+
+        entries = heapq.nlargest(
+            self.max_items,
+            self._iter_entries(feed, cutoff_date),
+            key=lambda entry: entry['published']
+        )
+
+        # 连接失败、HTTP 错误或内容无法解析时 feedparser 不抛出异常
+        failed = feed.get('status', 200) >= 400 or (feed.get('bozo') and not feed.entries)
+
+        if self.scheduler and failed:
+            # 按失败处理，以便尽快重试
+            self.scheduler.record_failure(url)
+        elif self.scheduler:
+            # 用全部条目（不受截止日期限制）中带有时间的条目学习更新频率
+            self.scheduler.record(url, [
+                datetime(*parsed[:6])
+                for parsed in (entry.get('published_parsed') or entry.get('updated_parsed')
+                               for entry in feed.entries)
+                if parsed
+            ])
+
+        # 窗口内没有条目的 feed 也写入缓存（抓取失败的除外），调度跳过它时可以确认没有内容
+        if self.feed_cache and (entries or not failed):
+            self.feed_cache.put(
+                url, entries, etag=feed.get('etag'), modified=feed.get('modified'),
+                cutoff_date=cutoff_date, max_items=self.max_items
+            )
+
+        print(f"  ✓ {source['name']}: 获取到 {len(entries)} 条内容（共 {len(feed.entries)} 条）")
+        metrics.inc('feed_fetch_total', category=category, result='fetched')
+        return entries
+
+    def _iter_entries(self, feed, cutoff_date: datetime) -> Iterator[Dict]:
+        """逐条解析 feed 条目，早于截止日期的条目在构建前即被跳过"""
+        for entry in feed.entries:
+            # 解析发布时间
+            published = self._parse_date(entry)
+            if published < cutoff_date:
+                continue
+
+            yield {
+                'title': entry.get('title', ''),
+                'link': entry.get('link', ''),
+                'summary': entry.get('summary', entry.get('description', '')),
+                'published': published
+            }
+
     def _parse_date(self, entry) -> datetime:
         """解析 RSS entry 的日期"""
         if hasattr(entry, 'published_parsed') and entry.published_parsed:
@@ -110,7 +326,9 @@ class DataFetcher:
         elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
             return datetime(*entry.updated_parsed[:6])
         else:
-            return datetime.now()
+            # 没有日期的条目使用首次发现时间，避免每次运行都被当作最新内容
+            first_seen = self.item_store.first_seen(entry.get('link', '')) if self.item_store else None
+            return first_seen or datetime.now()
 
     def _filter_and_sort(self, items: List[Dict], cutoff_date: datetime) -> List[Dict]:
         """
@@ -124,11 +342,7 @@ class DataFetcher:
             过滤排序后的内容列表
         """
         # 过滤日期
-        filtered = [item for item in items if item['published'] >= cutoff_date]
-
-        # 按发布时间倒序排序
-        sorted_items = sorted(filtered, key=lambda x: x['published'], reverse=True)
+        filtered = (item for item in items if item['published'] >= cutoff_date)
 
-        # 限制数量
-        max_items = self.config.get('report', {}).get('max_items_per_category', 10)
-        return sorted_items[:max_items]
+        # 按发布时间倒序取前 max_items 条（有界堆，与稳定排序后截断的结果一致）
+        return heapq.nlargest(self.max_items, filtered, key=lambda x: x['published'])
@@ -0,0 +1,214 @@
+"""
+去重模块 - 在生成摘要前合并跨数据源的重复内容
+"""
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+import random
+import re
+import zlib
+
+
+# 常见的追踪参数，规范化 URL 时去除
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid',
+    'ref', 'ref_src', 'spm', '_hsenc', '_hsmi',
+}
+
+ARXIV_ID_PATTERN = re.compile(
+    r'arxiv\.org/(?:abs|pdf|html)/(\d{4}\.\d{4,5}|[a-z\-]+(?:\.[A-Z]{2})?/\d{7})(?:v\d+)?',
+    re.IGNORECASE
+)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    规范化 URL，使同一内容的不同链接得到相同结果
+
+    - arXiv 的 abs / pdf / html 链接（含版本号）统一为 arxiv:<id>
+    - 去除 utm_* 等追踪参数和锚点，查询参数排序
+    - 主机名小写并去掉 www. 前缀，去掉末尾斜杠，忽略 http / https 差异
+    """
+    if not url:
+        return ''
+
+    url = url.strip()
+    arxiv_match = ARXIV_ID_PATTERN.search(url)
+    if arxiv_match:
+        return f"arxiv:{arxiv_match.group(1).lower()}"
+
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ]
+    path = parsed.path.rstrip('/') or '/'
+
+    return urlunparse(('', host, path, '', urlencode(sorted(query)), ''))
+
+
+CJK_PATTERN = re.compile(r'[\u4e00-\u9fff]+')
+NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)*')
+
+
+def normalize_title(title: str) -> str:
+    """标题规范化：小写，只保留字母、数字和中日韩字符"""
+    return re.sub(r'[^0-9a-z\u4e00-\u9fff]+', ' ', (title or '').lower()).strip()
+
+
+class MinHash:
+    """基于标题 shingle 的 MinHash 签名"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.params = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    @staticmethod
+    def shingles(text: str) -> set:
+        """
+        将规范化后的标题切分为 shingle
+
+        英文和数字按单词切分，中日韩字符按相邻两字切分。
+        """
+        shingles = set()
+        for token in text.split():
+            cjk_runs = CJK_PATTERN.findall(token)
+            for run in cjk_runs:
+                shingles.update(run[i:i + 2] for i in range(max(1, len(run) - 1)))
+            shingles.update(word for word in CJK_PATTERN.split(token) if word)
+        return shingles
+
+    def signature(self, text: str) -> List[int]:
+        """计算文本的 MinHash 签名"""
+        hashes = [zlib.crc32(shingle.encode('utf-8')) for shingle in self.shingles(text)]
+        if not hashes:
+            return [_MAX_HASH] * self.num_perm
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self.params
+        ]
+
+    @staticmethod
+    def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        """由签名估算 Jaccard 相似度"""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class Deduplicator:
+    """
+    跨数据源去重
+
+    先按规范化 URL 精确去重，再用 MinHash + LSH 找出标题近似重复的条目。
+    重复条目合并到最先出现的条目中，被合并条目的来源记录在 sources 字段里。
+    索引在多次调用之间保留，可以按类别流式地逐批去重。
+    """
+
+    def __init__(self, title_threshold: float = 0.8, num_perm: int = 64, bands: int = 16):
+        self.title_threshold = title_threshold
+        self.minhash = MinHash(num_perm=num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._by_url = {}
+        self._buckets = {}
+        self._signatures = []
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional['Deduplicator']:
+        """根据配置中的 dedup 段创建去重器，未启用时返回 None"""
+        dedup_config = config.get('dedup', {})
+        if not dedup_config.get('enabled', True):
+            return None
+        return cls(title_threshold=dedup_config.get('title_threshold', 0.8))
+
+    def dedupe(self, data: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """
+        对按类别分组的内容去重（类别顺序靠前的优先保留）
+
+        Returns:
+            去重后的内容字典
+        """
+        return {category: self.dedupe_items(items) for category, items in data.items()}
+
+    def dedupe_items(self, items: List[Dict]) -> List[Dict]:
+        """
+        对一批条目去重，同时与之前处理过的条目比较
+
+        Returns:
+            未被合并的条目（保持原顺序）
+        """
+        unique = []
+        for item in items:
+            item.setdefault('sources', [item.get('source', '')])
+            original, signature = self._find_duplicate(item)
+            if original is None:
+                self._index(item, signature)
+                unique.append(item)
+                continue
+
+            for source in item['sources']:
+                if source not in original['sources']:
+                    original['sources'].append(source)
+
+        removed = len(items) - len(unique)
+        if removed:
+            print(f"  ✓ 合并了 {removed} 条重复内容")
+        return unique
+
+    def _find_duplicate(self, item: Dict) -> Tuple[Optional[Dict], Optional[List[int]]]:
+        """
+        查找已索引的重复条目
+
+        Returns:
+            (重复的原条目或 None, 标题的 MinHash 签名或 None)
+        """
+        canonical = canonicalize_url(item.get('link', ''))
+        if canonical and canonical in self._by_url:
+            return self._by_url[canonical], None
+
+        title = normalize_title(item.get('title', ''))
+        if not title:
+            return None, None
+
+        signature = self.minhash.signature(title)
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+
+        # 标题中的数字（版本号、型号等）不同则视为不同内容，例如 GPT-4 与 GPT-5
+        numbers = NUMBER_PATTERN.findall(title)
+        for index in sorted(candidates):
+            original, original_signature = self._signatures[index]
+            if NUMBER_PATTERN.findall(normalize_title(original.get('title', ''))) != numbers:
+                continue
+            if MinHash.similarity(signature, original_signature) >= self.title_threshold:
+                return original, signature
+        return None, signature
+
+    def _index(self, item: Dict, signature: Optional[List[int]]):
+        """将条目加入 URL 索引和 LSH 桶"""
+        canonical = canonicalize_url(item.get('link', ''))
+        if canonical:
+            self._by_url[canonical] = item
+
+        if signature is None:
+            return
+        index = len(self._signatures)
+        self._signatures.append((item, signature))
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, []).append(index)
+
+    def _band_keys(self, signature: List[int]):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield band, tuple(signature[start:start + self.rows])
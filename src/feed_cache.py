@@ -0,0 +1,101 @@
+"""
+RSS 缓存模块 - 按 feed URL 在本地保存已解析条目及 ETag / Last-Modified
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class FeedCache:
+    """基于磁盘的 feed 缓存，支持 TTL 与条件请求"""
+
+    def __init__(self, cache_dir: str = '.cache', ttl_hours: float = 24):
+        self.cache_dir = os.path.join(cache_dir, 'feeds')
+        self.ttl_seconds = ttl_hours * 3600
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional['FeedCache']:
+        """根据配置中的 cache 段创建缓存，未启用时返回 None"""
+        cache_config = config.get('cache', {})
+        if not cache_config.get('enabled', False):
+            return None
+        return cls(
+            cache_dir=cache_config.get('dir', '.cache'),
+            ttl_hours=cache_config.get('ttl_hours', 24)
+        )
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        读取某个 feed 的缓存记录
+
+        Returns:
+            包含 etag, modified, fetched_at, entries 的字典；不存在或损坏时返回 None
+        """
+        path = self._path(url)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        for entry in record.get('entries', []):
+            entry['published'] = datetime.fromisoformat(entry['published'])
+        return record
+
+    def is_fresh(self, record: Dict) -> bool:
+        """缓存是否仍在 TTL 内（可直接使用，无需联网）"""
+        return time.time() - record.get('fetched_at', 0) < self.ttl_seconds
+
+    def covers(self, record: Dict, cutoff_date: datetime, max_items: int) -> bool:
+        """
+        缓存的条目范围是否覆盖本次需要的范围
+
+        条目在写入前已按截止日期和数量截取，截取范围比本次更小时不能复用。
+        """
+        cached_cutoff = record.get('cutoff_date')
+        if cached_cutoff and datetime.fromisoformat(cached_cutoff) > cutoff_date:
+            return False
+        cached_max = record.get('max_items')
+        return cached_max is None or cached_max >= max_items
+
+    def put(self, url: str, entries: List[Dict], etag: str = None, modified: str = None,
+            cutoff_date: datetime = None, max_items: int = None):
+        """写入（或覆盖）某个 feed 的缓存"""
+        record = {
+            'url': url,
+            'etag': etag,
+            'modified': modified,
+            'fetched_at': time.time(),
+            'cutoff_date': cutoff_date.isoformat() if cutoff_date else None,
+            'max_items': max_items,
+            'entries': [
+                dict(entry, published=entry['published'].isoformat())
+                for entry in entries
+            ]
+        }
+        self._write(url, record)
+
+    def touch(self, url: str, record: Dict):
+        """服务器返回 304 时刷新缓存时间，条目保持不变"""
+        cutoff_date = record.get('cutoff_date')
+        self.put(
+            url, record.get('entries', []), record.get('etag'), record.get('modified'),
+            cutoff_date=datetime.fromisoformat(cutoff_date) if cutoff_date else None,
+            max_items=record.get('max_items')
+        )
+
+    def _write(self, url: str, record: Dict):
+        path = self._path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
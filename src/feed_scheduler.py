@@ -0,0 +1,151 @@
+"""
+抓取调度模块 - 从各 feed 的条目时间学习更新频率，只抓取到期的 feed
+"""
+from datetime import datetime
+from statistics import median
+from typing import Dict, Iterable, List, Optional, Set
+import json
+import os
+import threading
+import time
+
+
+class FeedScheduler:
+    """
+    按 feed 更新频率安排抓取
+
+    每次抓取后，用最近 sample_size 条条目发布时间间隔的中位数估计更新周期；距最新
+    条目已经过去很久的 feed（停更或更新变慢）按这段时间的一半估计，避免停更的 feed
+    一直被频繁抓取。估计值与上次的间隔取平均以平滑波动，并限制在
+    [min_interval_hours, max_interval_hours] 之间。
+
+    - 没有条目时间或服务器返回 304 时，间隔乘以 backoff
+    - 抓取失败按指数退避重试，不改变学到的间隔
+    - 从未抓取过的 feed 立即到期
+    """
+
+    # 新估计值的权重
+    SMOOTHING = 0.5
+
+    def __init__(self, state_path: str = None, min_interval_hours: float = 1,
+                 max_interval_hours: float = 168, backoff: float = 1.5,
+                 sample_size: int = 20, max_fetches_per_run: int = 0):
+        self.state_path = state_path
+        self.min_interval = min_interval_hours * 3600
+        self.max_interval = max(max_interval_hours * 3600, self.min_interval)
+        self.backoff = max(1.0, backoff)
+        self.sample_size = max(2, sample_size)
+        self.max_fetches_per_run = max(0, max_fetches_per_run)
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict] = self._load()
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional['FeedScheduler']:
+        """根据配置中的 schedule 段创建调度器，未启用时返回 None"""
+        schedule_config = config.get('schedule', {})
+        if not schedule_config.get('enabled', False):
+            return None
+        cache_dir = config.get('cache', {}).get('dir', '.cache')
+        return cls(
+            state_path=schedule_config.get('state_path', os.path.join(cache_dir, 'feed_schedule.json')),
+            min_interval_hours=schedule_config.get('min_interval_hours', 1),
+            max_interval_hours=schedule_config.get('max_interval_hours', 168),
+            backoff=schedule_config.get('backoff', 1.5),
+            sample_size=schedule_config.get('sample_size', 20),
+            max_fetches_per_run=schedule_config.get('max_fetches_per_run', 0),
+        )
+
+    def select(self, urls: Iterable[str], now: float = None) -> Set[str]:
+        """
+        选出本次需要抓取的 feed
+
+        配置了 max_fetches_per_run 时只取到期最久的若干个，其余留到下次。
+
+        Returns:
+            到期的 URL 集合
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            due = [
+                (self._state.get(url, {}).get('next_due', 0), url)
+                for url in dict.fromkeys(urls)
+                if self._state.get(url, {}).get('next_due', 0) <= now
+            ]
+        due.sort()
+        if self.max_fetches_per_run:
+            due = due[:self.max_fetches_per_run]
+        return {url for _, url in due}
+
+    def record(self, url: str, timestamps: Optional[List[datetime]], now: float = None):
+        """
+        记录一次成功的抓取
+
+        Args:
+            url: feed URL
+            timestamps: feed 中所有条目的发布时间；服务器返回 304 时为 None
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._state.get(url, {})
+            previous = state.get('interval')
+            newest = state.get('newest')
+
+            times = sorted(t.timestamp() for t in timestamps or ())[-self.sample_size:]
+            estimate = None
+            if times:
+                newest = max(times[-1], newest or 0)
+                gaps = [later - earlier for earlier, later in zip(times, times[1:]) if later > earlier]
+                estimate = max(median(gaps) if gaps else 0, (now - newest) / 2) or None
+
+            if estimate is None:
+                interval = (previous or self.min_interval) * self.backoff
+            elif previous is None:
+                interval = estimate
+            else:
+                interval = (1 - self.SMOOTHING) * previous + self.SMOOTHING * estimate
+            interval = min(max(interval, self.min_interval), self.max_interval)
+
+            self._state[url] = {
+                'interval': interval,
+                'newest': newest,
+                'last_fetched': now,
+                'next_due': now + interval,
+                'failures': 0,
+            }
+
+    def record_failure(self, url: str, now: float = None):
+        """记录一次失败的抓取，按失败次数指数退避"""
+        now = time.time() if now is None else now
+        with self._lock:
+            state = dict(self._state.get(url, {}))
+            state['failures'] = state.get('failures', 0) + 1
+            delay = min(self.min_interval * 2 ** (state['failures'] - 1), self.max_interval)
+            state['next_due'] = now + delay
+            self._state[url] = state
+
+    def interval_hours(self, url: str) -> Optional[float]:
+        """学到的抓取间隔（小时），尚未抓取过时返回 None"""
+        interval = self._state.get(url, {}).get('interval')
+        return interval / 3600 if interval else None
+
+    def save(self):
+        """保存调度状态（先写临时文件再替换）"""
+        if not self.state_path:
+            return
+        with self._lock:
+            payload = json.dumps(self._state, ensure_ascii=False)
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, self.state_path)
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.state_path:
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
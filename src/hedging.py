@@ -0,0 +1,158 @@
+"""
+对冲请求模块 - 调用超过近期延迟的某个分位数仍未返回时，补发一个重复请求
+"""
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional
+import threading
+import time
+
+
+class HedgeStats:
+    """汇总一次运行中的对冲请求次数"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """清零统计"""
+        with self._lock:
+            self.calls = 0
+            self.hedged = 0
+            self.hedge_wins = 0
+            self.skipped = 0
+
+    def record(self, hedged: bool = False, hedge_won: bool = False, skipped: bool = False):
+        with self._lock:
+            self.calls += 1
+            self.hedged += hedged
+            self.hedge_wins += hedge_won
+            self.skipped += skipped
+
+    def snapshot(self) -> Dict[str, int]:
+        """当前统计值"""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'hedged': self.hedged,
+                'hedge_wins': self.hedge_wins,
+                'skipped': self.skipped,
+            }
+
+    def report(self) -> str:
+        """生成对冲报告"""
+        stats = self.snapshot()
+        return (
+            f"对冲请求 {stats['hedged']} 次（先于原请求返回 {stats['hedge_wins']} 次，"
+            f"超出预算未发送 {stats['skipped']} 次）/ 共 {stats['calls']} 次调用"
+        )
+
+
+# 全局对冲统计，所有启用对冲的后端共用
+hedge_stats = HedgeStats()
+
+
+class Hedger:
+    """
+    对冲请求执行器
+
+    记录最近 window 次调用的延迟；调用耗时超过其中第 percentile 百分位数时，
+    发送一个相同的请求，采用先返回的结果，另一个请求的结果被丢弃。
+
+    额外请求受预算限制：每次调用积累 budget 个额度（上限 max_burst），
+    每次对冲消耗 1 个，因此对冲请求数不超过调用总数的 budget 比例。
+    """
+
+    def __init__(self, percentile: float = 95, window: int = 200, min_samples: int = 20,
+                 budget: float = 0.05, max_burst: float = 5, max_workers: int = 32,
+                 stats: HedgeStats = None):
+        self.percentile = min(max(percentile, 0), 100)
+        self.min_samples = max(1, min_samples)
+        self.budget = budget
+        self.max_burst = max(1, max_burst)
+        self.stats = stats or hedge_stats
+        self._latencies = deque(maxlen=max(window, self.min_samples))
+        self._credits = 0.0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedge')
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional['Hedger']:
+        """根据配置中的 llm.hedging 段创建对冲执行器，未启用时返回 None"""
+        hedging_config = config.get('llm', {}).get('hedging', {})
+        if not hedging_config.get('enabled', False):
+            return None
+        return cls(
+            percentile=hedging_config.get('percentile', 95),
+            window=hedging_config.get('window', 200),
+            min_samples=hedging_config.get('min_samples', 20),
+            budget=hedging_config.get('budget', 0.05),
+            max_burst=hedging_config.get('max_burst', 5)
+        )
+
+    def threshold(self) -> Optional[float]:
+        """当前的对冲等待时间（秒），样本不足时返回 None"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return ordered[index]
+
+    def _observe(self, latency: float):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _take_credit(self) -> bool:
+        with self._lock:
+            if self._credits >= 1:
+                self._credits -= 1
+                return True
+            return False
+
+    def _timed(self, func: Callable, *args):
+        start = time.monotonic()
+        result = func(*args)
+        self._observe(time.monotonic() - start)
+        return result
+
+    def call(self, func: Callable, *args):
+        """
+        执行 func，必要时发送对冲请求
+
+        Returns:
+            先成功返回的结果；两个请求都失败时抛出原请求的异常
+        """
+        with self._lock:
+            self._credits = min(self.max_burst, self._credits + self.budget)
+
+        delay = self.threshold()
+        primary = self._executor.submit(self._timed, func, *args)
+        if delay is None:
+            self.stats.record()
+            return primary.result()
+
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            self.stats.record()
+            return primary.result()
+
+        if not self._take_credit():
+            self.stats.record(skipped=True)
+            return primary.result()
+
+        hedge = self._executor.submit(self._timed, func, *args)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # 另一个请求无法中途中断，结果直接丢弃
+                    for loser in pending:
+                        loser.cancel()
+                    self.stats.record(hedged=True, hedge_won=future is hedge)
+                    return future.result()
+
+        self.stats.record(hedged=True)
+        return primary.result()
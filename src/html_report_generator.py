@@ -1,167 +1,126 @@
 """
 HTML 报告生成模块 - 生成美观的 HTML 格式周报
 """
-from datetime import datetime
-from typing import Dict, List
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import hashlib
 import os
+import re
 
+from .metrics import metrics
+from .report_document import ReportDocument, ReportRenderer, ReportSection
 
-class HTMLReportGenerator:
-    """生成 HTML 格式的周报，使用表格布局"""
-
-    def __init__(self, config: dict):
-        self.config = config
-        self.output_dir = config.get('report', {}).get('output_dir', 'reports')
-
-    def generate_report(self, data: Dict[str, List[Dict]], summaries: Dict[str, str], insights: str = "") -> str:
-        """
-        生成完整的 HTML 报告
-
-        Args:
-            data: 原始数据
-            summaries: 各类别的摘要
-            insights: 洞察分析
 
-        Returns:
-            报告文件路径
-        """
-        # 生成报告内容
-        report_content = self._build_html_report(data, summaries, insights)
-
-        # 保存报告
-        filepath = self._save_report(report_content)
-
-        return filepath
-
-    def _build_html_report(self, data: Dict[str, List[Dict]], summaries: Dict[str, str], insights: str) -> str:
-        """构建 HTML 报告内容"""
-        week_num = datetime.now().isocalendar()[1]
-        year = datetime.now().year
-        date_str = datetime.now().strftime('%Y年%m月%d日')
-
-        # 统计信息
-        total_items = sum(len(items) for items in data.values())
-        industry_count = len(data.get('industry', []))
-        academic_count = len(data.get('academic', []))
-        applications_count = len(data.get('applications', []))
-        startups_count = len(data.get('startups', []))
-
-        # 构建 HTML
-        html = f"""<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>LLMPulse 周报 | 第 {week_num} 周</title>
-    <style>
-        * {{
+# 页面样式（原样嵌入页面，不参与格式化）
+STYLE = """        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
 
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", "Microsoft YaHei", sans-serif;
             line-height: 1.6;
             color: #333;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             padding: 20px;
-        }}
+        }
 
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             border-radius: 12px;
             box-shadow: 0 20px 60px rgba(0,0,0,0.3);
             overflow: hidden;
-        }}
+        }
 
-        header {{
+        header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 40px;
             text-align: center;
-        }}
+        }
 
-        header h1 {{
+        header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
             text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
-        }}
+        }
 
-        header p {{
+        header p {
             font-size: 1.1em;
             opacity: 0.9;
-        }}
+        }
 
-        .summary {{
+        .summary {
             background: #f8f9fa;
             padding: 30px;
             border-bottom: 4px solid #667eea;
-        }}
+        }
 
-        .summary h2 {{
+        .summary h2 {
             color: #667eea;
             margin-bottom: 20px;
             font-size: 1.8em;
-        }}
+        }
 
-        .stats {{
+        .stats {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin-top: 20px;
-        }}
+        }
 
-        .stat-card {{
+        .stat-card {
             background: white;
             padding: 20px;
             border-radius: 8px;
             box-shadow: 0 2px 8px rgba(0,0,0,0.1);
             text-align: center;
             transition: transform 0.2s;
-        }}
+        }
 
-        .stat-card:hover {{
+        .stat-card:hover {
             transform: translateY(-5px);
             box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-        }}
+        }
 
-        .stat-card .icon {{
+        .stat-card .icon {
             font-size: 2em;
             margin-bottom: 10px;
-        }}
+        }
 
-        .stat-card .number {{
+        .stat-card .number {
             font-size: 2.5em;
             font-weight: bold;
             color: #667eea;
-        }}
+        }
 
-        .stat-card .label {{
+        .stat-card .label {
             color: #666;
             font-size: 0.9em;
-        }}
+        }
 
-        .section {{
+        .section {
             padding: 40px;
-        }}
+        }
 
-        .section h2 {{
+        .section h2 {
             color: #333;
             margin-bottom: 20px;
             padding-bottom: 10px;
             border-bottom: 3px solid #667eea;
             font-size: 1.8em;
-        }}
+        }
 
-        .section h2::before {{
+        .section h2::before {
             content: attr(data-icon);
             margin-right: 10px;
-        }}
+        }
 
-        table {{
+        table {
             width: 100%;
             border-collapse: collapse;
             margin: 20px 0;
@@ -169,146 +128,156 @@ class HTMLReportGenerator:
             box-shadow: 0 2px 8px rgba(0,0,0,0.1);
             border-radius: 8px;
             overflow: hidden;
-        }}
+        }
 
-        thead {{
+        thead {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
-        }}
+        }
 
-        th {{
+        th {
             padding: 15px;
             text-align: left;
             font-weight: 600;
             font-size: 0.95em;
-        }}
+        }
 
-        td {{
+        td {
             padding: 15px;
             border-bottom: 1px solid #eee;
-        }}
+        }
 
-        tr:hover {{
+        tr:hover {
             background: #f8f9fa;
-        }}
+        }
 
-        tr:last-child td {{
+        tr:last-child td {
             border-bottom: none;
-        }}
+        }
 
-        .title-cell {{
+        .title-cell {
             font-weight: 500;
             color: #333;
-        }}
+        }
 
-        .title-cell a {{
+        .title-cell a {
             color: #667eea;
             text-decoration: none;
             transition: color 0.2s;
-        }}
+        }
 
-        .title-cell a:hover {{
+        .title-cell a:hover {
             color: #764ba2;
             text-decoration: underline;
-        }}
+        }
 
-        .source-cell {{
+        .source-cell {
             color: #666;
             font-size: 0.9em;
-        }}
+        }
 
-        .date-cell {{
+        .date-cell {
             color: #999;
             font-size: 0.85em;
             white-space: nowrap;
-        }}
+        }
 
-        .summary-cell {{
+        .summary-cell {
             color: #555;
             font-size: 0.9em;
             line-height: 1.5;
             max-width: 400px;
-        }}
+        }
 
-        .summary-text {{
+        .summary-text {
             background: #f8f9fa;
             padding: 20px;
             border-left: 4px solid #667eea;
             margin: 20px 0;
             border-radius: 4px;
             line-height: 1.8;
-        }}
+        }
 
-        .insights {{
+        .insights {
             background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
             color: white;
             padding: 40px;
-        }}
+        }
 
-        .insights h2 {{
+        .insights h2 {
             color: white;
             border-bottom-color: white;
-        }}
+        }
 
-        .insights-content {{
+        .insights-content {
             background: rgba(255,255,255,0.1);
             padding: 20px;
             border-radius: 8px;
             margin-top: 20px;
             backdrop-filter: blur(10px);
-        }}
+        }
 
-        .insights-content h3 {{
+        .insights-content h3 {
             margin-top: 20px;
             margin-bottom: 10px;
-        }}
+        }
 
-        .insights-content p {{
+        .insights-content p {
             line-height: 1.8;
             margin-bottom: 15px;
-        }}
+        }
 
-        footer {{
+        footer {
             background: #2d3748;
             color: white;
             padding: 30px;
             text-align: center;
-        }}
+        }
 
-        footer p {{
+        footer p {
             margin: 5px 0;
             opacity: 0.8;
-        }}
+        }
 
-        .no-data {{
+        .no-data {
             text-align: center;
             padding: 40px;
             color: #999;
             font-style: italic;
-        }}
+        }
 
-        @media (max-width: 768px) {{
-            .container {{
+        @media (max-width: 768px) {
+            .container {
                 border-radius: 0;
-            }}
+            }
 
-            header h1 {{
+            header h1 {
                 font-size: 1.8em;
-            }}
+            }
 
-            .section {{
+            .section {
                 padding: 20px;
-            }}
+            }
 
-            table {{
+            table {
                 font-size: 0.9em;
-            }}
+            }
 
-            th, td {{
+            th, td {
                 padding: 10px;
-            }}
-        }}
-    </style>
+            }
+        }
+"""
+
+# 预编译的章节模板（str.format 占位符）
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>LLMPulse 周报 | 第 {week_num} 周</title>
+    <style>
+{style}    </style>
 </head>
 <body>
     <div class="container">
@@ -348,15 +317,9 @@ class HTMLReportGenerator:
             </div>
         </div>
 
-        {self._build_category_section('industry', '🏢 行业动态', data.get('industry', []), summaries.get('industry', ''))}
-
-        {self._build_category_section('academic', '📚 学术前沿', data.get('academic', []), summaries.get('academic', ''))}
-
-        {self._build_category_section('applications', '🚀 应用实践', data.get('applications', []), summaries.get('applications', ''))}
+        {sections}
 
-        {self._build_category_section('startups', '💼 创业生态', data.get('startups', []), summaries.get('startups', ''))}
-
-        {self._build_insights_section(insights)}
+        {insights}
 
         <footer>
             <p><strong>由 LLMPulse 自动生成</strong></p>
@@ -365,40 +328,14 @@ class HTMLReportGenerator:
     </div>
 </body>
 </html>"""
-        return html
 
-    def _build_category_section(self, category: str, title: str, items: List[Dict], summary: str) -> str:
-        """构建分类章节"""
-        if not items:
-            return f"""
+EMPTY_SECTION_TEMPLATE = """
         <div class="section">
             <h2 data-icon="">{title}</h2>
             <div class="no-data">本周暂无内容更新</div>
         </div>"""
 
-        # 构建表格
-        table_rows = ""
-        for item in items:
-            date_str = item['published'].strftime('%m月%d日')
-            # 获取 AI 生成的摘要
-            ai_summary = item.get('ai_summary', '暂无摘要')
-
-            table_rows += f"""
-                <tr>
-                    <td class="title-cell">
-                        <a href="{item['link']}" target="_blank">{item['title']}</a>
-                    </td>
-                    <td class="summary-cell">{ai_summary}</td>
-                    <td class="source-cell">{item['source']}</td>
-                    <td class="date-cell">{date_str}</td>
-                </tr>"""
-
-        summary_html = ""
-        if summary and summary != "暂无内容":
-            # 将 markdown 格式的摘要转换为 HTML
-            summary_html = f'<div class="summary-text">{self._markdown_to_html(summary)}</div>'
-
-        return f"""
+SECTION_TEMPLATE = """
         <div class="section">
             <h2 data-icon="">{title}</h2>
             {summary_html}
@@ -412,19 +349,22 @@ class HTMLReportGenerator:
                     </tr>
                 </thead>
                 <tbody>
-                    {table_rows}
+                    {rows}
                 </tbody>
             </table>
         </div>"""
 
-    def _build_insights_section(self, insights: str) -> str:
-        """构建洞察章节"""
-        if not insights:
-            return ""
-
-        insights_html = self._markdown_to_html(insights)
+ROW_TEMPLATE = """
+                <tr>
+                    <td class="title-cell">
+                        <a href="{link}" target="_blank">{title}</a>
+                    </td>
+                    <td class="summary-cell">{ai_summary}</td>
+                    <td class="source-cell">{sources}</td>
+                    <td class="date-cell">{date}</td>
+                </tr>"""
 
-        return f"""
+INSIGHTS_TEMPLATE = """
         <div class="insights">
             <h2 data-icon="">💡 洞察与思考</h2>
             <div class="insights-content">
@@ -432,6 +372,168 @@ class HTMLReportGenerator:
             </div>
         </div>"""
 
+# 模板版本：模板变化后，旧的章节缓存自动失效
+TEMPLATE_VERSION = hashlib.sha1(
+    (SECTION_TEMPLATE + EMPTY_SECTION_TEMPLATE + ROW_TEMPLATE).encode('utf-8')
+).hexdigest()[:12]
+
+# 计算缓存键时来源列表内部的分隔符
+FIELD_SEPARATOR = '\x1d'
+
+BOLD_PATTERN = re.compile(r'\*\*(.+?)\*\*')
+LINK_PATTERN = re.compile(r'\[(.+?)\]\((.+?)\)')
+
+
+class SectionCache:
+    """
+    已渲染章节的缓存
+
+    键为章节内容（条目、类别摘要）与模板版本的哈希。内存中保存最近使用的 max_memory_entries
+    个章节（常驻进程中不会无限增长）；配置了缓存目录时同时写入磁盘，下次运行只重新渲染
+    内容有变化的类别。
+    """
+
+    def __init__(self, cache_dir: str = None, max_age_days: float = 7, max_memory_entries: int = 64):
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max(1, max_memory_entries)
+        self._memory: 'OrderedDict[str, str]' = OrderedDict()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._prune(max_age_days)
+
+    @classmethod
+    def from_config(cls, config: dict) -> 'SectionCache':
+        """根据配置中的 cache 段创建章节缓存（未启用缓存时只使用内存）"""
+        cache_config = config.get('cache', {})
+        if not cache_config.get('enabled', False):
+            return cls()
+        return cls(os.path.join(cache_config.get('dir', '.cache'), 'html_sections'))
+
+    def get(self, key: str) -> Optional[str]:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        if not self.cache_dir:
+            return None
+        path = os.path.join(self.cache_dir, f'{key}.html')
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                html = f.read()
+        except OSError:
+            return None
+        os.utime(path)
+        self._remember(key, html)
+        return html
+
+    def put(self, key: str, html: str):
+        self._remember(key, html)
+        if not self.cache_dir:
+            return
+        path = os.path.join(self.cache_dir, f'{key}.html')
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp_path, path)
+
+    def _remember(self, key: str, html: str):
+        """放入内存缓存，超出上限时淘汰最久未使用的章节"""
+        self._memory[key] = html
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _prune(self, max_age_days: float):
+        """删除长时间未使用的章节文件"""
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).timestamp()
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+class HTMLReportGenerator(ReportRenderer):
+    """生成 HTML 格式的周报，使用表格布局"""
+
+    format_name = 'html'
+    extension = 'html'
+
+    def __init__(self, config: dict):
+        super().__init__(config)
+        self.section_cache = SectionCache.from_config(config)
+
+    def render(self, document: ReportDocument) -> str:
+        """构建 HTML 报告内容"""
+        sections = '\n\n        '.join(
+            self._build_category_section(section) for section in document.sections
+        )
+
+        return PAGE_TEMPLATE.format(
+            style=STYLE,
+            week_num=document.week_num,
+            date_str=document.generated_at.strftime('%Y年%m月%d日'),
+            total_items=document.total_items,
+            industry_count=document.count('industry'),
+            academic_count=document.count('academic'),
+            applications_count=document.count('applications'),
+            startups_count=document.count('startups'),
+            sections=sections,
+            insights=self._build_insights_section(document.insights),
+        )
+
+    def _build_category_section(self, section: ReportSection) -> str:
+        """构建分类章节（内容未变化时直接复用上次渲染的结果）"""
+        title = section.title
+        items = section.items
+        if not items:
+            return EMPTY_SECTION_TEMPLATE.format(title=title)
+
+        summary = section.summary or ''
+        # 缓存键直接由原始字段计算（日期只取到天，与显示精度一致），命中时无需格式化任何一行
+        material = '\x1e'.join([
+            f"{item.link}\x1f{item.title}\x1f{item.ai_summary}\x1f"
+            f"{FIELD_SEPARATOR.join(item.sources)}\x1f{item.published.toordinal()}"
+            for item in items
+        ])
+        key = hashlib.sha1(
+            f'{TEMPLATE_VERSION}\x1e{section.category}\x1e{title}\x1e{summary}\x1e{material}'.encode('utf-8')
+        ).hexdigest()
+
+        cached = self.section_cache.get(key)
+        if cached is not None:
+            metrics.inc('report_sections_total', result='hit')
+            return cached
+        metrics.inc('report_sections_total', result='miss')
+
+        table_rows = ''.join(
+            ROW_TEMPLATE.format(
+                link=item.link,
+                title=item.title,
+                ai_summary='暂无摘要' if item.ai_summary is None else item.ai_summary,
+                sources=item.source_text,
+                date=item.published.strftime('%m月%d日'),
+            )
+            for item in items
+        )
+
+        summary_html = ""
+        if summary and summary != "暂无内容":
+            # 将 markdown 格式的摘要转换为 HTML
+            summary_html = f'<div class="summary-text">{self._markdown_to_html(summary)}</div>'
+
+        html = SECTION_TEMPLATE.format(title=title, summary_html=summary_html, rows=table_rows)
+        self.section_cache.put(key, html)
+        return html
+
+    def _build_insights_section(self, insights: str) -> str:
+        """构建洞察章节"""
+        if not insights:
+            return ""
+
+        return INSIGHTS_TEMPLATE.format(insights_html=self._markdown_to_html(insights))
+
     def _markdown_to_html(self, markdown_text: str) -> str:
         """简单的 Markdown 转 HTML（处理常见格式）"""
         html = markdown_text
@@ -440,26 +542,13 @@ class HTMLReportGenerator:
         html = html.replace('### ', '<h3>').replace('\n\n', '</h3>\n\n')
 
         # 处理粗体
-        import re
-        html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
+        html = BOLD_PATTERN.sub(r'<strong>\1</strong>', html)
 
         # 处理链接
-        html = re.sub(r'\[(.+?)\]\((.+?)\)', r'<a href="\2" target="_blank">\1</a>', html)
+        html = LINK_PATTERN.sub(r'<a href="\2" target="_blank">\1</a>', html)
 
         # 处理换行
         html = html.replace('\n\n', '<br><br>')
         html = html.replace('\n', '<br>')
 
         return html
-
-    def _save_report(self, content: str) -> str:
-        """保存报告到文件"""
-        os.makedirs(self.output_dir, exist_ok=True)
-
-        filename = f"week_{datetime.now().isocalendar()[1]}_{datetime.now().strftime('%Y%m%d')}.html"
-        filepath = os.path.join(self.output_dir, filename)
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-
-        return filepath
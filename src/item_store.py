@@ -0,0 +1,182 @@
+"""
+条目存储模块 - 用 SQLite 持久化抓取到的条目，支持增量运行
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+from .deduplicator import canonicalize_url
+
+
+class ItemStore:
+    """
+    本地条目库
+
+    - 以规范化 URL 为键，记录每个条目的首次发现时间（没有发布日期的条目以此作为日期）
+    - 保存已生成的文章摘要，后续运行只为新条目调用 LLM
+    - 报告所需的时间窗口内条目直接从库中读取
+    """
+
+    def __init__(self, db_path: str, retention_days: float = 90):
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS items (
+                key TEXT PRIMARY KEY,
+                link TEXT,
+                title TEXT,
+                summary TEXT,
+                published TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                source TEXT,
+                category TEXT,
+                sources TEXT,
+                ai_summary TEXT,
+                summarized_at TEXT
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_items_category_published ON items (category, published)"
+        )
+        self._conn.commit()
+        self.prune()
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional['ItemStore']:
+        """根据配置中的 store 段创建条目库，未启用时返回 None"""
+        store_config = config.get('store', {})
+        if not store_config.get('enabled', False):
+            return None
+        return cls(
+            db_path=store_config.get('path', os.path.join('.cache', 'items.db')),
+            retention_days=store_config.get('retention_days', 90)
+        )
+
+    @staticmethod
+    def item_key(item: Dict) -> str:
+        """条目键：规范化 URL；没有链接时使用来源 + 标题的哈希"""
+        canonical = canonicalize_url(item.get('link', ''))
+        if canonical:
+            return canonical
+        raw = f"{item.get('source', '')}\x1f{item.get('title', '')}"
+        return 'sha1:' + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def first_seen(self, link: str) -> Optional[datetime]:
+        """查询链接的首次发现时间，未见过时返回 None"""
+        if not link:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT first_seen FROM items WHERE key = ?", (canonicalize_url(link),)
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def upsert(self, items: Iterable[Dict]):
+        """
+        写入抓取到的条目
+
+        新条目记录首次发现时间；已有条目更新标题、简介和最近发现时间，
+        并合并来源列表。首次发现时间和已生成的摘要保持不变。
+        """
+        now = datetime.now().isoformat()
+        with self._lock:
+            for item in items:
+                key = self.item_key(item)
+                row = self._conn.execute(
+                    "SELECT sources FROM items WHERE key = ?", (key,)
+                ).fetchone()
+                sources = item.get('sources') or [item.get('source', '')]
+
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO items (key, link, title, summary, published, first_seen, last_seen, "
+                        "source, category, sources) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            key, item.get('link', ''), item.get('title', ''), item.get('summary', ''),
+                            item['published'].isoformat(), now, now,
+                            item.get('source', ''), item.get('category', 'unknown'),
+                            json.dumps(sources, ensure_ascii=False)
+                        )
+                    )
+                    continue
+
+                merged = json.loads(row[0] or '[]')
+                merged.extend(source for source in sources if source not in merged)
+                self._conn.execute(
+                    "UPDATE items SET title = ?, summary = ?, published = ?, last_seen = ?, sources = ? "
+                    "WHERE key = ?",
+                    (
+                        item.get('title', ''), item.get('summary', ''), item['published'].isoformat(),
+                        now, json.dumps(merged, ensure_ascii=False), key
+                    )
+                )
+            self._conn.commit()
+
+    def load_category(self, category: str, cutoff_date: datetime, limit: int) -> List[Dict]:
+        """
+        读取某个类别在时间窗口内最新的条目
+
+        Returns:
+            按发布时间倒序排列的条目列表；已生成摘要的条目带有 ai_summary 字段
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT link, title, summary, published, first_seen, source, category, sources, ai_summary "
+                "FROM items WHERE category = ? AND published >= ? "
+                "ORDER BY published DESC, first_seen ASC LIMIT ?",
+                (category, cutoff_date.isoformat(), limit)
+            ).fetchall()
+
+        items = []
+        for link, title, summary, published, first_seen, source, category, sources, ai_summary in rows:
+            item = {
+                'title': title,
+                'link': link,
+                'summary': summary,
+                'published': datetime.fromisoformat(published),
+                'source': source,
+                'category': category,
+                'sources': json.loads(sources or '[]') or [source],
+                'first_seen': datetime.fromisoformat(first_seen),
+            }
+            if ai_summary is not None:
+                item['ai_summary'] = ai_summary
+            items.append(item)
+        return items
+
+    def save_summaries(self, items: Iterable[Dict]):
+        """保存条目的文章摘要"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE items SET ai_summary = ?, summarized_at = ? WHERE key = ?",
+                [
+                    (item['ai_summary'], now, self.item_key(item))
+                    for item in items
+                    if item.get('ai_summary')
+                ]
+            )
+            self._conn.commit()
+
+    def prune(self):
+        """删除超过保留期限的条目"""
+        if not self.retention_days:
+            return
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+        with self._lock:
+            self._conn.execute("DELETE FROM items WHERE last_seen < ?", (cutoff,))
+            self._conn.commit()
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,21 @@
+"""
+JSON 报告生成模块 - 导出结构化的周报，供下游工具使用
+"""
+import json
+
+from .report_document import ReportDocument, ReportRenderer
+
+
+class JSONReportGenerator(ReportRenderer):
+    """
+    生成 JSON 格式的周报
+
+    结构与 ReportDocument.to_dict() 一致：schema_version、generated_at、week、total_items、
+    sections（category、name、summary、items）和 insights；日期为 ISO 8601 字符串。
+    """
+
+    format_name = 'json'
+    extension = 'json'
+
+    def render(self, document: ReportDocument) -> str:
+        return json.dumps(document.to_dict(), ensure_ascii=False, indent=2) + '\n'
@@ -0,0 +1,328 @@
+"""
+大报告 HTML 生成模块 - 条目数据写入压缩的 JSON 数据文件，页面按需加载各类别表格
+"""
+import gzip
+import json
+import os
+
+from .html_report_generator import EMPTY_SECTION_TEMPLATE, PAGE_TEMPLATE, STYLE, HTMLReportGenerator
+from .metrics import metrics
+from .report_document import ReportDocument, ReportSection
+
+
+# 数据文件中每行的字段顺序
+FIELDS = ['title', 'link', 'ai_summary', 'sources', 'date']
+
+# 数据文件格式版本
+DATA_VERSION = 1
+
+# 在共用样式之外追加的样式（工具栏、分页）
+LAZY_STYLE = """
+        .toolbar {
+            display: flex;
+            align-items: center;
+            gap: 15px;
+            margin-top: 20px;
+        }
+
+        .toolbar input {
+            flex: 1;
+            padding: 10px 14px;
+            border: 1px solid #ddd;
+            border-radius: 6px;
+            font-size: 0.95em;
+        }
+
+        .toolbar .count {
+            color: #999;
+            font-size: 0.9em;
+            white-space: nowrap;
+        }
+
+        .pager {
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            gap: 15px;
+            color: #666;
+            font-size: 0.9em;
+        }
+
+        .pager button {
+            padding: 6px 14px;
+            border: 1px solid #667eea;
+            border-radius: 6px;
+            background: white;
+            color: #667eea;
+            cursor: pointer;
+        }
+
+        .pager button:disabled {
+            border-color: #ddd;
+            color: #ccc;
+            cursor: default;
+        }
+"""
+
+LAZY_SECTION_TEMPLATE = """
+        <div class="section" data-category="{category}">
+            <h2 data-icon="">{title}</h2>
+            {summary_html}
+            <div class="toolbar">
+                <input type="search" placeholder="筛选标题、核心观点或来源">
+                <span class="count">共 {count} 条</span>
+            </div>
+            <div class="table-slot"><div class="no-data">加载中…</div></div>
+            <div class="pager"></div>
+        </div>"""
+
+# 页面脚本：数据文件在首屏渲染后才请求；类别表格在滚动到附近时才渲染，支持分页和筛选。
+# 只通过 textContent / href 写入条目内容，条目文本不会被当作 HTML 解析。
+SCRIPT_TEMPLATE = """    <script>
+    (function () {
+        var DATA_URL = __DATA_URL__;
+        var PAGE_SIZE = __PAGE_SIZE__;
+        var HEADERS = [['标题', '30%'], ['核心观点', '35%'], ['来源', '20%'], ['发布时间', '15%']];
+        var dataPromise = null;
+
+        function loadData() {
+            if (!dataPromise) {
+                dataPromise = fetch(DATA_URL).then(function (response) {
+                    if (!response.ok) {
+                        throw new Error('HTTP ' + response.status);
+                    }
+                    return response.arrayBuffer();
+                }).then(function (buffer) {
+                    var bytes = new Uint8Array(buffer);
+                    // 服务器按 Content-Encoding 解压过时直接是 JSON
+                    if (bytes[0] === 0x1f && bytes[1] === 0x8b) {
+                        var stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+                        return new Response(stream).text();
+                    }
+                    return new TextDecoder().decode(bytes);
+                }).then(JSON.parse);
+            }
+            return dataPromise;
+        }
+
+        function element(tag, className, text) {
+            var node = document.createElement(tag);
+            if (className) {
+                node.className = className;
+            }
+            if (text !== undefined) {
+                node.textContent = text;
+            }
+            return node;
+        }
+
+        function buildTable(rows) {
+            var table = element('table');
+            var headRow = element('tr');
+            HEADERS.forEach(function (header) {
+                var th = element('th', null, header[0]);
+                th.style.width = header[1];
+                headRow.appendChild(th);
+            });
+            table.appendChild(element('thead')).appendChild(headRow);
+
+            var tbody = element('tbody');
+            rows.forEach(function (row) {
+                var tr = element('tr');
+                var titleCell = element('td', 'title-cell');
+                var link = element('a', null, row[0]);
+                if (/^https?:\\/\\//i.test(row[1])) {
+                    link.href = row[1];
+                }
+                link.target = '_blank';
+                link.rel = 'noopener';
+                titleCell.appendChild(link);
+                tr.appendChild(titleCell);
+                tr.appendChild(element('td', 'summary-cell', row[2]));
+                tr.appendChild(element('td', 'source-cell', row[3]));
+                tr.appendChild(element('td', 'date-cell', row[4]));
+                tbody.appendChild(tr);
+            });
+            table.appendChild(tbody);
+            return table;
+        }
+
+        function setup(section) {
+            var slot = section.querySelector('.table-slot');
+            var pager = section.querySelector('.pager');
+            var input = section.querySelector('.toolbar input');
+            var count = section.querySelector('.toolbar .count');
+
+            loadData().then(function (data) {
+                var rows = data.sections[section.dataset.category] || [];
+                var haystacks = null;
+                var filtered = rows;
+                var page = 0;
+
+                function draw() {
+                    var pages = Math.max(1, Math.ceil(filtered.length / PAGE_SIZE));
+                    page = Math.min(page, pages - 1);
+                    slot.textContent = '';
+                    if (filtered.length) {
+                        slot.appendChild(buildTable(filtered.slice(page * PAGE_SIZE, (page + 1) * PAGE_SIZE)));
+                    } else {
+                        slot.appendChild(element('div', 'no-data', '没有匹配的条目'));
+                    }
+                    count.textContent = filtered.length === rows.length
+                        ? '共 ' + rows.length + ' 条'
+                        : '匹配 ' + filtered.length + ' / ' + rows.length + ' 条';
+
+                    pager.textContent = '';
+                    if (pages > 1) {
+                        var previous = element('button', null, '上一页');
+                        var next = element('button', null, '下一页');
+                        previous.disabled = page === 0;
+                        next.disabled = page === pages - 1;
+                        previous.onclick = function () { page -= 1; draw(); };
+                        next.onclick = function () { page += 1; draw(); };
+                        pager.appendChild(previous);
+                        pager.appendChild(element('span', null, '第 ' + (page + 1) + ' / ' + pages + ' 页'));
+                        pager.appendChild(next);
+                    }
+                }
+
+                var timer = null;
+                input.addEventListener('input', function () {
+                    clearTimeout(timer);
+                    timer = setTimeout(function () {
+                        var query = input.value.trim().toLowerCase();
+                        if (!haystacks) {
+                            haystacks = rows.map(function (row) {
+                                return (row[0] + '\\n' + row[2] + '\\n' + row[3]).toLowerCase();
+                            });
+                        }
+                        filtered = query ? rows.filter(function (row, index) {
+                            return haystacks[index].indexOf(query) !== -1;
+                        }) : rows;
+                        page = 0;
+                        draw();
+                    }, 150);
+                });
+
+                draw();
+            }).catch(function (error) {
+                slot.textContent = '';
+                slot.appendChild(element('div', 'no-data',
+                    '数据加载失败（' + error.message + '）。本地查看时请通过 HTTP 服务打开，如 python -m http.server'));
+            });
+        }
+
+        var sections = document.querySelectorAll('.section[data-category]');
+        if (!('IntersectionObserver' in window)) {
+            sections.forEach(setup);
+            return;
+        }
+        var observer = new IntersectionObserver(function (entries) {
+            entries.forEach(function (entry) {
+                if (entry.isIntersecting) {
+                    observer.unobserve(entry.target);
+                    setup(entry.target);
+                }
+            });
+        }, {rootMargin: '300px'});
+        sections.forEach(function (section) { observer.observe(section); });
+    })();
+    </script>
+"""
+
+
+class LazyHTMLReportGenerator(HTMLReportGenerator):
+    """
+    生成适合大量条目的 HTML 周报
+
+    页面只包含统计、类别摘要和洞察，条目数据写入同名的 .data.json.gz 数据文件，
+    由页面在首屏渲染后加载；各类别表格滚动到附近时才渲染，并在浏览器中分页和筛选。
+    页面大小与条目数无关，数据文件需与页面放在同一目录下并通过 HTTP 访问。
+    """
+
+    format_name = 'html_lazy'
+    extension = 'lazy.html'
+
+    def __init__(self, config: dict):
+        super().__init__(config)
+        self.page_size = max(1, config.get('report', {}).get('page_size', 50))
+
+    def render(self, document: ReportDocument) -> str:
+        """构建 HTML 页面（不含条目数据）"""
+        sections = '\n\n        '.join(
+            self._build_category_section(section) for section in document.sections
+        )
+
+        page = PAGE_TEMPLATE.format(
+            style=STYLE + LAZY_STYLE,
+            week_num=document.week_num,
+            date_str=document.generated_at.strftime('%Y年%m月%d日'),
+            total_items=document.total_items,
+            industry_count=document.count('industry'),
+            academic_count=document.count('academic'),
+            applications_count=document.count('applications'),
+            startups_count=document.count('startups'),
+            sections=sections,
+            insights=self._build_insights_section(document.insights),
+        )
+        script = (SCRIPT_TEMPLATE
+                  .replace('__DATA_URL__', json.dumps(self._data_filename(document)))
+                  .replace('__PAGE_SIZE__', str(self.page_size)))
+        return page.replace('</body>', script + '</body>', 1)
+
+    def _build_category_section(self, section: ReportSection) -> str:
+        """构建分类章节的框架（表格由页面脚本填充）"""
+        if not section.items:
+            return EMPTY_SECTION_TEMPLATE.format(title=section.title)
+
+        summary_html = ""
+        if section.summary and section.summary != "暂无内容":
+            summary_html = f'<div class="summary-text">{self._markdown_to_html(section.summary)}</div>'
+
+        return LAZY_SECTION_TEMPLATE.format(
+            category=section.category,
+            title=section.title,
+            summary_html=summary_html,
+            count=len(section.items),
+        )
+
+    def build_data(self, document: ReportDocument) -> bytes:
+        """
+        构建压缩的条目数据
+
+        每个类别的条目按 FIELDS 顺序存为数组（不重复字段名），日期预先格式化，
+        gzip 的时间戳固定为 0，相同内容得到相同的文件。
+        """
+        payload = {
+            'version': DATA_VERSION,
+            'fields': FIELDS,
+            'sections': {
+                section.category: [
+                    [
+                        item.title,
+                        item.link,
+                        '暂无摘要' if item.ai_summary is None else item.ai_summary,
+                        item.source_text,
+                        item.published.strftime('%m月%d日'),
+                    ]
+                    for item in section.items
+                ]
+                for section in document.sections
+            },
+        }
+        raw = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return gzip.compress(raw, compresslevel=9, mtime=0)
+
+    def _data_filename(self, document: ReportDocument) -> str:
+        return f"{document.file_stem}.data.json.gz"
+
+    def _save_report(self, content: str, document: ReportDocument) -> str:
+        """先保存数据文件再保存页面，页面引用的数据文件总是存在"""
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        data = self.build_data(document)
+        with open(os.path.join(self.output_dir, self._data_filename(document)), 'wb') as f:
+            f.write(data)
+        metrics.set('report_data_bytes', len(data), format=self.format_name)
+
+        return super()._save_report(content, document)
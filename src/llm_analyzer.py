@@ -1,9 +1,13 @@
 """
 LLM 分析模块 - 使用 LLM 对内容进行总结和分析
 """
-from typing import List, Dict
-import os
-from anthropic import Anthropic
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import List, Dict, Tuple
+
+from .llm_backend import LLMBackend, create_backend
+from .metrics import metrics
+from .prompt_packer import PromptPacker, article_summary, item_digest
+from .rate_limiter import estimate_tokens
 
 
 class LLMAnalyzer:
@@ -13,21 +17,84 @@ class LLMAnalyzer:
         self.config = config
         llm_config = config.get('llm', {})
 
-        self.provider = llm_config.get('provider', 'anthropic')
-        self.api_key = llm_config.get('api_key', os.getenv('ANTHROPIC_API_KEY'))
-        self.model = llm_config.get('model', 'claude-3-5-sonnet-20241022')
         self.max_tokens = llm_config.get('max_tokens', 4096)
 
-        if self.provider == 'anthropic':
-            self.client = Anthropic(api_key=self.api_key)
+        # 按任务路由模型（llm.routing），未配置的任务使用 llm 段的默认设置
+        self.summary_backend = create_backend(config, 'category_summary')
+        self.insights_backend = create_backend(config, 'insights')
+
+        # 提示词输入预算（估算 token 数，包含固定的指令部分）
+        self.summary_budget = llm_config.get('summary_input_budget', 3000)
+        self.insights_budget = llm_config.get('insights_input_budget', 2000)
+        self.packer = PromptPacker(self.summary_budget)
+
+        # 并行分析配置
+        self.analysis_max_workers = llm_config.get('analysis_max_workers', 5)
+        self.call_timeout = llm_config.get('call_timeout', 120)
+
+    def summarize_all(self, all_data: Dict[str, List[Dict]], with_insights: bool = True,
+                      max_workers: int = None, timeout: float = None) -> Dict[str, str]:
+        """
+        并行生成所有类别的摘要（以及洞察）
+
+        各调用之间没有依赖，总耗时约等于最慢的一次调用。
+
+        Args:
+            all_data: 所有类别的数据
+            with_insights: 是否同时生成洞察
+            max_workers: 最大并行数（默认使用配置 llm.analysis_max_workers）
+            timeout: 单次调用超时秒数（默认使用配置 llm.call_timeout）
+
+        Returns:
+            类别到摘要的映射；生成洞察时额外包含 insights 键
+        """
+        timeout = timeout or self.call_timeout
+        tasks = {
+            category: (self.summarize_category, (items, category))
+            for category, items in all_data.items()
+            if items
+        }
+        if with_insights:
+            tasks['insights'] = (self.generate_insights, (all_data,))
+
+        if not tasks:
+            return {}
 
-    def summarize_category(self, items: List[Dict], category: str) -> str:
+        results = {}
+        workers = max(1, min(max_workers or self.analysis_max_workers, len(tasks)))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = {}
+        try:
+            futures = {
+                name: executor.submit(func, *args, timeout=timeout)
+                for name, (func, args) in tasks.items()
+            }
+            for name, future in futures.items():
+                try:
+                    # 调用本身带有超时，这里再留出少量余量作为兜底
+                    results[name] = future.result(timeout=timeout + 5)
+                except FutureTimeoutError:
+                    # 还在排队时直接取消，不再发起调用
+                    future.cancel()
+                    print(f"LLM 调用超时: {name}")
+                    results[name] = f"摘要生成失败: 超过 {timeout} 秒未返回"
+        finally:
+            # 取消还在排队的调用（已放弃结果，不再消耗 token）；不等待超时的调用结束。
+            # 等价于 shutdown(cancel_futures=True)，该参数需要 Python 3.9
+            for future in futures.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        return results
+
+    def summarize_category(self, items: List[Dict], category: str, timeout: float = None) -> str:
         """
         为某个类别的内容生成摘要
 
         Args:
             items: 内容列表
             category: 类别名称
+            timeout: 调用超时秒数
 
         Returns:
             摘要文本
@@ -35,20 +102,23 @@ class LLMAnalyzer:
         if not items:
             return f"本周 {category} 类别暂无更新。"
 
-        # 构建提示词
-        content_text = self._format_items_for_prompt(items)
-        prompt = self._build_summary_prompt(content_text, category)
+        # 构建提示词：指令部分之外的预算用于填充条目
+        budget = self.summary_budget - estimate_tokens(''.join(self._build_summary_prompt('', category)))
+        content_text = self._format_items_for_prompt(items, budget)
+        prefix, suffix = self._build_summary_prompt(content_text, category)
 
         # 调用 LLM
-        summary = self._call_llm(prompt)
+        with metrics.span('category_summary', category=category):
+            summary = self._call_llm(prefix, suffix, timeout=timeout, backend=self.summary_backend)
         return summary
 
-    def generate_insights(self, all_data: Dict[str, List[Dict]]) -> str:
+    def generate_insights(self, all_data: Dict[str, List[Dict]], timeout: float = None) -> str:
         """
         基于所有数据生成洞察和思考
 
         Args:
             all_data: 所有类别的数据
+            timeout: 调用超时秒数
 
         Returns:
             洞察分析文本
@@ -58,17 +128,35 @@ class LLMAnalyzer:
         if total_items == 0:
             return "本周暂无重要内容更新。"
 
-        # 构建综合分析提示词
+        # 构建综合分析提示词：各类别按重要性轮流取条目，直到用完预算
+        budget = self.insights_budget - estimate_tokens(''.join(self._build_insights_prompt('')))
+        packed = self.packer.pack_grouped(all_data, self._format_insight_item, budget)
+
         content_summary = ""
-        for category, items in all_data.items():
-            if items:
-                content_summary += f"\n## {category} ({len(items)} 项)\n"
-                for item in items[:5]:  # 每个类别取前5项
-                    content_summary += f"- {item['title']}\n"
+        for category, lines in packed.items():
+            content_summary += f"\n## {category} ({len(all_data[category])} 项)\n"
+            content_summary += "".join(lines)
 
-        prompt = f"""基于本周 AI/LLM 领域的以下动态，请生成 3 个精简洞察：
+        prefix, suffix = self._build_insights_prompt(content_summary)
+        with metrics.span('insights'):
+            insights = self._call_llm(prefix, suffix, timeout=timeout, backend=self.insights_backend)
+        return insights
+
+    def _format_insight_item(self, item: Dict) -> str:
+        """格式化洞察提示词中的单个条目"""
+        summary = article_summary(item)
+        if summary:
+            return f"- {item['title']}：{summary}\n"
+        return f"- {item['title']}\n"
+
+    def _build_insights_prompt(self, content_summary: str) -> Tuple[str, str]:
+        """
+        构建洞察提示词
 
-{content_summary}
+        Returns:
+            (固定的指令前缀, 本周动态列表)
+        """
+        prefix = """基于本周 AI/LLM 领域的动态（列在最后），请生成 3 个精简洞察。
 
 要求：
 1. **只输出 3 个核心洞察**（严格限制数量）
@@ -79,25 +167,33 @@ class LLMAnalyzer:
 输出格式：
 1. **洞察标题**：核心观点（1-2句话）
 2. **洞察标题**：核心观点（1-2句话）
-3. **洞察标题**：核心观点（1-2句话）"""
+3. **洞察标题**：核心观点（1-2句话）
 
-        insights = self._call_llm(prompt)
-        return insights
+本周动态：
+"""
+        return prefix, content_summary
 
-    def _format_items_for_prompt(self, items: List[Dict]) -> str:
-        """格式化内容用于提示词"""
-        formatted = []
-        for idx, item in enumerate(items[:15], 1):  # 最多取15条
-            formatted.append(
-                f"{idx}. 标题: {item['title']}\n"
-                f"   来源: {item['source']}\n"
-                f"   摘要: {item.get('summary', '')[:200]}...\n"
-                f"   链接: {item['link']}\n"
-            )
+    def _format_items_for_prompt(self, items: List[Dict], budget_tokens: int = None) -> str:
+        """格式化内容用于提示词（按重要性排序，在预算内尽量多放条目）"""
+        formatted = self.packer.pack(items, self._format_item, budget_tokens)
         return "\n".join(formatted)
 
-    def _build_summary_prompt(self, content: str, category: str) -> str:
-        """构建摘要提示词"""
+    def _format_item(self, idx: int, item: Dict) -> str:
+        """格式化单个条目"""
+        return (
+            f"{idx}. 标题: {item['title']}\n"
+            f"   来源: {item['source']}\n"
+            f"   摘要: {item_digest(item)}\n"
+            f"   链接: {item['link']}\n"
+        )
+
+    def _build_summary_prompt(self, content: str, category: str) -> Tuple[str, str]:
+        """
+        构建摘要提示词
+
+        Returns:
+            (固定的指令前缀, 内容列表)；同一类别每次运行的前缀完全相同，可被提示词缓存复用
+        """
         category_names = {
             'industry': '行业动态',
             'academic': '学术前沿',
@@ -109,10 +205,7 @@ class LLMAnalyzer:
 
         # 为创业生态类别定制提示词 - 聚焦生产力工具和 AIOps
         if category == 'startups':
-            return f"""你是一位专业的 AI/LLM 生产力工具和 AIOps 领域分析师。请基于以下信息，生成本周{category_cn}的精简摘要。
-
-内容列表：
-{content}
+            prefix = f"""你是一位专业的 AI/LLM 生产力工具和 AIOps 领域分析师。请基于最后给出的内容列表，生成本周{category_cn}的精简摘要。
 
 **聚焦领域**：
 - LLM 生产力工具（代码助手、写作工具、知识管理、自动化工具等）
@@ -136,11 +229,9 @@ class LLMAnalyzer:
 - 每个要点不超过 30 字
 - 如果没有相关内容，返回"本周暂无生产力工具和 AIOps 相关更新"
 """
+            return prefix, f"内容列表：\n{content}"
 
-        return f"""你是一位专业的 AI/LLM 领域分析师。请基于以下内容，生成本周{category_cn}的精简摘要。
-
-内容列表：
-{content}
+        prefix = f"""你是一位专业的 AI/LLM 领域分析师。请基于最后给出的内容列表，生成本周{category_cn}的精简摘要。
 
 要求：
 1. **只提取 3-5 个最重要的核心要点**（严格限制数量）
@@ -155,29 +246,25 @@ class LLMAnalyzer:
 
 注意：严格控制在 3-5 个要点，每个要点不超过 30 字。
 """
+        return prefix, f"内容列表：\n{content}"
 
-    def _call_llm(self, prompt: str) -> str:
+    def _call_llm(self, prefix: str, suffix: str = '', timeout: float = None,
+                  backend: LLMBackend = None) -> str:
         """
         调用 LLM API
 
         Args:
-            prompt: 提示词
+            prefix: 提示词中固定的指令前缀（启用提示词缓存时标记为可缓存）
+            suffix: 提示词中每次变化的内容
+            timeout: 请求超时秒数（默认使用后端的超时设置）
+            backend: 使用的后端（默认为类别摘要的后端）
 
         Returns:
             LLM 响应文本
         """
+        backend = backend or self.summary_backend
         try:
-            if self.provider == 'anthropic':
-                message = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                return message.content[0].text
-            else:
-                return "暂不支持此 LLM 提供商"
+            return backend.complete(prefix, suffix, max_tokens=self.max_tokens, timeout=timeout)
 
         except Exception as e:
             print(f"LLM 调用失败: {str(e)}")
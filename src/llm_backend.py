@@ -0,0 +1,234 @@
+"""
+LLM 后端模块 - 统一的调用接口（Anthropic、OpenAI 兼容接口、离线桩），按任务路由模型
+"""
+from types import SimpleNamespace
+from typing import Dict, Optional
+import json
+import os
+import threading
+import time
+
+import requests
+from anthropic import Anthropic
+
+from .hedging import Hedger
+from .metrics import metrics
+from .prompt_cache import cached_messages, usage_tracker
+from .rate_limiter import estimate_tokens
+from .resilience import ResilientCaller, shared_caller
+
+
+# 各提供商读取 API key 的环境变量
+API_KEY_ENVS = {
+    'anthropic': 'ANTHROPIC_API_KEY',
+    'openai': 'OPENAI_API_KEY',
+}
+
+
+class LLMBackend:
+    """
+    LLM 后端基类
+
+    子类实现 _complete，完成一次不带重试的调用；complete 在其外层套上共享的重试与熔断，
+    启用对冲时再由 Hedger 在慢调用上补发重复请求。
+    """
+
+    provider = ''
+
+    def __init__(self, model: str, caller: ResilientCaller = None, hedger: Hedger = None):
+        self.model = model
+        self.caller = caller or ResilientCaller()
+        self.hedger = hedger
+
+    def complete(self, prefix: str, suffix: str = '', max_tokens: int = 1024,
+                 timeout: float = None) -> str:
+        """
+        生成回复
+
+        Args:
+            prefix: 提示词中固定的指令前缀
+            suffix: 提示词中每次变化的内容
+            max_tokens: 最大输出 token 数
+            timeout: 请求超时秒数（默认使用后端的超时设置）
+
+        Returns:
+            回复文本
+
+        Raises:
+            Exception: 重试耗尽或不可重试的错误，以及熔断时的 CircuitOpenError
+        """
+        start = time.monotonic()
+        try:
+            if self.hedger:
+                result = self.hedger.call(self.caller.call, self._complete, prefix, suffix, max_tokens, timeout)
+            else:
+                result = self.caller.call(self._complete, prefix, suffix, max_tokens, timeout)
+        except Exception as e:
+            metrics.error('llm', e)
+            metrics.inc('llm_calls_total', provider=self.provider, model=self.model, status='error')
+            raise
+        metrics.observe('llm_call_seconds', time.monotonic() - start, provider=self.provider, model=self.model)
+        metrics.inc('llm_calls_total', provider=self.provider, model=self.model, status='ok')
+        return result
+
+    def record_usage(self, usage):
+        """记录一次调用的 token 用量（全局汇总与按模型的指标）"""
+        usage_tracker.record(usage)
+        if usage is not None:
+            metrics.record_tokens(self.model, usage)
+
+    def _complete(self, prefix: str, suffix: str, max_tokens: int, timeout: Optional[float]) -> str:
+        raise NotImplementedError
+
+
+class AnthropicBackend(LLMBackend):
+    """Anthropic Messages API，固定前缀标记为可缓存"""
+
+    provider = 'anthropic'
+
+    def __init__(self, model: str, api_key: str = None, base_url: str = None,
+                 prompt_caching: bool = True, caller: ResilientCaller = None, hedger: Hedger = None):
+        super().__init__(model, caller, hedger)
+        # 重试由共享的容错层负责，关闭 SDK 自带的重试
+        self.client = Anthropic(api_key=api_key, base_url=base_url, max_retries=0)
+        self.prompt_caching = prompt_caching
+
+    def messages(self, prefix: str, suffix: str):
+        """构建 messages 参数（供 Message Batches 等直接使用客户端的场景）"""
+        return cached_messages(prefix, suffix, self.prompt_caching)
+
+    def _complete(self, prefix, suffix, max_tokens, timeout):
+        options = {'timeout': timeout} if timeout else {}
+        message = self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            messages=self.messages(prefix, suffix),
+            **options
+        )
+        self.record_usage(message.usage)
+        return message.content[0].text
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """
+    OpenAI 兼容的 Chat Completions 接口（OpenAI、vLLM、Ollama 等）
+
+    服务端会自动缓存相同的提示词前缀，因此前缀和内容按顺序拼接在同一条消息中。
+    """
+
+    provider = 'openai'
+
+    def __init__(self, model: str, api_key: str = None, base_url: str = None,
+                 timeout: float = 120, caller: ResilientCaller = None, hedger: Hedger = None):
+        super().__init__(model, caller, hedger)
+        self.url = (base_url or 'https://api.openai.com/v1').rstrip('/') + '/chat/completions'
+        self.timeout = timeout
+        self.session = requests.Session()
+        if api_key:
+            self.session.headers['Authorization'] = f'Bearer {api_key}'
+
+    def _complete(self, prefix, suffix, max_tokens, timeout):
+        response = self.session.post(
+            self.url,
+            json={
+                'model': self.model,
+                'max_tokens': max_tokens,
+                'messages': [{'role': 'user', 'content': prefix + suffix}],
+            },
+            timeout=timeout or self.timeout
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        usage = data.get('usage') or {}
+        cached = (usage.get('prompt_tokens_details') or {}).get('cached_tokens', 0) or 0
+        self.record_usage(SimpleNamespace(
+            input_tokens=(usage.get('prompt_tokens', 0) or 0) - cached,
+            output_tokens=usage.get('completion_tokens', 0),
+            cache_read_input_tokens=cached,
+            cache_creation_input_tokens=0
+        ))
+        return data['choices'][0]['message']['content'] or ''
+
+
+class StubBackend(LLMBackend):
+    """
+    离线桩后端，不发起网络请求
+
+    直接截取内容部分作为回复，用于本地调试、演示和压测其余流程。
+    """
+
+    provider = 'stub'
+
+    def __init__(self, model: str = 'stub', max_chars: int = 80, caller: ResilientCaller = None,
+                 hedger: Hedger = None):
+        super().__init__(model, caller, hedger)
+        self.max_chars = max_chars
+
+    def _complete(self, prefix, suffix, max_tokens, timeout):
+        text = ' '.join((suffix or prefix).split())[:self.max_chars]
+        self.record_usage(SimpleNamespace(
+            input_tokens=estimate_tokens(prefix + suffix),
+            output_tokens=estimate_tokens(text)
+        ))
+        return text
+
+
+_backends: Dict[str, LLMBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def task_settings(config: dict, task: str) -> dict:
+    """
+    某个任务使用的 LLM 设置
+
+    以 llm 段为默认值，llm.routing.<task> 中的 provider、model、api_key、base_url、
+    hedging 覆盖对应项。
+    """
+    llm_config = config.get('llm', {})
+    settings = {key: value for key, value in llm_config.items() if key != 'routing'}
+    settings.update((llm_config.get('routing') or {}).get(task) or {})
+    return settings
+
+
+def create_backend(config: dict, task: str) -> LLMBackend:
+    """
+    创建（或复用）某个任务的 LLM 后端
+
+    解析后设置完全相同的任务共用一个后端实例（连接池）；hedging、api_key、prompt_caching
+    等任一项不同时各自创建。同一服务（provider、base_url）的后端总是共用重试与熔断状态。
+
+    Raises:
+        ValueError: 不支持的提供商
+    """
+    settings = task_settings(config, task)
+    provider = settings.get('provider', 'anthropic')
+    model = settings.get('model', 'claude-3-5-sonnet-20241022')
+    base_url = settings.get('base_url')
+    api_key = settings.get('api_key') or os.getenv(API_KEY_ENVS.get(provider, ''), '') or None
+
+    # 以完整设置为键，避免按任务覆盖的 hedging、api_key 等被先创建的后端吞掉
+    key = json.dumps({**settings, 'api_key': api_key}, sort_keys=True, default=str)
+    with _backends_lock:
+        if key in _backends:
+            return _backends[key]
+
+        caller = shared_caller({'llm': settings})
+        hedger = Hedger.from_config({'llm': settings})
+        if provider == 'anthropic':
+            backend = AnthropicBackend(
+                model, api_key=api_key, base_url=base_url,
+                prompt_caching=settings.get('prompt_caching', True), caller=caller, hedger=hedger
+            )
+        elif provider == 'openai':
+            backend = OpenAICompatibleBackend(
+                model, api_key=api_key, base_url=base_url,
+                timeout=settings.get('call_timeout', 120), caller=caller, hedger=hedger
+            )
+        elif provider == 'stub':
+            backend = StubBackend(model, caller=caller, hedger=hedger)
+        else:
+            raise ValueError(f"不支持的 LLM 提供商: {provider}")
+
+        _backends[key] = backend
+        return backend
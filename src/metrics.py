@@ -0,0 +1,281 @@
+"""
+运行指标模块 - 记录各阶段耗时、请求延迟分布、错误数和 token 用量，导出 JSON 与 Prometheus 文本
+"""
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import json
+import os
+import threading
+import time
+
+
+# 延迟直方图的默认分桶（秒）
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# 指标名前缀
+PREFIX = 'llmpulse'
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    """转义 Prometheus 标签值"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+
+def _format_labels(labels: Labels, extra: Dict = None) -> str:
+    pairs = list(labels) + sorted((extra or {}).items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(str(value))}"' for key, value in pairs) + '}'
+
+
+class Histogram:
+    """累计分桶直方图"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'max': round(self.max, 6),
+            'buckets': {str(bound): count for bound, count in zip(self.buckets, self.counts)},
+        }
+
+
+class MetricsRegistry:
+    """
+    一次运行的指标
+
+    - span：阶段耗时（开始时间相对运行开始，支持并行阶段重叠）
+    - counter：累计计数（请求数、错误数、token 数等）
+    - gauge：最近一次的取值（单个 feed 的抓取耗时、报告大小等）
+    - histogram：延迟分布
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """清空所有指标，开始新的一次运行"""
+        with self._lock:
+            self.started_at = datetime.now()
+            self._start = time.monotonic()
+            self.spans: List[Dict] = []
+            self.counters: Dict[str, Dict[Labels, float]] = {}
+            self.gauges: Dict[str, Dict[Labels, float]] = {}
+            self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """计数器加 value"""
+        key = _labels(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels):
+        """设置 gauge"""
+        with self._lock:
+            self.gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        """向直方图记录一个观测值"""
+        key = _labels(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    def error(self, stage: str, exc: Exception = None):
+        """记录一次错误"""
+        self.inc('errors_total', stage=stage, type=type(exc).__name__ if exc else 'error')
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        """
+        记录一个阶段的耗时
+
+        阶段内抛出的异常计为错误后继续抛出；耗时同时计入 stage_seconds 直方图。
+        """
+        start = time.monotonic()
+        status = 'ok'
+        try:
+            yield
+        except Exception as e:
+            status = 'error'
+            self.error(name, e)
+            raise
+        finally:
+            duration = time.monotonic() - start
+            with self._lock:
+                self.spans.append({
+                    'name': name,
+                    'labels': dict(labels),
+                    'start': round(start - self._start, 6),
+                    'duration': round(duration, 6),
+                    'status': status,
+                })
+            self.observe('stage_seconds', duration, stage=name)
+
+    def record_tokens(self, model: str, usage):
+        """按模型累计一次 LLM 调用的 token 用量（usage 取值方式与 UsageTracker 相同）"""
+        for kind, attr in (
+            ('input', 'input_tokens'),
+            ('output', 'output_tokens'),
+            ('cache_read', 'cache_read_input_tokens'),
+            ('cache_write', 'cache_creation_input_tokens'),
+        ):
+            value = getattr(usage, attr, 0) or 0
+            if value:
+                self.inc('llm_tokens_total', value, model=model, type=kind)
+
+    def cost(self, pricing: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+        """
+        按价格表估算各模型的费用（美元）
+
+        Args:
+            pricing: 模型到每百万 token 价格的映射，如 {"model": {"input": 3, "output": 15}}；
+                缓存读取按输入价格的 10%、写入按 125% 计算
+
+        Returns:
+            模型到费用的映射（价格表中没有的模型不包含在内）
+        """
+        multipliers = {'input': ('input', 1), 'output': ('output', 1),
+                       'cache_read': ('input', 0.1), 'cache_write': ('input', 1.25)}
+        costs = {}
+        with self._lock:
+            series = dict(self.counters.get('llm_tokens_total', {}))
+        for labels, tokens in series.items():
+            label_map = dict(labels)
+            prices = pricing.get(label_map.get('model'))
+            if not prices:
+                continue
+            price_key, multiplier = multipliers.get(label_map.get('type'), ('input', 1))
+            model = label_map['model']
+            costs[model] = costs.get(model, 0) + tokens / 1e6 * prices.get(price_key, 0) * multiplier
+        return {model: round(value, 6) for model, value in costs.items()}
+
+    def to_dict(self, extra: Dict = None, pricing: Dict = None) -> Dict:
+        """
+        导出运行记录
+
+        Args:
+            extra: 附加到记录中的其他统计（如全局用量、重试统计）
+            pricing: 价格表，提供时附带费用估算
+        """
+        def series(values, convert=lambda value: value):
+            return [{'labels': dict(labels), 'value': convert(value)} for labels, value in values.items()]
+
+        with self._lock:
+            record = {
+                'started_at': self.started_at.isoformat(),
+                'duration': round(time.monotonic() - self._start, 6),
+                'spans': list(self.spans),
+                'counters': {name: series(values) for name, values in self.counters.items()},
+                'gauges': {name: series(values) for name, values in self.gauges.items()},
+                'histograms': {
+                    name: series(values, Histogram.to_dict)
+                    for name, values in self.histograms.items()
+                },
+            }
+        if pricing:
+            record['cost_usd'] = self.cost(pricing)
+        record.update(extra or {})
+        return record
+
+    def to_prometheus(self, pricing: Dict = None) -> str:
+        """导出 Prometheus 文本格式（供 node_exporter 的 textfile collector 读取）"""
+        lines = []
+        with self._lock:
+            counters = {name: dict(values) for name, values in self.counters.items()}
+            gauges = {name: dict(values) for name, values in self.gauges.items()}
+            histograms = {name: dict(values) for name, values in self.histograms.items()}
+            duration = time.monotonic() - self._start
+            started = self.started_at.timestamp()
+
+        lines.append(f'# TYPE {PREFIX}_run_start_timestamp_seconds gauge')
+        lines.append(f'{PREFIX}_run_start_timestamp_seconds {started:.3f}')
+        lines.append(f'# TYPE {PREFIX}_run_duration_seconds gauge')
+        lines.append(f'{PREFIX}_run_duration_seconds {duration:.6f}')
+
+        for name, values in sorted(counters.items()):
+            lines.append(f'# TYPE {PREFIX}_{name} counter')
+            for labels, value in sorted(values.items()):
+                lines.append(f'{PREFIX}_{name}{_format_labels(labels)} {value:g}')
+
+        for name, values in sorted(gauges.items()):
+            lines.append(f'# TYPE {PREFIX}_{name} gauge')
+            for labels, value in sorted(values.items()):
+                lines.append(f'{PREFIX}_{name}{_format_labels(labels)} {value:g}')
+
+        for name, values in sorted(histograms.items()):
+            lines.append(f'# TYPE {PREFIX}_{name} histogram')
+            for labels, histogram in sorted(values.items()):
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f'{PREFIX}_{name}_bucket{_format_labels(labels, {"le": f"{bound:g}"})} {count}')
+                lines.append(f'{PREFIX}_{name}_bucket{_format_labels(labels, {"le": "+Inf"})} {histogram.count}')
+                lines.append(f'{PREFIX}_{name}_sum{_format_labels(labels)} {histogram.sum:.6f}')
+                lines.append(f'{PREFIX}_{name}_count{_format_labels(labels)} {histogram.count}')
+
+        if pricing:
+            lines.append(f'# TYPE {PREFIX}_llm_cost_usd gauge')
+            for model, value in sorted(self.cost(pricing).items()):
+                lines.append(f'{PREFIX}_llm_cost_usd{_format_labels(_labels({"model": model}))} {value:.6f}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, config: dict, extra: Dict = None) -> Optional[str]:
+        """
+        按配置中的 metrics 段写出运行记录
+
+        JSON 记录按运行时间命名保存在 metrics.dir 下；配置了 metrics.prometheus_textfile 时
+        同时写出 Prometheus 文本（先写临时文件再替换，避免 node_exporter 读到半个文件）。
+
+        Returns:
+            JSON 记录的路径，未启用时返回 None
+        """
+        metrics_config = config.get('metrics', {})
+        if not metrics_config.get('enabled', False):
+            return None
+        pricing = metrics_config.get('pricing') or {}
+
+        output_dir = metrics_config.get('dir', os.path.join('reports', 'metrics'))
+        os.makedirs(output_dir, exist_ok=True)
+        json_path = os.path.join(output_dir, f"run_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(extra, pricing), f, ensure_ascii=False, indent=2, default=str)
+
+        textfile = metrics_config.get('prometheus_textfile')
+        if textfile:
+            os.makedirs(os.path.dirname(textfile) or '.', exist_ok=True)
+            tmp_path = f"{textfile}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus(pricing))
+            os.replace(tmp_path, textfile)
+
+        return json_path
+
+
+# 全局运行指标，各模块共用
+metrics = MetricsRegistry()
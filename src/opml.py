@@ -0,0 +1,84 @@
+"""
+OPML 导入模块 - 从 OPML 订阅列表读取数据源
+"""
+from typing import Dict, List
+import xml.etree.ElementTree as ET
+
+
+def load_opml(path: str, categories: List[str], default_category: str = 'industry',
+              category_map: Dict[str, str] = None) -> List[Dict]:
+    """
+    读取 OPML 文件中的 feed
+
+    依次尝试 outline 的 category 属性和所在分组（上层 outline，内层优先）的名称：每个名称
+    先查 category_map，再按名称本身匹配（不区分大小写），取第一个得到已知类别的名称；
+    都不匹配时使用 default_category。
+
+    Args:
+        path: OPML 文件路径
+        categories: 可用的类别
+        default_category: 无法确定类别时使用的类别
+        category_map: OPML 分组名或 category 属性到类别的映射（映射到未知类别的名称视为
+                      不匹配，继续尝试下一个名称，最终可能落到 default_category）
+
+    Returns:
+        数据源列表（name, url, category），与 data_sources 中的格式相同
+
+    Raises:
+        OSError: 文件无法读取
+        ET.ParseError: 文件不是合法的 XML
+    """
+    category_map = category_map or {}
+
+    def resolve(names: List[str]) -> str:
+        for name in names:
+            name = name.strip().strip('/')
+            if not name:
+                continue
+            if category_map.get(name) in categories:
+                return category_map[name]
+            if name.lower() in categories:
+                return name.lower()
+        return default_category
+
+    sources = []
+
+    def walk(node, groups: List[str]):
+        for outline in node.findall('outline'):
+            label = outline.get('title') or outline.get('text') or ''
+            url = outline.get('xmlUrl')
+            if url:
+                # category 属性为逗号分隔的路径，如 "/AI/academic,research"
+                tags = [part for value in (outline.get('category') or '').split(',')
+                        for part in reversed(value.strip('/').split('/'))]
+                sources.append({
+                    'name': label or url,
+                    'url': url.strip(),
+                    'category': resolve(tags + groups),
+                })
+            else:
+                # 没有 xmlUrl 的 outline 是分组，内层分组优先
+                walk(outline, [label] + groups)
+
+    root = ET.parse(path).getroot()
+    walk(root.find('body') if root.find('body') is not None else root, [])
+    return sources
+
+
+def merge_sources(data_sources: Dict[str, List[Dict]], imported: List[Dict]) -> Dict[str, List[Dict]]:
+    """
+    将导入的数据源合并到按类别分组的 data_sources 中
+
+    按 URL 去重，配置文件中手写的数据源优先。
+
+    Returns:
+        新的按类别分组的数据源字典
+    """
+    merged = {category: list(sources or []) for category, sources in data_sources.items()}
+    seen = {source['url'] for sources in merged.values() for source in sources}
+    for source in imported:
+        if source['url'] in seen:
+            continue
+        seen.add(source['url'])
+        merged.setdefault(source['category'], []).append(source)
+    return merged
@@ -0,0 +1,59 @@
+"""
+流水线执行模块 - 让数据抓取、文章摘要和类别摘要重叠进行
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from .data_fetcher import DataFetcher
+
+
+class StreamingPipeline:
+    """
+    流水线方式运行抓取 → 文章摘要 → 类别摘要
+
+    每个类别的数据源全部抓取完成（需要全部结果才能做时间过滤和 Top-N 截断）后，
+    立即开始该类别的文章摘要，随后生成该类别的摘要，与其他类别的抓取并行进行。
+    整体耗时接近最慢的一条类别链路，而不是所有阶段之和。
+    """
+
+    def __init__(self, fetcher, summarizer, analyzer, deduplicator=None,
+                 max_parallel_categories: int = 4):
+        self.fetcher = fetcher
+        self.summarizer = summarizer
+        self.analyzer = analyzer
+        self.deduplicator = deduplicator
+        self.max_parallel_categories = max(1, max_parallel_categories)
+
+    def run(self) -> Tuple[Dict[str, List[Dict]], Dict[str, str]]:
+        """
+        运行流水线
+
+        Returns:
+            (按类别分组的内容字典, 各类别的摘要)
+        """
+        data = {category: [] for category in DataFetcher.CATEGORIES}
+        futures = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel_categories) as executor:
+            for category, items in self.fetcher.iter_categories():
+                # 与先前产出的类别一起去重（先完成的类别优先保留）
+                if self.deduplicator:
+                    items = self.deduplicator.dedupe_items(items)
+                data[category] = items
+                if items:
+                    print(f"   ▶ {category}: 抓取完成 ({len(items)} 条)，开始生成摘要")
+                    futures[category] = executor.submit(self._process_category, category, items)
+
+            summaries = {
+                category: futures[category].result()
+                for category in DataFetcher.CATEGORIES
+                if category in futures
+            }
+
+        return data, summaries
+
+    def _process_category(self, category: str, items: List[Dict]) -> str:
+        """为单个类别生成文章摘要和类别摘要"""
+        self.summarizer.summarize_batch(items)
+        print(f"   正在分析 {category}...")
+        return self.analyzer.summarize_category(items, category, timeout=self.analyzer.call_timeout)
@@ -0,0 +1,96 @@
+"""
+提示词缓存模块 - 构建带缓存标记的消息，并统计 token 用量与缓存命中
+"""
+from typing import Dict, List
+import threading
+
+
+def cached_messages(prefix: str, suffix: str, enabled: bool = True) -> List[Dict]:
+    """
+    构建由固定前缀和可变后缀组成的用户消息
+
+    前缀（指令部分）在每次调用中完全相同，标记为可缓存后由服务端复用；
+    后缀（文章内容、条目列表等）每次不同。前缀长度低于模型的最小缓存长度时，
+    服务端会忽略缓存标记，按普通请求处理。
+
+    Args:
+        prefix: 固定的指令前缀
+        suffix: 可变内容
+        enabled: 是否添加缓存标记
+
+    Returns:
+        messages 参数
+    """
+    prefix_block = {"type": "text", "text": prefix}
+    if enabled:
+        prefix_block["cache_control"] = {"type": "ephemeral"}
+
+    content = [prefix_block]
+    if suffix:
+        content.append({"type": "text", "text": suffix})
+    return [{"role": "user", "content": content}]
+
+
+class UsageTracker:
+    """汇总一次运行中所有 LLM 调用的 token 用量"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """清零统计"""
+        with self._lock:
+            self.calls = 0
+            self.input_tokens = 0
+            self.output_tokens = 0
+            self.cache_read_tokens = 0
+            self.cache_write_tokens = 0
+
+    def record(self, usage):
+        """记录一次调用返回的 usage"""
+        if usage is None:
+            return
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += getattr(usage, 'input_tokens', 0) or 0
+            self.output_tokens += getattr(usage, 'output_tokens', 0) or 0
+            self.cache_read_tokens += getattr(usage, 'cache_read_input_tokens', 0) or 0
+            self.cache_write_tokens += getattr(usage, 'cache_creation_input_tokens', 0) or 0
+
+    def snapshot(self) -> Dict[str, int]:
+        """当前统计值"""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'input_tokens': self.input_tokens,
+                'output_tokens': self.output_tokens,
+                'cache_read_tokens': self.cache_read_tokens,
+                'cache_write_tokens': self.cache_write_tokens,
+            }
+
+    def report(self) -> str:
+        """
+        生成用量报告
+
+        缓存读取按普通输入价格的 10% 计费，写入按 125% 计费，据此估算输入成本的节省比例。
+        """
+        stats = self.snapshot()
+        total_input = stats['input_tokens'] + stats['cache_read_tokens'] + stats['cache_write_tokens']
+        if not stats['calls']:
+            return "LLM 调用 0 次"
+
+        hit_rate = stats['cache_read_tokens'] / total_input if total_input else 0
+        billed = (stats['input_tokens'] + stats['cache_read_tokens'] * 0.1
+                  + stats['cache_write_tokens'] * 1.25)
+        saving = 1 - billed / total_input if total_input else 0
+        return (
+            f"LLM 调用 {stats['calls']} 次 | 输入 {total_input} tokens"
+            f"（缓存命中 {stats['cache_read_tokens']}，缓存写入 {stats['cache_write_tokens']}，"
+            f"命中率 {hit_rate:.1%}，输入成本节省约 {saving:.1%}）"
+            f" | 输出 {stats['output_tokens']} tokens"
+        )
+
+
+# 全局用量统计，ArticleSummarizer 与 LLMAnalyzer 共用
+usage_tracker = UsageTracker()
@@ -0,0 +1,102 @@
+"""
+提示词打包模块 - 在 token 预算内按重要性挑选条目
+"""
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from .article_summarizer import PLACEHOLDER_SUMMARIES
+from .rate_limiter import estimate_tokens
+
+
+def item_score(item: Dict) -> Tuple:
+    """
+    条目重要性，数值越大越优先
+
+    条目自带 score 字段时优先使用；否则按被多少个数据源收录（去重后合并的来源数）
+    和发布时间排序。
+    """
+    published = item.get('published') or datetime.min
+    sources = len(item.get('sources') or [item.get('source')])
+    return item.get('score', 0), sources, published
+
+
+def article_summary(item: Dict) -> str:
+    """AI 生成的文章摘要；没有摘要或只是占位文本（如"暂无摘要"）时返回空字符串"""
+    summary = item.get('ai_summary') or ''
+    return '' if summary.strip() in PLACEHOLDER_SUMMARIES else summary
+
+
+def item_digest(item: Dict, max_chars: int = 200) -> str:
+    """条目的简要内容：优先使用 AI 生成的文章摘要，否则截取 RSS 简介，都没有时使用标题"""
+    summary = article_summary(item)
+    if summary:
+        return summary
+    summary = item.get('summary', '')
+    if not summary:
+        return item.get('title', '')
+    return summary[:max_chars] + '...' if len(summary) > max_chars else summary
+
+
+class PromptPacker:
+    """按重要性依次加入条目，直到达到 token 预算"""
+
+    def __init__(self, budget_tokens: int):
+        self.budget_tokens = budget_tokens
+
+    def pack(self, items: List[Dict], formatter: Callable[[int, Dict], str],
+             budget_tokens: int = None) -> List[str]:
+        """
+        在预算内格式化尽可能多的高分条目
+
+        Args:
+            items: 内容列表
+            formatter: (序号, 条目) -> 文本
+            budget_tokens: 本次预算，默认使用构造时的预算
+
+        Returns:
+            已格式化的条目文本列表（按重要性排序，至少包含一条）
+        """
+        budget = self.budget_tokens if budget_tokens is None else budget_tokens
+        ranked = sorted(items, key=item_score, reverse=True)
+
+        packed = []
+        used = 0
+        for item in ranked:
+            text = formatter(len(packed) + 1, item)
+            cost = estimate_tokens(text) + 1
+            if packed and used + cost > budget:
+                break
+            packed.append(text)
+            used += cost
+        return packed
+
+    def pack_grouped(self, groups: Dict[str, List[Dict]], formatter: Callable[[Dict], str],
+                     budget_tokens: int = None) -> Dict[str, List[str]]:
+        """
+        跨多个类别打包：按各类别内的排名轮流取条目，保证每个类别都有代表
+
+        Returns:
+            类别到已格式化条目文本列表的映射（保持类别原顺序，空类别不包含在内）
+        """
+        budget = self.budget_tokens if budget_tokens is None else budget_tokens
+        ranked = {
+            category: sorted(items, key=item_score, reverse=True)
+            for category, items in groups.items()
+            if items
+        }
+        packed = {category: [] for category in ranked}
+
+        used = 0
+        depth = 0
+        while any(depth < len(items) for items in ranked.values()):
+            for category, items in ranked.items():
+                if depth >= len(items):
+                    continue
+                text = formatter(items[depth])
+                cost = estimate_tokens(text) + 1
+                if used + cost > budget and used > 0:
+                    return packed
+                packed[category].append(text)
+                used += cost
+            depth += 1
+        return packed
@@ -0,0 +1,108 @@
+"""
+限流模块 - 基于令牌桶的请求数 / token 数限流，以及按主机的并发限制
+"""
+from urllib.parse import urlparse
+import threading
+import time
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    粗略估算文本的 token 数
+
+    中日韩字符按 1 个 token 计，其余字符按 4 个字符 1 个 token 计。
+    """
+    if not text:
+        return 0
+    cjk = sum(1 for ch in text if '\u2e80' <= ch <= '\u9fff' or '\uf900' <= ch <= '\ufaff')
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+class TokenBucket:
+    """令牌桶，按每分钟速率匀速补充，容量默认为一分钟的配额"""
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        预留 amount 个令牌
+
+        令牌不足时允许透支，后来的调用者会排在透支之后，保证先到先得。
+
+        Returns:
+            需要等待的秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= min(amount, self.capacity)
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """同时限制每分钟请求数（RPM）和每分钟 token 数（TPM）"""
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        阻塞直到可以发出一次请求
+
+        Args:
+            tokens: 本次请求预计消耗的 token 数
+
+        Returns:
+            实际等待的秒数
+        """
+        wait = 0.0
+        if self.request_bucket:
+            wait = max(wait, self.request_bucket.reserve(1))
+        if self.token_bucket and tokens:
+            wait = max(wait, self.token_bucket.reserve(tokens))
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostLimiter:
+    """按主机限制并发数和请求间隔，代替全局 sleep"""
+
+    def __init__(self, max_concurrent: int = 2, min_interval: float = 0.5):
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_slot = {}
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_concurrent)
+            return self._semaphores[host]
+
+    def _wait_turn(self, host: str):
+        """为该主机预约下一个请求时间点，必要时等待"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def run(self, url: str, func, *args, **kwargs):
+        """在该 URL 所属主机的限制下执行 func"""
+        host = urlparse(url).netloc.lower()
+        with self._semaphore(host):
+            self._wait_turn(host)
+            return func(*args, **kwargs)
@@ -0,0 +1,195 @@
+"""
+报告文档模块 - 由数据、类别摘要和洞察构建一次报告文档，供各格式的渲染器共用
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+import os
+
+from .metrics import metrics
+
+
+# 报告中的类别顺序：(类别, 名称, 图标)
+SECTION_INFO = [
+    ('industry', '行业动态', '🏢'),
+    ('academic', '学术前沿', '📚'),
+    ('applications', '应用实践', '🚀'),
+    ('startups', '创业生态', '💼'),
+]
+
+
+class ReportItem:
+    """报告中的一条内容"""
+
+    def __init__(self, title: str, link: str, source: str, sources: List[str],
+                 published: datetime, ai_summary: Optional[str] = None):
+        self.title = title
+        self.link = link
+        self.source = source
+        self.sources = sources
+        self.published = published
+        self.ai_summary = ai_summary
+        # 合并后的来源显示文本，各渲染器共用
+        self.source_text = ' / '.join(sources)
+
+    @classmethod
+    def from_item(cls, item: Dict) -> 'ReportItem':
+        """由抓取到的条目字典创建"""
+        return cls(
+            title=item['title'],
+            link=item['link'],
+            source=item['source'],
+            sources=list(item.get('sources') or [item['source']]),
+            published=item['published'],
+            ai_summary=item.get('ai_summary'),
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            'title': self.title,
+            'link': self.link,
+            'source': self.source,
+            'sources': self.sources,
+            'published': self.published.isoformat(),
+            'ai_summary': self.ai_summary,
+        }
+
+
+class ReportSection:
+    """一个类别的章节"""
+
+    def __init__(self, category: str, name: str, icon: str, summary: Optional[str], items: List[ReportItem]):
+        self.category = category
+        self.name = name
+        self.icon = icon
+        # 没有生成摘要时为 None
+        self.summary = summary
+        self.items = items
+
+    @property
+    def title(self) -> str:
+        return f'{self.icon} {self.name}'
+
+    def to_dict(self) -> Dict:
+        return {
+            'category': self.category,
+            'name': self.name,
+            'summary': self.summary,
+            'items': [item.to_dict() for item in self.items],
+        }
+
+
+class ReportDocument:
+    """一期周报的完整内容，与输出格式无关"""
+
+    def __init__(self, sections: List[ReportSection], insights: str = '', generated_at: datetime = None):
+        self.sections = sections
+        self.insights = insights
+        self.generated_at = generated_at or datetime.now()
+        self.week_num = self.generated_at.isocalendar()[1]
+        self.total_items = sum(len(section.items) for section in sections)
+
+    @property
+    def file_stem(self) -> str:
+        """报告文件名（不含扩展名），各格式共用"""
+        return f"week_{self.week_num}_{self.generated_at.strftime('%Y%m%d')}"
+
+    def section(self, category: str) -> Optional[ReportSection]:
+        for section in self.sections:
+            if section.category == category:
+                return section
+        return None
+
+    def count(self, category: str) -> int:
+        section = self.section(category)
+        return len(section.items) if section else 0
+
+    def to_dict(self) -> Dict:
+        return {
+            'schema_version': 1,
+            'generated_at': self.generated_at.isoformat(),
+            'week': self.week_num,
+            'total_items': self.total_items,
+            'sections': [section.to_dict() for section in self.sections],
+            'insights': self.insights,
+        }
+
+
+def build_document(data: Dict[str, List[Dict]], summaries: Dict[str, str], insights: str = '',
+                   generated_at: datetime = None) -> ReportDocument:
+    """
+    构建报告文档
+
+    Args:
+        data: 按类别分组的内容
+        summaries: 各类别的摘要
+        insights: 洞察分析
+        generated_at: 生成时间（默认为当前时间）
+
+    Returns:
+        报告文档
+    """
+    sections = [
+        ReportSection(
+            category, name, icon,
+            summaries.get(category),
+            [ReportItem.from_item(item) for item in data.get(category, [])]
+        )
+        for category, name, icon in SECTION_INFO
+    ]
+    return ReportDocument(sections, insights, generated_at)
+
+
+class ReportRenderer:
+    """
+    报告渲染器基类
+
+    子类设置 format_name 与 extension，并实现 render(document) -> str。
+    """
+
+    format_name = ''
+    extension = ''
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.output_dir = config.get('report', {}).get('output_dir', 'reports')
+
+    def render(self, document: ReportDocument) -> str:
+        raise NotImplementedError
+
+    def write(self, document: ReportDocument) -> str:
+        """
+        渲染并保存报告
+
+        Returns:
+            报告文件路径
+        """
+        with metrics.span('render', format=self.format_name):
+            content = self.render(document)
+            filepath = self._save_report(content, document)
+        metrics.set('report_bytes', len(content.encode('utf-8')), format=self.format_name)
+        return filepath
+
+    def generate_report(self, data: Dict[str, List[Dict]], summaries: Dict[str, str], insights: str = "") -> str:
+        """
+        生成完整报告
+
+        Args:
+            data: 原始数据
+            summaries: 各类别的摘要
+            insights: 洞察分析
+
+        Returns:
+            报告文件路径
+        """
+        return self.write(build_document(data, summaries, insights))
+
+    def _save_report(self, content: str, document: ReportDocument) -> str:
+        """保存报告到文件（各格式共用相同的文件名，只有扩展名不同）"""
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        filepath = os.path.join(self.output_dir, f"{document.file_stem}.{self.extension}")
+
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+        return filepath
@@ -0,0 +1,64 @@
+"""
+报告输出模块 - 按配置创建各格式的渲染器，由同一份报告文档写出所有格式
+"""
+from typing import Dict, List, Type
+
+from .html_report_generator import HTMLReportGenerator
+from .json_report_generator import JSONReportGenerator
+from .lazy_html_report_generator import LazyHTMLReportGenerator
+from .report_document import ReportDocument, ReportRenderer
+from .report_generator import ReportGenerator
+
+
+# 格式名到渲染器类的映射
+RENDERERS: Dict[str, Type[ReportRenderer]] = {
+    'markdown': ReportGenerator,
+    'html': HTMLReportGenerator,
+    'html_lazy': LazyHTMLReportGenerator,
+    'json': JSONReportGenerator,
+}
+
+# 格式名的别名
+ALIASES = {'md': 'markdown'}
+
+
+def register_renderer(name: str, renderer_class: Type[ReportRenderer]):
+    """注册新的报告格式（渲染器需继承 ReportRenderer 并实现 render）"""
+    RENDERERS[name] = renderer_class
+
+
+def output_formats(config: dict) -> List[str]:
+    """
+    读取配置中的报告格式
+
+    report.output_format 可以是单个格式名，也可以是列表（同一次运行写出多种格式）。
+
+    Raises:
+        ValueError: 包含不支持的格式
+    """
+    value = config.get('report', {}).get('output_format', 'markdown') or 'markdown'
+    names = [value] if isinstance(value, str) else list(value)
+
+    formats = []
+    for name in names:
+        name = ALIASES.get(str(name).strip().lower(), str(name).strip().lower())
+        if name not in RENDERERS:
+            raise ValueError(f"不支持的报告格式: {name}（可选: {', '.join(RENDERERS)}）")
+        if name not in formats:
+            formats.append(name)
+    return formats
+
+
+def create_renderers(config: dict) -> List[ReportRenderer]:
+    """按配置创建渲染器（按配置中的顺序，重复的格式只保留一个）"""
+    return [RENDERERS[name](config) for name in output_formats(config)]
+
+
+def write_reports(renderers: List[ReportRenderer], document: ReportDocument) -> Dict[str, str]:
+    """
+    由同一份报告文档写出所有格式
+
+    Returns:
+        格式名到报告文件路径的映射
+    """
+    return {renderer.format_name: renderer.write(document) for renderer in renderers}
@@ -0,0 +1,324 @@
+"""
+容错模块 - LLM 调用的重试退避、Retry-After 处理与熔断
+"""
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+import random
+import threading
+import time
+
+import anthropic
+import requests
+
+
+# 值得重试的 HTTP 状态码：超时、冲突、限流、服务端错误、过载
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# 值得重试的连接类异常
+CONNECTION_ERRORS = (
+    anthropic.APIConnectionError,
+    requests.ConnectionError,
+    requests.Timeout,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+class CircuitOpenError(Exception):
+    """熔断器处于打开状态，调用被直接拒绝"""
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    """从异常中取出 HTTP 状态码（兼容 anthropic 与 requests 的异常）"""
+    status = getattr(exc, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(exc, 'response', None), 'status_code', None)
+    return status
+
+
+def classify_error(exc: Exception) -> Optional[str]:
+    """
+    判断异常是否值得重试
+
+    Returns:
+        重试原因（'429'、'5xx' 等状态码或 'connection'）；不可重试时返回 None
+    """
+    status = _status_code(exc)
+    if status is not None:
+        return str(status) if status in RETRYABLE_STATUS else None
+    if isinstance(exc, CONNECTION_ERRORS):
+        return 'connection'
+    return None
+
+
+def retry_after_seconds(exc: Exception) -> Optional[float]:
+    """解析响应头中的 retry-after-ms / Retry-After（秒数或 HTTP 日期）"""
+    headers = getattr(getattr(exc, 'response', None), 'headers', None)
+    if not headers:
+        return None
+
+    value = headers.get('retry-after-ms')
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+
+    value = headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """
+    熔断器
+
+    连续 failure_threshold 次服务端错误或连接失败后打开，reset_timeout 秒内的调用直接失败；
+    之后进入半开状态，只放行一次试探调用：成功则关闭，失败则重新打开。
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """当前是否允许发起调用"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probing = False
+            # 半开状态只放行一个试探调用
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def release(self):
+        """
+        结束一次不计入熔断的调用（如被限流）
+
+        半开状态下的试探调用结果不能说明服务是否恢复，保持半开并允许下一次试探，
+        否则试探标记一直不被清除，之后的调用都会被拒绝。
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> bool:
+        """
+        记录一次失败
+
+        Returns:
+            本次失败是否使熔断器打开
+        """
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def remaining(self) -> float:
+        """打开状态下距离进入半开状态的秒数"""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+
+class RetryStats:
+    """汇总一次运行中的重试与熔断次数"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """清零统计"""
+        with self._lock:
+            self.retries = 0
+            self.reasons: Dict[str, int] = {}
+            self.circuit_opens = 0
+            self.fast_failures = 0
+            self.gave_up = 0
+
+    def record_retry(self, reason: str):
+        with self._lock:
+            self.retries += 1
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+    def record_circuit_open(self):
+        with self._lock:
+            self.circuit_opens += 1
+
+    def record_fast_failure(self):
+        with self._lock:
+            self.fast_failures += 1
+
+    def record_give_up(self):
+        with self._lock:
+            self.gave_up += 1
+
+    def snapshot(self) -> Dict:
+        """当前统计值"""
+        with self._lock:
+            return {
+                'retries': self.retries,
+                'reasons': dict(self.reasons),
+                'circuit_opens': self.circuit_opens,
+                'fast_failures': self.fast_failures,
+                'gave_up': self.gave_up,
+            }
+
+    def report(self) -> str:
+        """生成重试报告"""
+        stats = self.snapshot()
+        reasons = '，'.join(f"{reason}: {count}" for reason, count in sorted(stats['reasons'].items()))
+        text = f"LLM 重试 {stats['retries']} 次"
+        if reasons:
+            text += f"（{reasons}）"
+        return (
+            f"{text} | 重试耗尽 {stats['gave_up']} 次"
+            f" | 熔断 {stats['circuit_opens']} 次，快速失败 {stats['fast_failures']} 次"
+        )
+
+
+# 全局重试统计，所有 LLM 调用共用
+retry_stats = RetryStats()
+
+
+class ResilientCaller:
+    """
+    带重试和熔断的调用器
+
+    可重试的错误（限流、服务端错误、连接失败）按指数退避加全抖动重试，
+    响应带有 Retry-After 时优先按其等待；限流不计入熔断。不可重试的错误
+    （如 400、401）直接抛出，也不计入熔断。
+    """
+
+    def __init__(self, max_retries: int = 4, base_delay: float = 1.0, max_delay: float = 60.0,
+                 breaker: CircuitBreaker = None, stats: RetryStats = None):
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.stats = stats or retry_stats
+
+    @classmethod
+    def from_config(cls, config: dict) -> 'ResilientCaller':
+        """根据配置中的 llm.retry 与 llm.circuit_breaker 段创建调用器"""
+        llm_config = config.get('llm', {})
+        retry_config = llm_config.get('retry', {})
+        breaker_config = llm_config.get('circuit_breaker', {})
+        return cls(
+            max_retries=retry_config.get('max_retries', 4),
+            base_delay=retry_config.get('base_delay', 1.0),
+            max_delay=retry_config.get('max_delay', 60.0),
+            breaker=CircuitBreaker(
+                failure_threshold=breaker_config.get('failure_threshold', 5),
+                reset_timeout=breaker_config.get('reset_timeout', 30)
+            )
+        )
+
+    def backoff(self, attempt: int, exc: Exception = None) -> float:
+        """第 attempt 次重试前的等待秒数"""
+        retry_after = retry_after_seconds(exc) if exc is not None else None
+        if retry_after is not None:
+            # 服务端给出的等待时间加少量抖动，避免所有线程同时醒来
+            return min(self.max_delay, retry_after + random.uniform(0, self.base_delay))
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, func: Callable, *args, **kwargs):
+        """
+        调用 func，失败时按策略重试
+
+        Raises:
+            CircuitOpenError: 熔断器打开，调用未发起
+            Exception: 不可重试的错误，或重试耗尽后的最后一个错误
+        """
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self.stats.record_fast_failure()
+                raise CircuitOpenError(
+                    f"LLM 服务连续失败，熔断中（{self.breaker.remaining():.0f} 秒后重试）"
+                )
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                reason = classify_error(e)
+                if reason is None:
+                    # 请求本身有问题，不代表服务不可用
+                    self.breaker.record_success()
+                    raise
+                # 限流说明服务可用，只按 Retry-After 退避，不计入熔断
+                if reason == '429':
+                    self.breaker.release()
+                elif self.breaker.record_failure():
+                    self.stats.record_circuit_open()
+                    print(f"    ⚠️  LLM 服务连续失败，熔断 {self.breaker.reset_timeout} 秒")
+                if attempt >= self.max_retries or self.breaker.state == CircuitBreaker.OPEN:
+                    self.stats.record_give_up()
+                    raise
+                delay = self.backoff(attempt, e)
+                self.stats.record_retry(reason)
+                attempt += 1
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
+
+
+_shared_callers: Dict[str, ResilientCaller] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_caller(config: dict) -> ResilientCaller:
+    """
+    获取同一 LLM 服务共用的调用器
+
+    ArticleSummarizer 与 LLMAnalyzer 调用同一个服务，共用熔断状态：
+    服务不可用时，后续所有调用都会快速失败。
+    """
+    llm_config = config.get('llm', {})
+    key = f"{llm_config.get('provider', 'anthropic')}|{llm_config.get('base_url') or ''}"
+    with _shared_lock:
+        if key not in _shared_callers:
+            _shared_callers[key] = ResilientCaller.from_config(config)
+        return _shared_callers[key]
@@ -0,0 +1,104 @@
+"""
+摘要缓存模块 - 持久化保存文章摘要，避免对同一内容重复调用 LLM
+"""
+from typing import Optional
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+
+class SummaryCache:
+    """
+    基于 SQLite 的内容寻址摘要缓存
+
+    缓存键由文章链接、源文本哈希、模型名和提示词类型（paper / blog）共同决定，
+    任何一项变化都会视为新内容重新生成摘要。
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 5000, max_age_days: float = 30):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 86400
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                link TEXT,
+                summary TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+        self.evict()
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional['SummaryCache']:
+        """根据配置中的 cache 段创建摘要缓存，未启用时返回 None"""
+        cache_config = config.get('cache', {})
+        if not cache_config.get('enabled', False):
+            return None
+        summary_config = cache_config.get('summaries', {})
+        return cls(
+            db_path=os.path.join(cache_config.get('dir', '.cache'), 'summaries.db'),
+            max_entries=summary_config.get('max_entries', 5000),
+            max_age_days=summary_config.get('max_age_days', 30)
+        )
+
+    @staticmethod
+    def make_key(link: str, text: str, model: str, variant: str) -> str:
+        """生成缓存键"""
+        text_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        raw = '\x1f'.join([link or '', text_hash, model or '', variant])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """读取摘要，命中时更新最近使用时间"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE summaries SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, link: str, summary: str):
+        """写入摘要"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, link, summary, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, link, summary, now, now)
+            )
+            self._conn.commit()
+
+    def evict(self):
+        """淘汰过期条目，并按最近使用时间裁剪到 max_entries 条"""
+        with self._lock:
+            if self.max_age_seconds > 0:
+                self._conn.execute(
+                    "DELETE FROM summaries WHERE last_used < ?",
+                    (time.time() - self.max_age_seconds,)
+                )
+            if self.max_entries > 0:
+                self._conn.execute(
+                    "DELETE FROM summaries WHERE key NOT IN ("
+                    "SELECT key FROM summaries ORDER BY last_used DESC LIMIT ?)",
+                    (self.max_entries,)
+                )
+            self._conn.commit()
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()